@@ -0,0 +1,172 @@
+""" Payloads served by the mock Riot / DataDragon server
+Responses are shaped like the real MatchDto, timeline, LeagueEntryDTO, SummonerDTO and champion.json
+payloads (same keys, nesting and similar sizes) and are deterministic for a given ID. Recorded responses
+can replace them: drop <name>.json files (match.json, timeline.json, champion.json, ...) in a folder and
+start the server with --fixtures <folder>.
+"""
+import hashlib
+import json
+import os
+import random
+
+
+PARTICIPANT_STATS = ('assists', 'baronKills', 'bountyLevel', 'champExperience', 'champLevel', 'consumablesPurchased',
+                     'damageDealtToBuildings', 'damageDealtToObjectives', 'damageDealtToTurrets', 'damageSelfMitigated',
+                     'deaths', 'detectorWardsPlaced', 'doubleKills', 'dragonKills', 'firstBloodAssist', 'goldEarned',
+                     'goldSpent', 'inhibitorKills', 'item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6',
+                     'itemsPurchased', 'killingSprees', 'kills', 'largestCriticalStrike', 'largestKillingSpree',
+                     'largestMultiKill', 'longestTimeSpentLiving', 'magicDamageDealt', 'magicDamageDealtToChampions',
+                     'magicDamageTaken', 'neutralMinionsKilled', 'pentaKills', 'physicalDamageDealt',
+                     'physicalDamageDealtToChampions', 'physicalDamageTaken', 'profileIcon', 'quadraKills',
+                     'sightWardsBoughtInGame', 'spell1Casts', 'spell2Casts', 'spell3Casts', 'spell4Casts',
+                     'summoner1Casts', 'summoner1Id', 'summoner2Casts', 'summoner2Id', 'timeCCingOthers', 'timePlayed',
+                     'totalDamageDealt', 'totalDamageDealtToChampions', 'totalDamageShieldedOnTeammates',
+                     'totalDamageTaken', 'totalHeal', 'totalHealsOnTeammates', 'totalMinionsKilled', 'totalTimeCCDealt',
+                     'totalTimeSpentDead', 'totalUnitsHealed', 'tripleKills', 'trueDamageDealt',
+                     'trueDamageDealtToChampions', 'trueDamageTaken', 'turretKills', 'turretTakedowns', 'turretsLost',
+                     'unrealKills', 'visionScore', 'visionWardsBoughtInGame', 'wardsKilled', 'wardsPlaced')
+POSITIONS = ('TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY')
+CHAMPION_KEYS = tuple(range(1, 161))
+QUEUES = (420, 440, 400, 450)
+
+class Fixtures:
+    """ Deterministic payload factory, optionally overridden by recorded JSON files
+    """
+
+    def __init__(self, directory=None, memory=4096):
+        self.recorded = dict()
+        # Generated bodies are memoised so the server spends its time answering, not building payloads
+        self.generated = dict()
+        self.memory = memory
+        if directory:
+            for name in os.listdir(directory):
+                if name.endswith('.json'):
+                    with open(os.path.join(directory, name), 'rb') as file:
+                        self.recorded[name[:-5]] = file.read()
+
+    def body(self, name, factory, *args):
+        """ :return: JSON bytes of the recorded fixture name, or of factory(*args) when none was recorded """
+        if name in self.recorded:
+            return self.recorded[name]
+        key = (name,) + args
+        body = self.generated.get(key)
+        if body is None:
+            if len(self.generated) >= self.memory:
+                self.generated.clear()
+            body = self.generated[key] = json.dumps(factory(*args), separators=(',', ':')).encode()
+        return body
+
+def digest(value):
+    """ :return: stable integer derived from value (hash() changes between processes) """
+    return int(hashlib.md5(repr(value).encode()).hexdigest(), 16)
+
+def puuid(seed):
+    return ('%078d' % digest(('puuid', seed)))[-78:]
+
+def match(matchId):
+    rng = random.Random(matchId)
+    participants = list()
+    for index in range(10):
+        participant = {stat: rng.randint(0, 30000) for stat in PARTICIPANT_STATS}
+        participant.update({
+            'participantId': index + 1,
+            'puuid': puuid((matchId, index)),
+            'summonerId': 'summoner-%s-%d' % (matchId, index),
+            'summonerName': 'Player %d' % rng.randint(0, 10 ** 6),
+            'championId': rng.choice(CHAMPION_KEYS),
+            'championName': 'Champion%d' % rng.randint(0, 160),
+            'teamId': 100 if index < 5 else 200,
+            'teamPosition': POSITIONS[index % 5],
+            'win': (index < 5) == (int(rng.random() * 2) == 0),
+            'perks': {'statPerks': {'defense': 5002, 'flex': 5008, 'offense': 5005},
+                      'styles': [{'description': 'primaryStyle', 'style': 8000,
+                                  'selections': [{'perk': 8000 + i, 'var1': rng.randint(0, 999), 'var2': 0, 'var3': 0} for i in range(4)]},
+                                 {'description': 'subStyle', 'style': 8100,
+                                  'selections': [{'perk': 8100 + i, 'var1': rng.randint(0, 999), 'var2': 0, 'var3': 0} for i in range(2)]}]},
+        })
+        participants.append(participant)
+    teams = [{'teamId': teamId, 'win': participants[0 if teamId == 100 else 5]['win'],
+              'bans': [{'championId': rng.choice(CHAMPION_KEYS), 'pickTurn': turn} for turn in range(1, 6)],
+              'objectives': {name: {'first': rng.random() < 0.5, 'kills': rng.randint(0, 11)}
+                             for name in ('baron', 'champion', 'dragon', 'inhibitor', 'riftHerald', 'tower')}}
+             for teamId in (100, 200)]
+    creation = 1640000000000 + rng.randint(0, 10 ** 10)
+    return {
+        'metadata': {'dataVersion': '2', 'matchId': matchId, 'participants': [p['puuid'] for p in participants]},
+        'info': {'gameCreation': creation, 'gameDuration': rng.randint(900, 2700), 'gameEndTimestamp': creation + 1800000,
+                 'gameId': int(matchId.split('_')[-1]) if matchId.split('_')[-1].isdigit() else 0,
+                 'gameMode': 'CLASSIC', 'gameName': 'teambuilder-match', 'gameStartTimestamp': creation + 60000,
+                 'gameType': 'MATCHED_GAME', 'gameVersion': '12.4.415.1234', 'mapId': 11,
+                 'participants': participants, 'platformId': matchId.split('_')[0],
+                 'queueId': rng.choice(QUEUES), 'teams': teams, 'tournamentCode': ''},
+    }
+
+def timeline(matchId, frames=32):
+    rng = random.Random('timeline' + matchId)
+    result = list()
+    for minute in range(frames):
+        participantFrames = dict()
+        for index in range(1, 11):
+            participantFrames[str(index)] = {
+                'championStats': {stat: rng.randint(0, 5000) for stat in ('abilityHaste', 'abilityPower', 'armor', 'attackDamage',
+                                                                          'attackSpeed', 'health', 'healthMax', 'magicResist',
+                                                                          'movementSpeed', 'power', 'powerMax')},
+                'currentGold': rng.randint(0, 3000), 'goldPerSecond': 0, 'jungleMinionsKilled': rng.randint(0, 150),
+                'level': min(18, 1 + minute // 2), 'minionsKilled': minute * 7, 'participantId': index,
+                'position': {'x': rng.randint(0, 15000), 'y': rng.randint(0, 15000)}, 'timeEnemySpentControlled': 0,
+                'totalGold': 500 + minute * rng.randint(250, 450), 'xp': minute * rng.randint(300, 500),
+            }
+        events = [{'type': rng.choice(('ITEM_PURCHASED', 'SKILL_LEVEL_UP', 'WARD_PLACED', 'CHAMPION_KILL')),
+                   'timestamp': minute * 60000 + rng.randint(0, 59999), 'participantId': rng.randint(1, 10),
+                   'itemId': rng.randint(1000, 7000)} for _ in range(rng.randint(10, 40))]
+        result.append({'events': events, 'participantFrames': participantFrames, 'timestamp': minute * 60000})
+    return {'metadata': {'dataVersion': '2', 'matchId': matchId, 'participants': [puuid((matchId, i)) for i in range(10)]},
+            'info': {'frameInterval': 60000, 'frames': result, 'gameId': 0,
+                     'participants': [{'participantId': i + 1, 'puuid': puuid((matchId, i))} for i in range(10)]}}
+
+def match_ids(player, start, count, history=250):
+    region = 'LA2'
+    first = digest(player) % 10 ** 9
+    return ['%s_%d' % (region, first + history - i) for i in range(start, min(history, start + count))]
+
+def league_entries(queue, tier, division, page, pages=3, size=205):
+    if page > pages:
+        return list()
+    rng = random.Random('%s%s%s%d' % (queue, tier, division, page))
+    return [{'leagueId': 'league-%s-%s' % (tier, division), 'queueType': queue, 'tier': tier, 'rank': division,
+             'summonerId': 'summoner-%s-%s-%s-%d-%d' % (queue, tier, division, page, i),
+             'summonerName': 'Player %d' % rng.randint(0, 10 ** 6), 'leaguePoints': rng.randint(0, 99),
+             'wins': rng.randint(0, 300), 'losses': rng.randint(0, 300), 'veteran': False, 'inactive': False,
+             'freshBlood': False, 'hotStreak': rng.random() < 0.1} for i in range(size)]
+
+def apex_league(queue, tier, size=300):
+    rng = random.Random(queue + tier)
+    return {'leagueId': 'league-' + tier, 'queue': queue, 'tier': tier, 'name': 'Apex',
+            'entries': [{'summonerId': 'summoner-%s-%d' % (tier, i), 'summonerName': 'Player %d' % i,
+                         'leaguePoints': rng.randint(0, 2000), 'rank': 'I', 'wins': rng.randint(0, 500),
+                         'losses': rng.randint(0, 500), 'veteran': False, 'inactive': False, 'freshBlood': False,
+                         'hotStreak': False} for i in range(size)]}
+
+def summoner(identifier):
+    return {'accountId': 'account-' + identifier, 'profileIconId': 4568, 'revisionDate': 1645000000000,
+            'name': 'Player ' + identifier[:16], 'id': 'summoner-' + identifier, 'puuid': puuid(identifier),
+            'summonerLevel': 312}
+
+def champions(version):
+    data = dict()
+    for key in CHAMPION_KEYS:
+        name = 'Champion%d' % key
+        data[name] = {'version': version, 'id': name, 'key': str(key), 'name': name, 'title': 'the benchmark',
+                      'blurb': 'x' * 300, 'info': {'attack': 5, 'defense': 5, 'magic': 5, 'difficulty': 5},
+                      'image': {'full': name + '.png', 'sprite': 'champion0.png', 'group': 'champion',
+                                'x': 0, 'y': 0, 'w': 48, 'h': 48},
+                      'tags': ['Fighter'], 'partype': 'Mana',
+                      'stats': {stat: 1.0 for stat in ('hp', 'hpperlevel', 'mp', 'mpperlevel', 'movespeed', 'armor',
+                                                       'armorperlevel', 'spellblock', 'spellblockperlevel',
+                                                       'attackrange', 'hpregen', 'hpregenperlevel', 'mpregen',
+                                                       'mpregenperlevel', 'crit', 'critperlevel', 'attackdamage',
+                                                       'attackdamageperlevel', 'attackspeedperlevel', 'attackspeed')}}
+    return {'type': 'champion', 'format': 'standAloneComplex', 'version': version, 'data': data}
+
+def versions():
+    return ['12.4.1', '12.3.1', '12.2.1', '12.1.1']
@@ -0,0 +1,199 @@
+""" Local stand-in for the Riot API and DataDragon, used by the offline benchmarks
+Serves the payloads of fixtures.py over HTTP/1.1 keep-alive, with simulated latency, Riot rate limit
+headers, gzip compressed bodies when asked for (as Riot does) and injected 429 / 5xx errors. The routing host of the original call (americas.api.riotgames.com,
+ddragon.leagueoflegends.com, ...) is not needed: every path is answered the same way whatever the host.
+
+    python benchmarks/mock_server.py --port 8080 --latency 20 --server-errors 0.01
+"""
+import argparse
+import functools
+import gzip
+import http.server
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+
+import fixtures
+
+
+class Behaviour:
+    """ Latency, rate limit headers and error injection shared by every request handler
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, app_limit='100000:1,1000000:120', method_limit='100000:10',
+                 rate_limited=0.0, server_errors=0.0, retry_after=1, seed=None, compress=True):
+        """
+        :param latency: seconds added before answering each request
+        :param jitter: extra random seconds added on top of latency, uniformly drawn from 0-jitter
+        :param app_limit: X-App-Rate-Limit header value sent with every response
+        :param method_limit: X-Method-Rate-Limit header value sent with every response
+        :param rate_limited: probability of answering 429 Too Many Requests
+        :param server_errors: probability of answering 503 / 500
+        :param retry_after: Retry-After seconds of injected 429 responses
+        :param compress: when true bodies are gzip compressed for clients sending Accept-Encoding: gzip
+        """
+
+        self.latency = latency
+        self.jitter = jitter
+        self.app_limit = app_limit
+        self.method_limit = method_limit
+        self.rate_limited = rate_limited
+        self.server_errors = server_errors
+        self.retry_after = retry_after
+        self.compress = compress
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.served = 0
+
+    def roll(self):
+        """ :return: status code to inject, None to answer normally """
+        with self.lock:
+            self.served += 1
+            draw = self.random.random()
+        if draw < self.rate_limited:
+            return 429
+        if draw < self.rate_limited + self.server_errors:
+            return 503 if draw < self.rate_limited + self.server_errors / 2 else 500
+        return None
+
+@functools.lru_cache(maxsize=4096)
+def gzipped(body):
+    # Fixtures hand out the same bytes objects again, so compressed bodies are memoised as well
+    return gzip.compress(body, 6)
+
+ROUTES = list()
+
+def route(pattern):
+    def register(handler):
+        ROUTES.append((re.compile(pattern + '$'), handler))
+        return handler
+    return register
+
+@route(r'/lol/match/v5/matches/by-puuid/([^/]+)/ids')
+def match_ids(data, query, puuid):
+    return data.body('match_ids', fixtures.match_ids, puuid, int(query.get('start', 0)), int(query.get('count', 20)))
+
+@route(r'/lol/match/v5/matches/([^/]+)/timeline')
+def timeline(data, query, matchId):
+    return data.body('timeline', fixtures.timeline, matchId)
+
+@route(r'/lol/match/v5/matches/([^/]+)')
+def match(data, query, matchId):
+    return data.body('match', fixtures.match, matchId)
+
+@route(r'/lol/league(?:-exp)?/v4/entries/([^/]+)/([^/]+)/([^/]+)')
+def league_entries(data, query, queue, tier, division):
+    return data.body('league_entries', fixtures.league_entries, queue, tier, division, int(query.get('page', 1)))
+
+@route(r'/lol/league/v4/(challenger|grandmaster|master)leagues/by-queue/([^/]+)')
+def apex_league(data, query, tier, queue):
+    return data.body('apex_league', fixtures.apex_league, queue, tier.upper())
+
+@route(r'/lol/summoner/v4/summoners/(?:by-puuid/|by-name/|by-account/)?([^/]+)')
+def summoner(data, query, identifier):
+    return data.body('summoner', fixtures.summoner, urllib.parse.unquote(identifier))
+
+@route(r'/cdn/([^/]+)/data/[^/]+/champion.json')
+def champions(data, query, version):
+    return data.body('champion', fixtures.champions, version)
+
+@route(r'/api/versions.json')
+def versions(data, query):
+    return data.body('versions', fixtures.versions)
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, without TCP_NODELAY delayed ACKs add ~40ms to every response
+    disable_nagle_algorithm = True
+    behaviour = Behaviour()
+    data = fixtures.Fixtures()
+
+    def send(self, status, body, headers=()):
+        self.send_response(status)
+        if self.behaviour.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzipped(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Type', 'application/json;charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-App-Rate-Limit', self.behaviour.app_limit)
+        self.send_header('X-App-Rate-Limit-Count', '1:1,1:120')
+        self.send_header('X-Method-Rate-Limit', self.behaviour.method_limit)
+        self.send_header('X-Method-Rate-Limit-Count', '1:10')
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        behaviour = self.behaviour
+        delay = behaviour.latency + (behaviour.random.uniform(0, behaviour.jitter) if behaviour.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        injected = behaviour.roll()
+        if injected == 429:
+            self.send(429, b'{"status":{"message":"Rate limit exceeded","status_code":429}}',
+                      (('Retry-After', str(behaviour.retry_after)), ('X-Rate-Limit-Type', 'application')))
+            return
+        if injected:
+            self.send(injected, b'{"status":{"message":"Service unavailable","status_code":%d}}' % injected)
+            return
+
+        parts = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        for pattern, handler in ROUTES:
+            found = pattern.match(parts.path)
+            if found:
+                self.send(200, handler(self.data, query, *found.groups()))
+                return
+        self.send(404, b'{"status":{"message":"Data not found","status_code":404}}')
+
+    def log_message(self, format, *args):
+        pass
+
+class Server(http.server.ThreadingHTTPServer):
+    # The default backlog of 5 drops concurrent connection attempts, which then wait a 1 sec SYN retransmit
+    request_queue_size = 1024
+    daemon_threads = True
+
+def serve(port=0, behaviour=None, fixtures_dir=None):
+    """ starts the server on a background thread
+    :param port: TCP port on 127.0.0.1, 0 picks a free one
+    :return: http.server.ThreadingHTTPServer, its port is server.server_address[1]
+    """
+
+    handler = type('Handler', (Handler,), {'behaviour': behaviour or Behaviour(), 'data': fixtures.Fixtures(fixtures_dir)})
+    server = Server(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--port', type=int, default=0, help='port to listen on, 0 picks a free one')
+    parser.add_argument('--latency', type=float, default=0, help='milliseconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0, help='random milliseconds added on top of latency')
+    parser.add_argument('--app-limit', default='100000:1,1000000:120', help='X-App-Rate-Limit header value')
+    parser.add_argument('--method-limit', default='100000:10', help='X-Method-Rate-Limit header value')
+    parser.add_argument('--rate-limited', type=float, default=0, help='probability of injecting a 429')
+    parser.add_argument('--server-errors', type=float, default=0, help='probability of injecting a 500 / 503')
+    parser.add_argument('--fixtures', default=None, help='folder of recorded <name>.json payloads')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--no-compress', action='store_true', help='ignore Accept-Encoding, always send plain bodies')
+    args = parser.parse_args(argv)
+
+    behaviour = Behaviour(args.latency / 1000, args.jitter / 1000, args.app_limit, args.method_limit,
+                          args.rate_limited, args.server_errors, seed=args.seed,
+                          compress=not args.no_compress)
+    server = serve(args.port, behaviour, args.fixtures)
+    # The benchmark runner reads the port from this line
+    print('listening', server.server_address[1], flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    sys.exit(main())
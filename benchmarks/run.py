@@ -0,0 +1,251 @@
+""" Offline benchmarks of loliglio against the local mock server
+Starts benchmarks/mock_server.py in a separate process, points every loliglio call at it (the urls are still
+built for the real hosts, so routing, rate limiting and caching behave as in production) and measures
+requests/sec, p50 / p99 latency and client CPU per call of the single, batched and concurrent paths.
+Results are printed as JSON, save them per release and compare them with --compare:
+
+    python benchmarks/run.py --output 0.0.5.json
+    python benchmarks/run.py --latency 20 --server-errors 0.01 --compare 0.0.5.json
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import loliglio
+from loliglio import aio, errors, scheduling
+from loliglio.ratelimit import RateLimiter
+from loliglio.transport import ConnectionPool
+
+
+VERSION = '12.4.1'
+
+def local(base, url):
+    """ :return: url with its scheme and host replaced by the mock server base url """
+    parts = urllib.parse.urlsplit(url)
+    return base + parts.path + ('?' + parts.query if parts.query else '')
+
+class LocalPool(ConnectionPool):
+    """ ConnectionPool sending every request to the mock server """
+
+    def __init__(self, base, **kwargs):
+        super().__init__(**kwargs)
+        self.base = base
+
+    def request(self, url, headers=None, method='GET', stream=False):
+        return super().request(local(self.base, url), headers, method, stream)
+
+class AsyncLocalPool(aio.AsyncConnectionPool):
+    """ AsyncConnectionPool sending every request to the mock server """
+
+    def __init__(self, base, **kwargs):
+        super().__init__(**kwargs)
+        self.base = base
+
+    async def request(self, url, headers=None, method='GET'):
+        return await super().request(local(self.base, url), headers, method)
+
+def start_server(args):
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_server.py'),
+               '--latency', str(args.latency), '--jitter', str(args.jitter),
+               '--rate-limited', str(args.rate_limited), '--server-errors', str(args.server_errors),
+               '--seed', str(args.seed)]
+    if args.fixtures:
+        command += ['--fixtures', args.fixtures]
+    if args.no_compress:
+        command.append('--no-compress')
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    port = int(server.stdout.readline().split()[1])
+    return server, 'http://127.0.0.1:' + str(port)
+
+def reset(base, args):
+    """ fresh library state, so scenarios don't benefit from each other """
+    loliglio.connection_pool = LocalPool(base, maxsize=args.workers)
+    aio.connection_pool = AsyncLocalPool(base, maxsize=args.workers, limit=args.workers * 4)
+    # The mock server advertises huge limits, start with them instead of the development key ones
+    loliglio.limiter = RateLimiter(default_app_limits=((100000, 1),))
+    loliglio.scheduler = scheduling.Scheduler()
+    loliglio.circuit_breaker = errors.CircuitBreaker()
+    loliglio.response_cache = None
+    loliglio.champion_registry.invalidate()
+    loliglio.instrumentation.reset()
+
+def timed(function, *args):
+    start = time.perf_counter()
+    try:
+        function(*args)
+        error = False
+    except errors.ApiError:
+        error = True
+    return time.perf_counter() - start, error
+
+def sequential(calls):
+    def run():
+        return [timed(function, *arguments) for function, arguments in calls]
+    return run
+
+def threaded(calls, workers):
+    def run():
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            return list(executor.map(lambda call: timed(call[0], *call[1]), calls))
+    return run
+
+def batched(matchIds, workers):
+    def run():
+        results = list()
+        start = time.perf_counter()
+        for matchId, result in loliglio.Match.matches_many(matchIds, workers=workers):
+            # Batches report the time each result took to arrive since the batch started
+            results.append((time.perf_counter() - start, isinstance(result, BaseException)))
+        return results
+    return run
+
+def concurrent_async(calls):
+    async def one(function, arguments):
+        start = time.perf_counter()
+        try:
+            await function(*arguments)
+            error = False
+        except errors.ApiError:
+            error = True
+        return time.perf_counter() - start, error
+
+    async def everything():
+        return await asyncio.gather(*(one(function, arguments) for function, arguments in calls))
+
+    def run():
+        return asyncio.run(everything())
+    return run
+
+def url_building(count):
+    def run():
+        results = list()
+        for i in range(count):
+            start = time.perf_counter()
+            loliglio.Summoner.by_name(i % 11, 'Player %d' % i, get_url=True)
+            loliglio.League.entries(i % 11, 0, i % 6, i % 4, get_url=True)
+            loliglio.Match.matches('LA2_%d' % i, get_url=True)
+            loliglio.Match.matches_by_puuid(i % 3, 'puuid%d' % i, get_url=True, count=100)
+            results.append((time.perf_counter() - start, False))
+        return results
+    return run
+
+def champion_lookups(count):
+    def run():
+        results = list()
+        for i in range(count):
+            start = time.perf_counter()
+            loliglio.Champion.by_key(VERSION, 1 + i % 160)
+            loliglio.Champion.by_name(VERSION, 'Champion%d' % (1 + i % 160))
+            results.append((time.perf_counter() - start, False))
+        return results
+    return run
+
+def scenarios(args):
+    n = args.calls
+    matchIds = ['LA2_%d' % (1000000 + i) for i in range(n)]
+    return {
+        'url_building': url_building(n * 10),
+        'summoner_single': sequential([(loliglio.Summoner.by_puuid, (7, 'puuid%d' % i)) for i in range(n)]),
+        'league_single': sequential([(loliglio.League.entries, (7, 0, i % 6, i % 4, False, 1 + i % 3)) for i in range(n)]),
+        'match_single': sequential([(loliglio.Match.matches, (matchId,)) for matchId in matchIds]),
+        'timeline_single': sequential([(loliglio.Match.matches_timeline, (matchId,)) for matchId in matchIds[:max(1, n // 4)]]),
+        'champion_lookup': champion_lookups(n * 10),
+        'match_batched': batched(matchIds, args.workers),
+        'match_threads': threaded([(loliglio.Match.matches, (matchId,)) for matchId in matchIds], args.workers),
+        'summoner_threads': threaded([(loliglio.Summoner.by_puuid, (i % 11, 'puuid%d' % i)) for i in range(n)], args.workers),
+        'match_async': concurrent_async([(aio.AsyncMatch.matches, (matchId,)) for matchId in matchIds]),
+        'league_async': concurrent_async([(aio.AsyncLeague.entries, (i % 11, 0, i % 6, i % 4, False, 1 + i % 3)) for i in range(n)]),
+    }
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+def measure(run):
+    cpu = time.process_time()
+    start = time.perf_counter()
+    results = run()
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    latencies = [latency for latency, _ in results]
+    calls = len(results)
+    return {
+        'calls': calls,
+        'errors': sum(1 for _, error in results if error),
+        'seconds': round(wall, 6),
+        'requests_per_sec': round(calls / wall, 2) if wall else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 4),
+        'cpu_ms_per_call': round(cpu * 1000 / calls, 4) if calls else None,
+    }
+
+def compare(current, baseline):
+    """ prints requests/sec and CPU per call of current against a previous result file """
+    lines = ['%-18s %12s %12s %8s %14s' % ('scenario', 'rps', 'baseline', 'ratio', 'cpu ms ratio')]
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before or not before['requests_per_sec']:
+            continue
+        cpu_ratio = result['cpu_ms_per_call'] / before['cpu_ms_per_call'] if before['cpu_ms_per_call'] else 0
+        lines.append('%-18s %12.1f %12.1f %8.2f %14.2f' % (name, result['requests_per_sec'], before['requests_per_sec'],
+                                                         result['requests_per_sec'] / before['requests_per_sec'], cpu_ratio))
+    print('\n'.join(lines), file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--calls', type=int, default=200, help='calls per scenario')
+    parser.add_argument('--workers', type=int, default=16, help='threads, connections per host and batch size of the concurrent paths')
+    parser.add_argument('--latency', type=float, default=0, help='milliseconds the mock server waits before answering')
+    parser.add_argument('--jitter', type=float, default=0, help='random milliseconds added on top of latency')
+    parser.add_argument('--rate-limited', type=float, default=0, help='probability of an injected 429')
+    parser.add_argument('--server-errors', type=float, default=0, help='probability of an injected 500 / 503')
+    parser.add_argument('--fixtures', default=None, help='folder of recorded <name>.json payloads')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--no-compress', action='store_true', help='the mock server sends plain bodies, as before compression was negotiated')
+    parser.add_argument('--scenarios', default=None, help='comma separated scenario names, all by default')
+    parser.add_argument('--output', default=None, help='file where the JSON results are written, stdout by default')
+    parser.add_argument('--compare', default=None, help='previous JSON results to compare against')
+    args = parser.parse_args(argv)
+
+    server, base = start_server(args)
+    try:
+        available = scenarios(args)
+        names = args.scenarios.split(',') if args.scenarios else list(available)
+        results = dict()
+        for name in names:
+            reset(base, args)
+            results[name] = measure(available[name])
+            print(name, results[name], file=sys.stderr)
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        'meta': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                 'platform': platform.platform(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                 'arguments': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}},
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+""" Startup benchmarks of loliglio: time to import the package and reach the first call
+Every scenario runs in a fresh interpreter, measured from inside it (import and setup only) and from outside
+(the whole process, interpreter start included). Results are printed as JSON, save them per release and
+compare them with --compare:
+
+    python benchmarks/startup.py --output startup-0.0.5.json
+    python benchmarks/startup.py --compare startup-0.0.5.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'python': 'pass',
+    'import': 'import loliglio',
+    'import_match': 'from loliglio import Match',
+    'first_url': "import loliglio\nloliglio.Match.matches('LA2_1138947703', get_url=True)",
+    # Everything a blocking call sets up before its request is sent
+    'call_ready': "import loliglio\nfor name in ('connection_pool', 'limiter', 'scheduler', 'retry_policy', 'circuit_breaker',"
+                  " 'coalescer', 'instrumentation'):\n    getattr(loliglio, name)\nloliglio.Match.matches",
+    'import_aio': 'from loliglio import aio',
+}
+# Scenarios summed up after every run: a bare import only pays for the IDs, the others for a first endpoint
+HEADLINE = ('import', 'import_match', 'first_url')
+
+def run_once(code):
+    """ :return: tuple of the seconds code took inside a fresh interpreter and the seconds of the whole process """
+    timed = 'import time\n_started = time.perf_counter()\n' + code + '\nprint(time.perf_counter() - _started)'
+    # Run from the checkout the script belongs to, the current directory comes first in sys.path with -c
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', timed], stdout=subprocess.PIPE, check=True, cwd=ROOT, text=True).stdout
+    return float(output.split()[-1]), time.perf_counter() - started
+
+def measure(code, runs):
+    inside, process = zip(*(run_once(code) for _ in range(runs)))
+    return {
+        'runs': runs,
+        'median_ms': round(statistics.median(inside) * 1000, 3),
+        'min_ms': round(min(inside) * 1000, 3),
+        'process_median_ms': round(statistics.median(process) * 1000, 3),
+    }
+
+def summary(report):
+    """ prints the median startup of the HEADLINE scenarios that were run """
+    lines = ['%-14s %10s %10s' % ('scenario', 'ms', 'process')]
+    for name in HEADLINE:
+        result = report['results'].get(name)
+        if result is not None:
+            lines.append('%-14s %10.2f %10.2f' % (name, result['median_ms'], result['process_median_ms']))
+    print('\n'.join(lines), file=sys.stderr)
+
+def compare(current, baseline):
+    """ prints the median startup of current against a previous result file """
+    lines = ['%-14s %10s %10s %8s' % ('scenario', 'ms', 'baseline', 'ratio')]
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before or not before['median_ms']:
+            continue
+        lines.append('%-14s %10.2f %10.2f %8.2f' % (name, result['median_ms'], before['median_ms'],
+                                                    result['median_ms'] / before['median_ms']))
+    print('\n'.join(lines), file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=20, help='fresh interpreters per scenario')
+    parser.add_argument('--scenarios', default=None, help='comma separated scenario names, all by default')
+    parser.add_argument('--output', default=None, help='file where the JSON results are written, stdout by default')
+    parser.add_argument('--compare', default=None, help='previous JSON results to compare against')
+    args = parser.parse_args(argv)
+
+    names = args.scenarios.split(',') if args.scenarios else list(SCENARIOS)
+    results = dict()
+    for name in names:
+        results[name] = measure(SCENARIOS[name], args.runs)
+        print(name, results[name], file=sys.stderr)
+
+    report = {
+        'meta': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                 'platform': platform.platform(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                 'arguments': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}},
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+    summary(report)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+
+if __name__ == '__main__':
+    main()
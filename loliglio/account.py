@@ -0,0 +1,36 @@
+""" Account-v1 endpoints: puuid, gameName and tagLine of Riot accounts """
+from loliglio import clusters, routes
+from loliglio.client import api_call
+
+
+class Account:
+    """ Allows accessing to the puuid, gameName and tagLine of a LOL account
+    official information at: https://developer.riotgames.com/apis#account-v1
+    """
+
+    @staticmethod
+    def by_puuid(clusterId, puuid, get_url=False):
+        """ Get account by puuid
+        :param clusterId: riot cluster ID. Accepted values: 0-2(inclusive) respective to 'AMERICAS', 'ASIA' & 'EUROPE'
+        :param puuid: Public User ID's are globally unique. Different APIs use different IDs
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+
+        url = routes.ACCOUNT_BY_PUUID.url(clusters[clusterId], puuid)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def by_riot_id(clusterId, gameName, tagLine, get_url=False):
+        """ Get account by riot id
+        :param clusterId: riot cluster ID. Accepted values: 0-2(inclusive) respective to 'AMERICAS', 'ASIA' & 'EUROPE'
+        :param gameName: Name as shown in the League Client (can contain not-alphabetic chars)
+        :param tagLine: Tag line as shown in the League Client
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+
+        url = routes.ACCOUNT_BY_RIOT_ID.url(clusters[clusterId], gameName, tagLine)
+        if get_url: return url
+        return api_call(url)
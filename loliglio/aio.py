@@ -0,0 +1,414 @@
+""" asyncio client for the Riot and DataDragon APIs
+Mirrors every endpoint class of loliglio (AsyncAccount, AsyncMatch, AsyncLeague, ...) with awaitable methods.
+Requests go through a non-blocking keep-alive transport built on asyncio streams, bounded by a concurrency
+semaphore, and share loliglio.limiter with the blocking client, so one event loop can keep hundreds of
+calls in flight across every region without exceeding the rate limits. Standard library only.
+
+    import asyncio
+    from loliglio.aio import AsyncMatch
+
+    async def main(ids):
+        return await asyncio.gather(*(AsyncMatch.matches(matchId) for matchId in ids))
+"""
+import asyncio
+import functools
+import http.client
+import inspect
+import io
+import time
+import urllib.error
+import urllib.parse
+
+import loliglio
+from loliglio import errors
+from loliglio import models
+from loliglio.transport import REDIRECT_CODES, MAX_REDIRECTS, ACCEPT_ENCODING, Response, decode_body, redirected, unverified_context
+from loliglio.singleflight import AsyncSingleFlight
+
+
+class AsyncConnectionPool:
+    """ Keep-alive HTTP/1.1 connections over asyncio streams, grouped by (scheme, host, port)
+    At most maxsize connections per host and limit requests overall are in flight at the same time.
+    """
+
+    def __init__(self, maxsize=50, limit=200, timeout=30, context=None, compress=True):
+        """
+        :param maxsize: maximum number of simultaneous connections per host
+        :param limit: maximum number of requests in flight across every host
+        :param timeout: seconds allowed for connecting and for reading a whole response
+        :param context: ssl.SSLContext for HTTPS hosts, transport.unverified_context() by default
+        :param compress: when true responses are requested compressed (Accept-Encoding: gzip, deflate)
+        """
+
+        self.compress = compress
+        self.maxsize = maxsize
+        self.limit = limit
+        self.timeout = timeout
+        self.context = context if context is not None else unverified_context()
+        self._idle = dict()
+        self._slots = dict()
+        self._semaphore = None
+        self._loop = None
+
+    def _slot(self, key):
+        # Semaphores and streams belong to one event loop, start over when called from a new one
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._slots = dict()
+            self._idle = dict()
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = asyncio.Semaphore(self.maxsize)
+        return slot
+
+    async def _checkout(self, key):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = key
+        if scheme == 'https':
+            connecting = asyncio.open_connection(host, port, ssl=self.context, server_hostname=host)
+        else:
+            connecting = asyncio.open_connection(host, port)
+        reader, writer = await asyncio.wait_for(connecting, self.timeout)
+        return reader, writer, False
+
+    def _checkin(self, key, reader, writer):
+        self._idle.setdefault(key, list()).append((reader, writer))
+
+    @staticmethod
+    async def _read_body(reader, headers):
+        if headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = list()
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    # Skips trailers up to the final empty line
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return b''.join(chunks), True
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+        length = headers.get('Content-Length')
+        if length is not None:
+            return await reader.readexactly(int(length)), True
+        return await reader.read(), False
+
+    async def _read_response(self, reader, method):
+        status_line = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+        if not status_line:
+            raise ConnectionResetError('connection closed before the response')
+        pieces = status_line.split(' ', 2)
+        version, status = pieces[0], int(pieces[1])
+        reason = pieces[2] if len(pieces) > 2 else ''
+        raw = list()
+        while True:
+            line = await reader.readline()
+            raw.append(line)
+            if line in (b'\r\n', b'\n', b''):
+                break
+        headers = http.client.parse_headers(io.BytesIO(b''.join(raw)))
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            data, keep = b'', True
+        else:
+            data, keep = await self._read_body(reader, headers)
+        connection = headers.get('Connection', '').lower()
+        if connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive'):
+            keep = False
+        return status, reason, headers, data, keep
+
+    async def _send(self, method, url, headers):
+        parts = urllib.parse.urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        lines = [method + ' ' + path + ' HTTP/1.1', 'Host: ' + parts.netloc, 'Connection: keep-alive']
+        lines.extend(name + ': ' + str(value) for name, value in headers.items())
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        slot = self._slot(key)
+        async with self._semaphore, slot:
+            while True:
+                reader, writer, reused = await self._checkout(key)
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, reason, response_headers, data, keep = await asyncio.wait_for(
+                        self._read_response(reader, method), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                    writer.close()
+                    # The server dropped an idle keep-alive connection, try again on a fresh one
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep:
+                    self._checkin(key, reader, writer)
+                else:
+                    writer.close()
+                return Response(url, status, reason, response_headers,
+                                decode_body(data, response_headers.get('Content-Encoding')), len(data))
+
+    async def request(self, url, headers=None, method='GET'):
+        """ sends a request over a pooled connection, following redirects
+        :param url: absolute http(s) url to connect to
+        :param headers: optional dict of extra request headers
+        :param method: HTTP method, 'GET' by default
+        :return: transport.Response with status, headers and body. HTTP errors (>= 400) raise urllib.error.HTTPError
+        """
+
+        headers = dict(headers) if headers else dict()
+        if self.compress:
+            headers.setdefault('Accept-Encoding', ACCEPT_ENCODING)
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._send(method, url, headers)
+            location = response.getheader('Location')
+            if response.status not in REDIRECT_CODES or not location:
+                break
+            url, headers = redirected(url, location, headers)
+        if response.status >= 400:
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, io.BytesIO(response.data))
+        return response
+
+    def close(self):
+        """ closes every idle connection """
+        idle, self._idle = self._idle, dict()
+        for conns in idle.values():
+            for reader, writer in conns:
+                writer.close()
+
+# Shared by every awaitable call. Replace it to change the concurrency bounds or timeouts
+connection_pool = AsyncConnectionPool()
+
+# Concurrent awaits of the same url share a single request. None disables it
+coalescer = AsyncSingleFlight()
+
+async def acquire(host, method, rate_limiting=True):
+    """ waits without blocking the event loop until loliglio.scheduler and loliglio.limiter grant a call to method on host
+    :return: tuple of the seconds slept and the ID of the api key to send the call with (see loliglio.acquire)
+    """
+
+    keys = loliglio.api_keys.order() if loliglio.api_keys is not None else (None,)
+    if not rate_limiting:
+        return 0, keys[0]
+    scheduler = loliglio.scheduler
+    if scheduler is None:
+        slept = 0
+        delay, key = loliglio.limiter.grant(host, method, keys=keys)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            slept += delay
+            delay, key = loliglio.limiter.grant(host, method, keys=keys)
+        return slept, key
+    # Tasks can't wait on the scheduler's condition, they poll their ticket instead
+    ticket = scheduler.enqueue(host, method)
+    try:
+        while True:
+            delay = scheduler.poll(ticket, loliglio.limiter, keys)
+            if not delay:
+                return ticket.waited, ticket.key
+            await asyncio.sleep(delay)
+    finally:
+        scheduler.cancel(ticket)
+
+async def api_call(url, rate_limiting=True):
+    """ awaitable counterpart of loliglio.api_call, sharing its rate limiter and response cache
+    Tasks awaiting the same url at the same time share one request and the same JSON object (see coalescer)
+    :param url: riot API call url to connect to and retrieve its returning JSON
+    :param rate_limiting: establishes if the call should be counted for the rate-limiter, True by default
+    :return: JSON object retrieved from riot API call. Failures raise errors.ApiError subclasses (e.g. errors.NotFound)
+    """
+
+    if coalescer is None:
+        return await direct_call(url, rate_limiting)
+    return await coalescer.do((url, rate_limiting), direct_call, url, rate_limiting)
+
+async def direct_call(url, rate_limiting=True):
+    """ api_call without the request coalescing """
+
+    host, method = loliglio.method_of(url)
+    instrumentation = loliglio.instrumentation
+    call = instrumentation.start(url, host, method) if instrumentation is not None else None
+    try:
+        data_json = await _direct_call(url, rate_limiting, host, method, call)
+    except BaseException as e:
+        if call is not None:
+            instrumentation.finish(call, e)
+        raise
+    if call is not None:
+        instrumentation.finish(call)
+    return data_json
+
+async def _direct_call(url, rate_limiting, host, method, call):
+    response_cache = loliglio.response_cache
+    entry = None
+    if response_cache is not None:
+        entry = response_cache.get(url, method)
+        if entry is not None and entry.fresh:
+            if call is not None:
+                call.cached = 'fresh'
+            return loliglio.decode(entry.body, call)
+    headers = loliglio.request_headers(host, entry)
+
+    attempt = 0
+    while True:
+        if loliglio.circuit_breaker is not None:
+            loliglio.circuit_breaker.check(host, url)
+        slept, key = await acquire(host, method, rate_limiting)
+        if call is not None:
+            call.slept += slept
+        if slept >= 1:
+            print('Rate limit reached on', host, method, 'slept', round(slept, 2), 'secs')
+        sent = time.perf_counter()
+        try:
+            uh = await connection_pool.request(url, loliglio.keyed_headers(host, headers, key))
+            break
+        except urllib.error.HTTPError as e:
+            error = errors.from_http_error(e)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, http.client.HTTPException) as e:
+            error = errors.TransportError(url, str(e) or repr(e))
+        finally:
+            if call is not None:
+                call.network += time.perf_counter() - sent
+        if call is not None:
+            call.status = error.status
+        await asyncio.sleep(loliglio.retry_delay(error, host, method, rate_limiting, attempt, key))
+        attempt += 1
+        if call is not None:
+            call.retries = attempt
+    if loliglio.circuit_breaker is not None:
+        loliglio.circuit_breaker.success(host)
+    if rate_limiting:
+        loliglio.limiter.update(host, method, uh.headers, key)
+
+    if call is not None:
+        call.status = uh.status
+    if entry is not None and uh.status == 304:
+        data = response_cache.revalidated(url, method, entry, uh.headers)
+        if call is not None:
+            call.cached = 'revalidated'
+    else:
+        data = uh.read()
+        if call is not None:
+            call.received = len(data)
+            call.transferred = uh.transferred
+        if response_cache is not None:
+            response_cache.put(url, method, data, uh.headers)
+    return loliglio.decode(data, call)
+
+def _mirror(function, rate_limiting=True, convert=None):
+    """ wraps a blocking endpoint method (one accepting get_url) into an awaitable one
+    The blocking method only builds the url (get_url=True), the call itself is awaited through api_call
+    :param convert: function applied to the JSON object when the method is called with compact=True
+    """
+
+    signature = inspect.signature(function)
+
+    @functools.wraps(function)
+    async def method(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        get_url = bound.arguments.pop('get_url', False)
+        compact = bound.arguments.pop('compact', False)
+        url = function(*bound.args, get_url=True, **bound.kwargs)
+        if get_url: return url
+        data_json = await api_call(url, rate_limiting=rate_limiting)
+        return convert(data_json) if compact and convert is not None else data_json
+    return staticmethod(method)
+
+def _mirror_class(cls, name):
+    """ builds an async class with every endpoint method and nested class of cls """
+    namespace = {'__doc__': cls.__doc__, '__module__': __name__, '__qualname__': name}
+    for attr, value in vars(cls).items():
+        if isinstance(value, staticmethod) and 'get_url' in inspect.signature(value.__func__).parameters:
+            namespace[attr] = _mirror(value.__func__)
+        elif isinstance(value, type):
+            namespace[attr] = _mirror_class(value, name + '.' + attr)
+    return type(name.rsplit('.', 1)[-1], (), namespace)
+
+AsyncAccount = _mirror_class(loliglio.Account, 'AsyncAccount')
+AsyncChampionMastery = _mirror_class(loliglio.ChampionMastery, 'AsyncChampionMastery')
+AsyncClash = _mirror_class(loliglio.Clash, 'AsyncClash')
+AsyncLeague = _mirror_class(loliglio.League, 'AsyncLeague')
+AsyncStatus = _mirror_class(loliglio.Status, 'AsyncStatus')
+AsyncMatch = _mirror_class(loliglio.Match, 'AsyncMatch')
+AsyncMatch.matches = _mirror(loliglio.Match.matches, convert=models.Match.from_json)
+AsyncMatch.matches_timeline = _mirror(loliglio.Match.matches_timeline, convert=models.Timeline.from_json)
+AsyncSpectator = _mirror_class(loliglio.Spectator, 'AsyncSpectator')
+AsyncSummoner = _mirror_class(loliglio.Summoner, 'AsyncSummoner')
+
+class AsyncChampion:
+    __doc__ = loliglio.Champion.__doc__
+
+    champion_rotations = _mirror(loliglio.Champion.champion_rotations)
+
+    @staticmethod
+    async def _index(version):
+        """ :return: ChampionIndex of version from loliglio.champion_registry, downloading it when missing """
+        index = loliglio.champion_registry.peek(version)
+        if index is None:
+            champ_info = await api_call(loliglio.Champion.champions(version, get_url=True), rate_limiting=False)
+            index = loliglio.champion_registry.load(version, champ_info)
+        return index
+
+    @staticmethod
+    async def champions(version, get_url=False):
+        """ Returns all available champion data from DataDragon at the specified version """
+        if get_url: return loliglio.Champion.champions(version, get_url=True)
+        return (await AsyncChampion._index(version)).champ_info
+
+    @staticmethod
+    async def names(version, get_url=False):
+        """ Returns a list of strings containing each champion's name (Wukong name is 'Wukong') """
+        if get_url: return loliglio.Champion.names(version, get_url=True)
+        return list((await AsyncChampion._index(version)).names)
+
+    @staticmethod
+    async def ids(version, get_url=False):
+        """ Returns a list of strings containing each champion's id (Wukong name is 'moneyking') """
+        if get_url: return loliglio.Champion.ids(version, get_url=True)
+        return list((await AsyncChampion._index(version)).ids)
+
+    @staticmethod
+    async def keys(version, get_url=False):
+        """ Returns a list of ints containing each champion's key """
+        if get_url: return loliglio.Champion.keys(version, get_url=True)
+        return list((await AsyncChampion._index(version)).keys)
+
+    @staticmethod
+    async def by_name(version, championName, get_url=False):
+        """ Returns information of the champion specified. P.D. Wukong name is 'Wukong' """
+        if get_url: return loliglio.Champion.by_name(version, championName, get_url=True)
+        return (await AsyncChampion._index(version)).by_name.get(championName, 404)
+
+    @staticmethod
+    async def by_id(version, championId, get_url=False):
+        """ Returns information of the champion specified. P.D. Wukong id is 'moneyking' """
+        if get_url: return loliglio.Champion.by_id(version, championId, get_url=True)
+        return (await AsyncChampion._index(version)).by_id.get(championId, 404)
+
+    @staticmethod
+    async def by_key(version, championKey, get_url=False):
+        """ Returns information of the champion specified """
+        if get_url: return loliglio.Champion.by_key(version, championKey, get_url=True)
+        return (await AsyncChampion._index(version)).by_key.get(str(championKey), 404)
+
+class AsyncVersion:
+    __doc__ = loliglio.Version.__doc__
+
+    versions = _mirror(loliglio.Version.versions, rate_limiting=False)
+
+    @staticmethod
+    async def last_version(get_url=False):
+        """ Get a string of the last version """
+        if get_url: return loliglio.Version.last_version(get_url=True)
+        return (await api_call(loliglio.Version.versions(get_url=True), rate_limiting=False))[0]
@@ -0,0 +1,305 @@
+""" Vectorized aggregation of matches and timelines: per champion winrates, KDA and per minute gold / XP curves
+Matches are flattened into numeric columns, one row per participant (the columns of loliglio.export: champions
+by their Champion key, regions by their loliglio regions ID, queues by queueId, patches as 1204 for 12.4),
+and timelines into one row per participant and frame with a 'minute' column. Filters and group-by aggregations
+then run over whole columns at once: with NumPy when it is installed (columns are numpy arrays, grouped with
+numpy.unique and numpy.bincount), otherwise over array.array columns in plain loops.
+
+    from loliglio import analytics
+    table = analytics.Table.from_matches(loliglio.Match.matches_many(matchIds))     # or Table.from_export(path)
+    stats = analytics.champion_stats(table.where(queueId=420, patch=1204))
+    stats['championId'], stats['winrate'], stats['kda']                              # one value per champion
+
+    frames = analytics.Table.from_timelines(zip(matches, timelines))
+    gold = analytics.curves(frames, ('totalGold', 'xp')).where(championId=103)
+    gold['minute'], gold['totalGold']                                                 # mean gold of Ahri per minute
+"""
+import array
+
+from loliglio import export, models
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Participant frame stats kept by Table.from_timelines, nested ones dotted (see models.Timeline)
+TIMELINE_STATS = ('totalGold', 'currentGold', 'xp', 'level', 'minionsKilled', 'jungleMinionsKilled')
+
+def _column(values):
+    """ :return: numpy array viewing values (array.array or memoryview) without copying it, values itself without NumPy """
+    if numpy is None:
+        return values
+    return numpy.frombuffer(values, dtype=values.typecode if isinstance(values, array.array) else values.format)
+
+def _typecode(values):
+    if numpy is not None:
+        return values.dtype.char
+    return values.typecode if isinstance(values, array.array) else values.format
+
+def _take(values, rows):
+    """ :return: the values of column values at the indexes rows (a boolean mask with NumPy) """
+    if numpy is not None:
+        return values[rows]
+    return array.array(_typecode(values), (values[row] for row in rows))
+
+def _ratio(numerators, denominators):
+    """ :return: float column of numerators / denominators, denominators under 1 counting as 1 """
+    if numpy is not None:
+        return numerators / numpy.maximum(denominators, 1)
+    return array.array('d', (numerator / max(denominator, 1) for numerator, denominator in zip(numerators, denominators)))
+
+def _sum(first, second):
+    if numpy is not None:
+        return first + second
+    return array.array('d', (a + b for a, b in zip(first, second)))
+
+class Table:
+    """ Numeric columns of the same length, numpy arrays when NumPy is installed, array.array otherwise
+    table['kills'] is a column, table.strings('puuid') decodes a dictionary-encoded string column.
+    """
+
+    def __init__(self, columns, dictionaries=None, source=None):
+        """
+        :param columns: dict of {name: column}, every column having one value per row
+        :param dictionaries: dict of {string column: list of its strings, indexed by code}
+        :param source: object the columns are views of, kept open as long as the table (e.g. export.PackedColumns)
+        """
+
+        self.columns = columns
+        self.dictionaries = dictionaries or dict()
+        self._source = source
+
+    @classmethod
+    def from_matches(cls, matches):
+        """ flattens matches into one row per participant
+        :param matches: iterable of MatchDto JSON objects or models.Match, or of (matchId, result) tuples as
+        yielded by Match.matches_many (exceptions are skipped)
+        :return: Table of the export.COLUMNS columns
+        """
+
+        columns = {name: array.array(typecode) for name, typecode in export.COLUMNS}
+        dictionaries = {name: dict() for name, _ in export.STRING_COLUMNS}
+        strings = {name: list() for name, _ in export.STRING_COLUMNS}
+        for match in matches:
+            if isinstance(match, tuple):
+                match = match[1]
+            if isinstance(match, BaseException):
+                continue
+            export.append_match(columns, match, dictionaries, strings)
+        return cls({name: _column(column) for name, column in columns.items()}, strings)
+
+    @classmethod
+    def from_timelines(cls, pairs, stats=TIMELINE_STATS):
+        """ flattens timelines into one row per participant and frame
+        :param pairs: iterable of (match, timeline) tuples: MatchDto JSON object or models.Match, and the timeline
+        JSON object or models.Timeline of the same match. Pairs holding an exception are skipped
+        :param stats: participant frame stats kept as columns, missing ones read as 0
+        :return: Table of the export.COLUMNS columns of the participant, 'minute' (frame timestamp rounded to
+        the minute) and one float column per stat
+        """
+
+        columns = {name: array.array(typecode) for name, typecode in export.COLUMNS}
+        columns['minute'] = array.array('i')
+        for name in stats:
+            columns[name] = array.array('d')
+        dictionaries = {name: dict() for name, _ in export.STRING_COLUMNS}
+        strings = {name: list() for name, _ in export.STRING_COLUMNS}
+        for match, timeline in pairs:
+            if isinstance(match, BaseException) or isinstance(timeline, BaseException):
+                continue
+            if not isinstance(timeline, models.Timeline):
+                timeline = models.Timeline.from_json(timeline)
+            participants = {name: array.array(typecode) for name, typecode in export.COLUMNS}
+            export.append_match(participants, match, dictionaries, strings)
+            rows = {participantId: row for row, participantId in enumerate(participants['participantId'])}
+            try:
+                order = [rows[int(participantId)] for participantId in timeline.participant_ids]
+            except (KeyError, ValueError):
+                # Timeline of another match, or of participants the match doesn't have
+                continue
+            frames = len(timeline)
+            # Columns hold frame after frame, in the order of the timeline participants, like models.Timeline ones
+            for name, typecode in export.COLUMNS:
+                column = participants[name]
+                columns[name].extend(array.array(typecode, [column[row] for row in order] * frames))
+            for timestamp in timeline.timestamps:
+                columns['minute'].extend(array.array('i', [int(round(timestamp / 60000))]) * len(order))
+            for name in stats:
+                values = timeline.columns.get(name)
+                if values is None:
+                    columns[name].extend(array.array('d', [0]) * (frames * len(order)))
+                else:
+                    columns[name].fromlist([float(value) for value in values])
+        return cls({name: _column(column) for name, column in columns.items()}, strings)
+
+    @classmethod
+    def from_export(cls, path):
+        """ opens a file or folder written by export.ParticipantWriter. 'packed' columns are memory-mapped and
+        viewed without copying them, Arrow and Parquet ones (which need pyarrow) are converted once
+        :return: Table of the export.COLUMNS columns
+        """
+
+        source = export.read(path)
+        if isinstance(source, export.PackedColumns):
+            columns = {name: _column(source[name]) for name in source}
+            dictionaries = {name: source.dictionary(name) for name in source.meta['dictionaries']}
+            return cls(columns, dictionaries, source)
+        typecodes = dict(export.COLUMNS)
+        columns = dict()
+        dictionaries = dict()
+        for name in source.column_names:
+            column = source.column(name).combine_chunks()
+            if export.pyarrow.types.is_string(column.type):
+                # Arrow files hold the strings themselves, they are dictionary-encoded again
+                encoded = column.dictionary_encode()
+                dictionaries[name] = encoded.dictionary.to_pylist()
+                column = encoded.indices
+            if numpy is not None:
+                columns[name] = column.to_numpy(zero_copy_only=False)
+            else:
+                columns[name] = array.array(typecodes.get(name, 'q'), column.to_pylist())
+        return cls(columns, dictionaries)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        for column in self.columns.values():
+            return len(column)
+        return 0
+
+    def strings(self, name):
+        """ :return: list of the decoded strings of a dictionary-encoded column """
+        dictionary = self.dictionaries[name]
+        return [dictionary[code] for code in self.columns[name]]
+
+    def _codes(self, name, value):
+        # Strings filter dictionary-encoded columns by their code, unknown ones match no row
+        if isinstance(value, str) and name in self.dictionaries:
+            dictionary = self.dictionaries[name]
+            return dictionary.index(value) if value in dictionary else -1
+        return value
+
+    def where(self, **filters):
+        """ keeps the rows matching every filter
+        :param filters: column=value or column=(value, ...) for any of several values, e.g.
+        where(queueId=420, patch=(1203, 1204), regionId=6, teamPosition='MIDDLE')
+        :return: new Table of the matching rows
+        """
+
+        if numpy is not None:
+            mask = numpy.ones(len(self), dtype=bool)
+            for name, value in filters.items():
+                if isinstance(value, (tuple, list, set, frozenset)):
+                    mask &= numpy.isin(self.columns[name], [self._codes(name, item) for item in value])
+                else:
+                    mask &= self.columns[name] == self._codes(name, value)
+            rows = mask
+        else:
+            rows = range(len(self))
+            for name, value in filters.items():
+                column = self.columns[name]
+                if isinstance(value, (tuple, list, set, frozenset)):
+                    accepted = {self._codes(name, item) for item in value}
+                    rows = [row for row in rows if column[row] in accepted]
+                else:
+                    value = self._codes(name, value)
+                    rows = [row for row in rows if column[row] == value]
+        return Table({name: _take(column, rows) for name, column in self.columns.items()}, self.dictionaries, self._source)
+
+    def group_by(self, by, values=()):
+        """ counts the rows and sums columns per distinct combination of the by columns
+        :param by: name or tuple of names of the columns grouped on (e.g. ('championId', 'teamPosition'))
+        :param values: names of the columns summed per group
+        :return: Table with one row per group, sorted by the by columns: the by columns, 'rows' (number of rows of
+        the group) and the float sum of every values column
+        """
+
+        by = (by,) if isinstance(by, str) else tuple(by)
+        if numpy is not None:
+            # Every key column is reduced to codes 0..distinct-1, combined in one int64 key (mixed radix)
+            combined = numpy.zeros(len(self), dtype=numpy.int64)
+            distinct = list()
+            for name in by:
+                uniques, codes = numpy.unique(self.columns[name], return_inverse=True)
+                combined = combined * len(uniques) + codes
+                distinct.append(uniques)
+            groups, inverse = numpy.unique(combined, return_inverse=True)
+            result = dict()
+            rest = groups
+            for name, uniques in reversed(list(zip(by, distinct))):
+                rest, codes = numpy.divmod(rest, len(uniques))
+                result[name] = uniques[codes]
+            result = {name: result[name] for name in by}
+            result['rows'] = numpy.bincount(inverse, minlength=len(groups))
+            for name in values:
+                result[name] = numpy.bincount(inverse, weights=self.columns[name], minlength=len(groups))
+            return Table(result, {name: self.dictionaries[name] for name in by if name in self.dictionaries})
+
+        groups = dict()
+        inverse = array.array('q', (groups.setdefault(key, len(groups)) for key in zip(*(self.columns[name] for name in by))))
+        counts = [0] * len(groups)
+        for group in inverse:
+            counts[group] += 1
+        sums = dict()
+        for name in values:
+            totals = sums[name] = [0] * len(groups)
+            for group, value in zip(inverse, self.columns[name]):
+                totals[group] += value
+        order = sorted(groups)
+        result = {name: array.array(_typecode(self.columns[name]), (key[position] for key in order))
+                  for position, name in enumerate(by)}
+        result['rows'] = array.array('q', (counts[groups[key]] for key in order))
+        for name in values:
+            result[name] = array.array('d', (sums[name][groups[key]] for key in order))
+        return Table(result, {name: self.dictionaries[name] for name in by if name in self.dictionaries})
+
+    def to_dicts(self):
+        """ :return: list of the rows as dicts, dictionary-encoded columns decoded """
+        names = list(self.columns)
+        decoded = [self.strings(name) if name in self.dictionaries else self.columns[name].tolist() for name in names]
+        return [dict(zip(names, values)) for values in zip(*decoded)]
+
+def champion_stats(table, by=('championId',)):
+    """ per champion games, winrate and average kills, deaths, assists and KDA
+    :param table: Table of participant rows (Table.from_matches, Table.from_export), filtered with where beforehand
+    :param by: columns grouped on, e.g. ('championId', 'teamPosition') for stats per champion and role
+    :return: Table with the by columns, games, wins, winrate, kills, deaths, assists (per game) and kda
+    ((kills + assists) / deaths, deaths under 1 counting as 1). championId is the Champion key (see Champion.by_key)
+    """
+
+    groups = table.group_by(by, ('win', 'kills', 'deaths', 'assists'))
+    by = (by,) if isinstance(by, str) else tuple(by)
+    games = groups['rows']
+    columns = {name: groups[name] for name in by}
+    columns['games'] = games
+    columns['wins'] = groups['win']
+    columns['winrate'] = _ratio(groups['win'], games)
+    for name in ('kills', 'deaths', 'assists'):
+        columns[name] = _ratio(groups[name], games)
+    columns['kda'] = _ratio(_sum(groups['kills'], groups['assists']), groups['deaths'])
+    return Table(columns, groups.dictionaries)
+
+def curves(table, stats=('totalGold', 'xp'), by=('championId',)):
+    """ per minute average of timeline stats
+    :param table: Table of participant frame rows (Table.from_timelines), filtered with where beforehand
+    :param stats: stat columns averaged
+    :param by: columns grouped on besides the minute, e.g. ('championId', 'win') for winners and losers apart
+    :return: Table with the by columns, 'minute', 'rows' and the mean of every stat, sorted by group then minute
+    """
+
+    by = ((by,) if isinstance(by, str) else tuple(by)) + ('minute',)
+    groups = table.group_by(by, stats)
+    columns = {name: groups[name] for name in by}
+    columns['rows'] = groups['rows']
+    for name in stats:
+        columns[name] = _ratio(groups[name], groups['rows'])
+    return Table(columns, groups.dictionaries)
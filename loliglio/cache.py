@@ -0,0 +1,187 @@
+""" Optional on-disk cache of API responses, kept between process runs
+Entries are stored per url (which carries no api key, it is sent as a header) and expire after a TTL chosen per request template, so
+finished matches are kept forever while slowly changing data such as versions.json is revalidated with
+If-None-Match / If-Modified-Since once it gets stale. The directory is capped in size, least recently used
+entries are deleted first.
+
+    import loliglio
+    from loliglio.cache import ResponseCache
+    loliglio.response_cache = ResponseCache('~/.cache/loliglio')
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+FOREVER = None
+
+# Seconds each request template stays fresh. FOREVER never expires, templates not listed aren't cached
+DEFAULT_TTLS = {
+    '/lol/match/v5/matches/{matchId}': FOREVER,
+    '/lol/match/v5/matches/{matchId}/timeline': FOREVER,
+    '/lol/summoner/v4/summoners/by-puuid/{encryptedPUUID}': 24 * 3600,
+    '/riot/account/v1/accounts/by-puuid/{puuid}': 24 * 3600,
+    '/cdn/{version}/data/{locale}/champion.json': FOREVER,
+    '/api/versions.json': 3600,
+}
+
+class Entry:
+    """ Cached response body with the validators needed to revalidate it
+    """
+
+    def __init__(self, path, stored, etag, last_modified, body, fresh):
+        self.path = path
+        self.stored = stored
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.fresh = fresh
+
+    def validators(self):
+        """ :return: dict of conditional request headers, empty when the server sent no validators """
+        headers = dict()
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """ Directory of cached responses with TTL per request template and a least recently used size cap
+    """
+
+    def __init__(self, directory, ttls=None, default_ttl=0, maxsize=512 * 1024 * 1024):
+        """
+        :param directory: folder where entries are written, created when missing
+        :param ttls: dict of request template to seconds (FOREVER for no expiry), DEFAULT_TTLS by default
+        :param default_ttl: seconds for templates missing from ttls, 0 disables caching them
+        :param maxsize: maximum total bytes of the directory before old entries are evicted
+        """
+
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._size = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, url):
+        digest = hashlib.sha1(url.encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def ttl(self, method):
+        """ :return: seconds responses of the request template method stay fresh (None for ever, 0 when not cached) """
+        return self.ttls.get(method, self.default_ttl)
+
+    def get(self, url, method):
+        """ reads the cached response of url
+        :param url: url of the call
+        :param method: request template of the call (see loliglio.method_of)
+        :return: Entry (check entry.fresh) or None when nothing usable is cached
+        """
+
+        ttl = self.ttl(method)
+        if ttl == 0:
+            return None
+        path = self._path(url)
+        try:
+            with open(path, 'rb') as file:
+                meta = json.loads(file.readline())
+                body = file.read()
+        except (OSError, ValueError):
+            return None
+        fresh = ttl is FOREVER or time.time() - meta['stored'] < ttl
+        if not fresh and not (meta.get('etag') or meta.get('last_modified')):
+            return None
+        try:
+            # The modification time tracks the last use for the LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return Entry(path, meta['stored'], meta.get('etag'), meta.get('last_modified'), body, fresh)
+
+    def put(self, url, method, body, headers):
+        """ stores a response atomically, ignored when the template isn't cached
+        :param body: raw response bytes
+        :param headers: response headers, ETag and Last-Modified are kept for revalidation
+        """
+
+        if self.ttl(method) == 0:
+            return
+        meta = {'url': url, 'stored': time.time(),
+                'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+        handle, temp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                file.write(json.dumps(meta).encode() + b'\n')
+                file.write(body)
+            os.replace(temp, path)
+        except BaseException:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            raise
+        self._grow(os.path.getsize(path) - previous)
+
+    def revalidated(self, url, method, entry, headers):
+        """ marks entry as fresh again after a 304 Not Modified response
+        :return: cached body bytes
+        """
+
+        self.put(url, method, entry.body, {'ETag': headers.get('ETag') or entry.etag,
+                                           'Last-Modified': headers.get('Last-Modified') or entry.last_modified})
+        return entry.body
+
+    def _files(self):
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if not name.startswith('.tmp'):
+                    yield os.path.join(root, name)
+
+    def _grow(self, delta):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(os.path.getsize(path) for path in self._files())
+            else:
+                self._size += delta
+            if self._size <= self.maxsize:
+                return
+            entries = list()
+            for path in self._files():
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            self._size = sum(size for _, size, _ in entries)
+            # Evicts down to 90% of the cap so eviction doesn't run again on the very next write
+            for _, size, path in entries:
+                if self._size <= self.maxsize * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                    self._size -= size
+                except OSError:
+                    pass
+
+    def clear(self):
+        """ deletes every cached entry """
+        with self._lock:
+            for path in list(self._files()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
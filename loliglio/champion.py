@@ -0,0 +1,183 @@
+""" Champion-v3 rotations and DataDragon champion data, indexed once per version by loliglio.champion_registry """
+import collections
+import threading
+
+import loliglio
+from loliglio import regions, routes
+from loliglio.client import api_call
+
+
+class ChampionIndex:
+    """ Lookup tables built once from a DataDragon champion.json
+    """
+
+    def __init__(self, champ_info):
+        """
+        :param champ_info: JSON object of champion.json (see Champion.champions)
+        """
+
+        self.champ_info = champ_info
+        champions = list(champ_info['data'].values())
+        self.names = [champion['name'] for champion in champions]
+        self.ids = [champion['id'] for champion in champions]
+        self.keys = [champion['key'] for champion in champions]
+        self.by_name = dict(zip(self.names, champions))
+        self.by_id = dict(zip(self.ids, champions))
+        self.by_key = dict(zip(self.keys, champions))
+
+class ChampionRegistry:
+    """ Thread-safe, per-version cache of DataDragon champion.json
+    Each version is downloaded once and indexed by name, id and key. Only the maxversions most recently
+    used versions are retained, older ones are dropped and downloaded again if needed.
+    """
+
+    def __init__(self, maxversions=4):
+        """
+        :param maxversions: number of versions kept in memory
+        """
+
+        self.maxversions = maxversions
+        self._lock = threading.Lock()
+        self._versions = collections.OrderedDict()
+
+    def peek(self, version):
+        """ :return: ChampionIndex of version if it is already loaded, None otherwise """
+        with self._lock:
+            index = self._versions.get(version)
+            if index is not None:
+                self._versions.move_to_end(version)
+            return index
+
+    def load(self, version, champ_info):
+        """ indexes an already downloaded champion.json
+        :param version: String containing the version of LOL champ_info belongs to (e.g. '12.4.1')
+        :param champ_info: JSON object of champion.json
+        :return: ChampionIndex of version
+        """
+
+        index = ChampionIndex(champ_info)
+        with self._lock:
+            self._versions[version] = index
+            self._versions.move_to_end(version)
+            while len(self._versions) > self.maxversions:
+                self._versions.popitem(last=False)
+        return index
+
+    def get(self, version):
+        """ returns the ChampionIndex of version, downloading champion.json only when it isn't loaded
+        :param version: String containing the current version of LOL (e.g. '12.4.1' to this date)
+        :return: ChampionIndex of version
+        """
+
+        index = self.peek(version)
+        if index is None:
+            index = self.load(version, api_call(Champion.champions(version, get_url=True), rate_limiting=False))
+        return index
+
+    def invalidate(self, version=None):
+        """ forgets a loaded version, or every version when version is None """
+        with self._lock:
+            if version is None:
+                self._versions.clear()
+            else:
+                self._versions.pop(version, None)
+
+class Champion:
+    """ Access to current champion rotations by region from Riot API and champion information from DataDragon
+    official information at: https://developer.riotgames.com/apis#champion-v3
+    DataDragon champ info to-date (02-22): 'http://ddragon.leagueoflegends.com/cdn/'12.4.1'/data/de_DE/champion.json'
+    DataDragon information is downloaded once per version and served from loliglio.champion_registry afterwards
+    """
+
+    @staticmethod
+    def champion_rotations(regionId, get_url=False):
+        """ Returns champion rotations, including free-to-play and low-level free-to-play rotations
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+
+        url = routes.CHAMPION_ROTATIONS.url(regions[regionId])
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def champions(version, get_url=False):
+        """ Returns all available champion data from DataDragon at the specified version
+        :param version: String containing the current version of LOL (e.g. '12.4.1' to this date)
+        :param get_url: When true, don't make a DataDragon API call and returns the url connection
+        :return: JSON object retrieved from DataDragon API call (or link when get_url is True). It is shared by every caller, don't modify it
+        """
+        url = routes.CHAMPIONS.url(None, version, 'de_DE')
+        if get_url: return url
+        return loliglio.champion_registry.get(version).champ_info
+
+    @staticmethod
+    def names(version, get_url=False):
+        """ Returns a list of strings containing each champion's name (Wukong name is 'Wukong')
+        :param version: String containing the current version of LOL (e.g. '12.4.1' to this date)
+        :param get_url: When true, don't make a DataDragon API call and returns the url connection
+        :return: JSON object retrieved from DataDragon API call (or link when get_url is True)
+        """
+        url = routes.CHAMPIONS.url(None, version, 'de_DE')
+        if get_url: return url
+        return list(loliglio.champion_registry.get(version).names)
+
+    @staticmethod
+    def ids(version, get_url=False):
+        """ Returns a list of strings containing each champion's id (Wukong name is 'moneyking')
+        :param version: String containing the current version of LOL (e.g. '12.4.1' to this date)
+        :param get_url: When true, don't make a DataDragon API call and returns the url connection
+        :return: JSON object retrieved from DataDragon API call (or link when get_url is True)
+        """
+        url = routes.CHAMPIONS.url(None, version, 'de_DE')
+        if get_url: return url
+        return list(loliglio.champion_registry.get(version).ids)
+
+    @staticmethod
+    def keys(version, get_url=False):
+        """ Returns a list of ints containing each champion's key
+        :param version: String containing the current version of LOL (e.g. '12.4.1' to this date)
+        :param get_url: When true, don't make a DataDragon API call and returns the url connection
+        :return: JSON object retrieved from DataDragon API call (or link when get_url is True)
+        """
+        url = routes.CHAMPIONS.url(None, version, 'de_DE')
+        if get_url: return url
+        return list(loliglio.champion_registry.get(version).keys)
+
+    @staticmethod
+    def by_name(version, championName, get_url=False):
+        """ Returns information of the champion specified. P.D. Wukong name is 'Wukong'
+        :param version: String containing the current version of LOL (e.g. '12.4.1' to this date)
+        :param championName: text string containing a champion name. P.D. Wukong champion's name is 'Wukong'
+        :param get_url: When true, don't make a DataDragon API call and returns the url connection
+        :return: JSON object retrieved from DataDragon API call (or link when get_url is True)
+        """
+        url = routes.CHAMPIONS.url(None, version, 'de_DE')
+        if get_url: return url
+        return loliglio.champion_registry.get(version).by_name.get(championName, 404)
+
+    @staticmethod
+    def by_id(version, championId, get_url=False):
+        """ Returns information of the champion specified. P.D. Wukong id is 'moneyking'
+        :param version: String containing the current version of LOL (e.g. '12.4.1' to this date)
+        :param championId: text string containing a champion ID. P.D. Wukong champion's ID is 'moneyking'
+        :param get_url: When true, don't make a DataDragon API call and returns the url connection
+        :return: JSON object retrieved from DataDragon API call (or link when get_url is True)
+        """
+        url = routes.CHAMPIONS.url(None, version, 'de_DE')
+        if get_url: return url
+        return loliglio.champion_registry.get(version).by_id.get(championId, 404)
+
+    @staticmethod
+    def by_key(version, championKey, get_url=False):
+        """ Returns information of the champion specified
+        :param version: String containing the current version of LOL (e.g. '12.4.1' to this date)
+        :param championKey: numerical value containing a champion key.
+        :param get_url: When true, don't make a DataDragon API call and returns the url connection
+        :return: JSON object retrieved from DataDragon API call (or link when get_url is True)
+        """
+        championKey = str(championKey)
+        url = routes.CHAMPIONS.url(None, version, 'de_DE')
+        if get_url: return url
+        return loliglio.champion_registry.get(version).by_key.get(championKey, 404)
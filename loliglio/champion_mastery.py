@@ -0,0 +1,63 @@
+""" Champion-mastery-v4 endpoints: mastery points and levels of a summoner per champion """
+from loliglio import regions, routes
+from loliglio.client import api_call
+
+
+class ChampionMastery:
+    """ Allows accessing the score and ChampionMasteryDto of every / a-single champion
+    official information at: https://developer.riotgames.com/apis#champion-mastery-v4
+
+    ChampionMasteryDto - This object contains single Champion Mastery information for player and champion combination.
+    NAME                            | DATA TYPE    | DESCRIPTION
+    --------------------------------|-----------|----------------------------------------------------------------------
+    championPointsUntilNextLevel    | long      | Number of points needed to achieve next level. Zero if player reached maximum champion level for this champion.
+    chestGranted                    | boolean   |    Is chest granted for this champion or not in current season.
+    championId                        | long      | Champion ID for this entry.
+    lastPlayTime                    | long      | Last time this champion was played by this player - in Unix milliseconds time format.
+    championLevel                   | int       | Champion level for specified player and champion combination.
+    summonerId                        | string    | Summoner ID for this entry. (Encrypted)
+    championPoints                  | int       | Total number of champion points for this player and champion combination - they are used to determine championLevel.
+    championPointsSinceLastLevel    | long      | Number of points earned since current level has been achieved.
+    tokensEarned                    | int       | The token earned for this champion at the current championLevel. When the championLevel is advanced the tokensEarned resets to 0.
+    """
+
+    @staticmethod
+    def by_summoner(regionId, encryptedSummonerId, get_url=False):
+        """ Get all champion mastery entries sorted by number of champion points descending,
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param encryptedSummonerId: Summoner IDs are only unique per region. Different APIs use different IDs
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+
+        url = routes.MASTERIES_BY_SUMMONER.url(regions[regionId], encryptedSummonerId)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def by_summoner_champion(regionId, encryptedSummonerId, championId, get_url=False):
+        """ Get a champion mastery by player ID and champion ID.
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param encryptedSummonerId: Summoner IDs are only unique per region. Different APIs use different IDs
+        :param championId: Integer that represents the champion you want to retrieve (e.g. 1 -> Annie)
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+
+        championId = str(championId)
+        url = routes.MASTERY_BY_SUMMONER_CHAMPION.url(regions[regionId], encryptedSummonerId, championId)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def score_by_summoner(regionId, encryptedSummonerId, get_url=False):
+        """ Get a player's total champion mastery score, which is the sum of individual champion mastery levels.
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param encryptedSummonerId: Summoner IDs are only unique per region. Different APIs use different IDs
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+
+        url = routes.MASTERY_SCORE_BY_SUMMONER.url(regions[regionId], encryptedSummonerId)
+        if get_url: return url
+        return api_call(url)
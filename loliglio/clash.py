@@ -0,0 +1,107 @@
+""" Clash-v1 endpoints: players, teams and tournaments """
+from loliglio import regions, routes
+from loliglio.client import api_call
+
+
+class Clash:
+    """ Allow access to all clash information: PlayerDto, TeamDto, TournamentDto & TournamentPhaseDto
+    official information at: https://developer.riotgames.com/apis#clash-v1
+
+    PlayerDto - Contains a player clash related information:
+    NAME        | DATA TYPE | DESCRIPTION
+    ------------|-----------|-----------
+    summonerId  | string    |
+    teamId      | string    |
+    position    | string    | (Legal values: UNSELECTED, FILL, TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY)
+    role        | string    | (Legal values: CAPTAIN, MEMBER)
+
+    TeamDto - Contains a team clash related information:
+    NAME            | DATA TYPE       | DESCRIPTION
+    ----------------|-----------------|-----------------
+    id              | string          |
+    tournamentId    | int             |
+    name            | string          |
+    iconId          | int             |
+    tier            | int             |
+    captain         | string          | Summoner ID of the team captain.
+    abbreviation    | string          |
+    players         | List[PlayerDto] | Team members.
+
+    TournamentDto - Contains clash tournament information:
+    NAME                | DATA TYPE                   | DESCRIPTION
+    --------------------|-----------------------------|-------------------
+    id                  | int                         |
+    themeId             | int                         |
+    nameKey             | string                      |
+    nameKeySecondary    | string                      |
+    schedule            | List[TournamentPhaseDto]    | Tournament phase.
+
+    TournamentPhaseDto - Contains a clash tournament phase information:
+    NAME                | DATA TYPE
+    --------------------|--------------------
+    id                  | int
+    registrationTime    | long
+    startTime           | long
+    cancelled           | boolean
+    """
+
+    @staticmethod
+    def players_by_summoner(regionId, summonerId, get_url=False):
+        """ Get players (List[PlayerDto]) by summoner ID.
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param summonerId: Summoner IDs are only unique per region. Different APIs use different IDs
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.CLASH_PLAYERS_BY_SUMMONER.url(regions[regionId], summonerId)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def teams(regionId, teamId, get_url=False):
+        """ Get team (TeamDto) by ID.
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param teamId: unique value that identifies a team inside a Clash Tournament
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        teamId = str(teamId)
+        url = routes.CLASH_TEAMS.url(regions[regionId], teamId)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def tournaments(regionId, get_url=False):
+        """ Get all active or upcoming tournaments (List[TournamentDto]).
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.CLASH_TOURNAMENTS.url(regions[regionId])
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def tournament_by_team(regionId, teamId, get_url=False):
+        """ Get tournament by team ID. (TournamentDto & TournamentPhaseDto)
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param teamId: unique value that identifies a team inside a Clash Tournament
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.CLASH_TOURNAMENT_BY_TEAM.url(regions[regionId], teamId)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def tournament_by_tournament_id(regionId, tournamentId, get_url=False):
+        """ Get tournament by ID. (TournamentDto & TournamentPhaseDto)
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param tournamentId: numerical value that identifies a tournament inside a region
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        tournamentId = str(tournamentId)
+        url = routes.CLASH_TOURNAMENT.url(regions[regionId], tournamentId)
+        if get_url: return url
+        return api_call(url)
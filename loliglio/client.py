@@ -0,0 +1,378 @@
+""" Calls to the Riot API and DataDragon shared by every endpoint class
+Urls go through loliglio.coalescer, loliglio.response_cache, loliglio.circuit_breaker, loliglio.scheduler,
+loliglio.limiter and loliglio.connection_pool, read from the loliglio package on every call so replacing
+any of them there applies right away. The functions are also available as loliglio.api_call, loliglio.fetch_many, ...
+"""
+import collections
+import itertools
+import json
+import threading
+import time
+
+import loliglio
+from loliglio import errors, jsonstream, regions, routes, scheduling
+
+
+def to_url_base(region, request):
+    """ returns a base url with data to be replaced with attributes
+    Endpoint classes build their urls from the precompiled loliglio.routes table instead, this is kept for
+    urls built by hand. The api key is sent as the X-Riot-Token header, urls no longer carry it
+    syntax be like: https://<region|cluster>.api.riotgames.com<request>/<attributes>
+    :param region: LOL server or cluster that goes before the api.riotgames.com web-page
+    :param request: riot API call template that goes after api.riotgames.com. web-page
+    :return: url with location and request added. Request information still needs to be filled
+    """
+
+    return register_method(request).base(region) + request
+
+def register_method(request):
+    """ makes method_of recognise urls built from a request template
+    :param request: request template with {attributes} placeholders (e.g. '/lol/match/v5/matches/{matchId}')
+    :return: routes.Route of the template
+    """
+
+    return routes.table.add(request)
+
+def method_of(url):
+    """ finds the request template a filled url was built from
+    :param url: url returned by any get_url=True call (e.g. 'https://la2.api.riotgames.com/lol/summoner/v4/summoners/by-name/abc')
+    :return: tuple of the url host and its request template (e.g. '/lol/summoner/v4/summoners/by-name/{summonerName}'), the raw path when unknown
+    """
+
+    # Slicing is enough for the absolute urls built by loliglio and much cheaper than urlsplit
+    begin = url.find('//') + 2
+    slash = url.find('/', begin)
+    if slash < 0:
+        return url[begin:].split('?', 1)[0], '/'
+    end = url.find('?', slash)
+    path = url[slash:] if end < 0 else url[slash:end]
+    route = routes.table.match(path)
+    return url[begin:slash], path if route is None else route.template
+
+def request_headers(host, entry=None):
+    """ headers sent with a call: the api key to Riot hosts and the cache validators of entry, if any
+    :param host: host of the call (see method_of)
+    :param entry: optional cache.Entry being revalidated
+    :return: dict of headers
+    """
+
+    headers = entry.validators() if entry is not None else dict()
+    if loliglio.RIOT_API_KEY and host.endswith('.api.riotgames.com'):
+        headers['X-Riot-Token'] = loliglio.RIOT_API_KEY
+    return headers
+
+def keyed_headers(host, headers, key):
+    """ :return: headers sending the api key of a loliglio.api_keys key ID instead of RIOT_API_KEY, headers itself when key is None """
+    if key is None or not host.endswith('.api.riotgames.com'):
+        return headers
+    headers = dict(headers or ())
+    headers['X-Riot-Token'] = loliglio.api_keys.key(key)
+    return headers
+
+def attribute_formatter(attribute):
+    """ translate non-alphabetic chars and 'spaces' to a URL applicable format
+    :param attribute: text string that may contain not url compatible chars (e.g. ' 무작위의')
+    :return: text string with riot API compatible url encoding (e.g. %20%EB%AC%B4%EC%9E%91%EC%9C%84%EC%9D%98)
+    """
+
+    return routes.quote(attribute)
+
+# Cluster ID serving the matches of each region, read from the region prefix of a match ID
+_match_clusters = {
+    regions[0]: 0, regions[5]: 0, regions[6]: 0, regions[7]: 0, regions[8]: 0,     # BR1, LA1, LA2, NA1, OC1: AMERICAS
+    regions[3]: 1, regions[4]: 1,                                                   # JP1, KR: ASIA
+    regions[1]: 2, regions[2]: 2, regions[9]: 2, regions[10]: 2,                    # EUN1, EUW1, RU, TR1: EUROPE
+}
+
+def match_cluster(matchId):
+    """ returns the cluster ID serving a match, read from the region prefix of its ID
+    The AMERICAS routing value serves NA, BR, LAN, LAS, and OCE. The ASIA routing value serves KR and JP. The EUROPE routing value serves EUNE, EUW, TR, and RU.
+    :param matchId: LOL match ID. Syntax contains <Region>_<NumericalSequence> (e.g. 'LA2_1138947703')
+    :return: riot cluster ID, index of clusters
+    :raises ValueError: when the region prefix of matchId isn't a known region
+    """
+
+    clusterId = _match_clusters.get(matchId.partition('_')[0])
+    if clusterId is None:
+        raise ValueError('unknown region in match ID ' + repr(matchId))
+    return clusterId
+
+def fetch_many(fetch, matchIds, workers=8, per_cluster=None, ordered=False, cluster=match_cluster):
+    """ calls fetch for every match ID over a thread pool, capping the calls in flight per cluster
+    Failures don't stop the batch, the raised exception is yielded in place of the result
+    :param fetch: function receiving a match ID (e.g. Match.matches)
+    :param matchIds: iterable of LOL match IDs, consumed lazily
+    :param workers: number of threads making calls at the same time
+    :param per_cluster: maximum calls in flight per cluster, workers by default
+    :param ordered: when true results are yielded in input order, otherwise as soon as they complete
+    :param cluster: function giving the cluster ID of an item, match_cluster by default (other items than match IDs can be fetched)
+    :return: generator of (matchId, JSON object or exception) tuples. Calls are BACKGROUND priority unless the caller set one (see loliglio.scheduling)
+    """
+
+    import concurrent.futures
+
+    per_cluster = per_cluster or workers
+    lock = threading.Lock()
+    slots = dict()
+    level = scheduling.current(scheduling.BACKGROUND)
+
+    def work(matchId):
+        clusterId = cluster(matchId)
+        with lock:
+            slot = slots.get(clusterId)
+            if slot is None:
+                slot = slots[clusterId] = threading.BoundedSemaphore(per_cluster)
+        with slot, scheduling.priority(level):
+            return fetch(matchId)
+
+    ids = iter(matchIds)
+    executor = concurrent.futures.ThreadPoolExecutor(workers)
+    pending = collections.OrderedDict()
+    try:
+        # Keeps a bounded window of submitted IDs so huge iterables are never fully materialised
+        for matchId in itertools.islice(ids, workers * 2):
+            pending[executor.submit(work, matchId)] = matchId
+        while pending:
+            if ordered:
+                done = [next(iter(pending))]
+                concurrent.futures.wait(done)
+            else:
+                done = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)[0]
+            for future in done:
+                matchId = pending.pop(future)
+                error = future.exception()
+                yield matchId, future.result() if error is None else error
+                for nextId in itertools.islice(ids, 1):
+                    pending[executor.submit(work, nextId)] = nextId
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def acquire(host, method, rate_limiting=True):
+    """ waits until loliglio.scheduler and loliglio.limiter grant a call to method on host, on any key of loliglio.api_keys
+    :param rate_limiting: when false the call is granted right away
+    :return: tuple of the seconds slept and the ID of the api key to send the call with (None for RIOT_API_KEY)
+    """
+
+    keys = loliglio.api_keys.order() if loliglio.api_keys is not None else (None,)
+    if not rate_limiting:
+        return 0, keys[0]
+    if loliglio.scheduler is not None:
+        ticket = loliglio.scheduler.acquire(loliglio.limiter, host, method, keys=keys)
+        return ticket.waited, ticket.key
+    slept = 0
+    delay, key = loliglio.limiter.grant(host, method, keys=keys)
+    while delay > 0:
+        time.sleep(delay)
+        slept += delay
+        delay, key = loliglio.limiter.grant(host, method, keys=keys)
+    return slept, key
+
+def retry_delay(error, host, method, rate_limiting, attempt, key=None):
+    """ records a failed attempt in the rate limiter and circuit breaker, then decides whether to retry it
+    Server and transport errors count as failures of the host, any other error response as a success
+    :param error: errors.ApiError raised by the attempt
+    :param host: host of the call (see method_of)
+    :param method: request template of the call (see method_of)
+    :param rate_limiting: whether the call goes through the rate limiter
+    :param attempt: number of the failed attempt, 0 for the first one
+    :param key: ID of the api key the attempt was sent with (see acquire), only its budget is blocked by a 429
+    :return: seconds to wait before retrying. error itself is raised when it can't be retried
+    """
+
+    if loliglio.circuit_breaker is not None:
+        # Any response below 500 (a 404, a 429, ...) shows the host is up: it closes a half-open circuit
+        if isinstance(error, (errors.ServerError, errors.TransportError)):
+            loliglio.circuit_breaker.failure(host)
+        else:
+            loliglio.circuit_breaker.success(host)
+    if isinstance(error, errors.RateLimited):
+        retry_after = loliglio.limiter.backoff(host, method, error.headers, key=key)
+        print('429 error happened during API call,', host, method, 'blocked for', retry_after, 'secs')
+        if rate_limiting:
+            loliglio.limiter.update(host, method, error.headers, key)
+    if loliglio.retry_policy is None or not loliglio.retry_policy.should_retry(attempt, error):
+        raise error
+    # The rate limiter already holds the next attempt back until Retry-After is over
+    if isinstance(error, errors.RateLimited) and rate_limiting:
+        return 0
+    return loliglio.retry_policy.delay(attempt, error)
+
+def api_call(url, rate_limiting = True):
+    """ ignores SSL errors, calls the API through the keep-alive connection pool and returns a JSON
+    Threads calling the same url at the same time share one request and the same JSON object (see loliglio.coalescer)
+    :param url: riot API call url to connect to and retrieve its returning JSON
+    :param rate_limiting:  establishes if the call should be counted for the rate-limiter, True by default
+    :return: JSON object retrieved from riot API call. Failures raise errors.ApiError subclasses (e.g. errors.NotFound)
+    """
+
+    if loliglio.coalescer is None:
+        return direct_call(url, rate_limiting)
+    return loliglio.coalescer.do((url, rate_limiting), direct_call, url, rate_limiting)
+
+def direct_call(url, rate_limiting = True):
+    """ api_call without the request coalescing
+    :param url: riot API call url to connect to and retrieve its returning JSON
+    :param rate_limiting:  establishes if the call should be counted for the rate-limiter, True by default
+    :return: JSON object retrieved from riot API call
+    """
+
+    host, method = method_of(url)
+    call = loliglio.instrumentation.start(url, host, method) if loliglio.instrumentation is not None else None
+    try:
+        data_json = _direct_call(url, rate_limiting, host, method, call)
+    except BaseException as e:
+        if call is not None:
+            loliglio.instrumentation.finish(call, e)
+        raise
+    if call is not None:
+        loliglio.instrumentation.finish(call)
+    return data_json
+
+def _direct_call(url, rate_limiting, host, method, call):
+    # call is the metrics.Call filled along the way, None when instrumentation is disabled
+    # Fresh responses from the optional on-disk cache skip the network (and the rate limiter) entirely
+    entry = None
+    if loliglio.response_cache is not None:
+        entry = loliglio.response_cache.get(url, method)
+        if entry is not None and entry.fresh:
+            if call is not None:
+                call.cached = 'fresh'
+            return decode(entry.body, call)
+
+    uh = request(url, rate_limiting, host, method, call, request_headers(host, entry))
+    if entry is not None and uh.status == 304:
+        data = loliglio.response_cache.revalidated(url, method, entry, uh.headers)
+        if call is not None:
+            call.cached = 'revalidated'
+    else:
+        data = uh.read()
+        if call is not None:
+            call.received = len(data)
+            call.transferred = uh.transferred
+        if loliglio.response_cache is not None:
+            loliglio.response_cache.put(url, method, data, uh.headers)
+    return decode(data, call)
+
+def request(url, rate_limiting, host, method, call=None, headers=None, stream=False):
+    """ sends a call through the circuit breaker, rate limiter and connection pool, retrying failed attempts
+    :param url: riot API call url
+    :param rate_limiting: whether the call goes through the rate limiter
+    :param host: host of the call (see method_of)
+    :param method: request template of the call (see method_of)
+    :param call: optional metrics.Call filled with the attempts made
+    :param headers: request headers (see request_headers)
+    :param stream: when true a transport.StreamedResponse is returned, its body still has to be read
+    :return: transport.Response of the successful attempt
+    """
+
+    # Imported on the first call: they load ssl and email, which building urls (get_url) doesn't need
+    import http.client
+    import urllib.error
+
+    # Connections are reused per host. SSL certificate errors are ignored by the pool's shared context.
+    # Failures raise errors.ApiError subclasses: rate limit, server and transport errors are retried
+    # following loliglio.retry_policy, and a host failing repeatedly fails fast (loliglio.circuit_breaker)
+    attempt = 0
+    while True:
+        if loliglio.circuit_breaker is not None:
+            loliglio.circuit_breaker.check(host, url)
+        # Waits only as long as the exhausted application (per host) or method (per endpoint) window needs.
+        # Limits start at the development key ones and are updated from each response's headers
+        slept, key = acquire(host, method, rate_limiting)
+        if call is not None:
+            call.slept += slept
+        if slept >= 1:
+            print('Rate limit reached on', host, method, 'slept', round(slept, 2), 'secs')
+        sent = time.perf_counter()
+        try:
+            attempt_headers = keyed_headers(host, headers, key)
+            uh = loliglio.connection_pool.request(url, attempt_headers, stream=stream) if stream else loliglio.connection_pool.request(url, attempt_headers)
+            break
+        except urllib.error.HTTPError as e:
+            error = errors.from_http_error(e)
+        except (OSError, http.client.HTTPException) as e:
+            error = errors.TransportError(url, str(e) or repr(e))
+        finally:
+            if call is not None:
+                call.network += time.perf_counter() - sent
+        if call is not None:
+            call.status = error.status
+        time.sleep(retry_delay(error, host, method, rate_limiting, attempt, key))
+        attempt += 1
+        if call is not None:
+            call.retries = attempt
+    if loliglio.circuit_breaker is not None:
+        loliglio.circuit_breaker.success(host)
+    if rate_limiting:
+        loliglio.limiter.update(host, method, uh.headers, key)
+    if call is not None:
+        call.status = uh.status
+    return uh
+
+def decode(data, call=None):
+    """ parses a response body straight from its bytes, timing it into call when given
+    :param data: bytes of a JSON response body
+    :param call: optional metrics.Call of the API call the body belongs to
+    :return: JSON object
+    """
+
+    if call is None:
+        return json.loads(data)
+    started = time.perf_counter()
+    data_json = json.loads(data)
+    call.decode = time.perf_counter() - started
+    return data_json
+
+def stream_call(url, path, rate_limiting=True):
+    """ calls the API and decodes its JSON incrementally, yielding the values found at path one at a time
+    Only the value being yielded and a read buffer are held in memory, not the whole body. Streamed calls
+    are not coalesced, and they are answered by the response cache when it holds them but don't fill it
+    :param url: riot API call url to connect to
+    :param path: tuple of object keys and '*' (see jsonstream.items), e.g. ('info', 'frames', '*')
+    :param rate_limiting: establishes if the call should be counted for the rate-limiter, True by default
+    :return: generator of JSON objects. Failures raise errors.ApiError subclasses, before the first value or while reading
+    """
+
+    import http.client
+    import io
+
+    host, method = method_of(url)
+    call = loliglio.instrumentation.start(url, host, method) if loliglio.instrumentation is not None else None
+    try:
+        entry = loliglio.response_cache.get(url, method) if loliglio.response_cache is not None else None
+        if entry is not None and entry.fresh:
+            if call is not None:
+                call.cached = 'fresh'
+            body = io.BytesIO(entry.body)
+        else:
+            body = request(url, rate_limiting, host, method, call, request_headers(host), stream=True)
+        with body:
+            started = time.perf_counter()
+            reader = jsonstream.Reader(body)
+            values = jsonstream.items(reader, path)
+            while True:
+                try:
+                    value = next(values)
+                except StopIteration:
+                    break
+                except (OSError, http.client.HTTPException) as e:
+                    raise errors.TransportError(url, str(e) or repr(e))
+                finally:
+                    # Time spent reading and decoding, the consumer's own time between values isn't counted
+                    if call is not None:
+                        call.decode += time.perf_counter() - started
+                yield value
+                started = time.perf_counter()
+            if call is not None and call.cached is None:
+                call.received = reader.received
+                call.transferred = body.transferred
+    except GeneratorExit:
+        if call is not None:
+            loliglio.instrumentation.finish(call)
+        raise
+    except BaseException as e:
+        if call is not None:
+            loliglio.instrumentation.finish(call, e)
+        raise
+    if call is not None:
+        loliglio.instrumentation.finish(call)
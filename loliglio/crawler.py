@@ -0,0 +1,479 @@
+""" Breadth-first crawl of the match graph: players -> their matches -> the participants of those -> ...
+Starting from seed players or matches, every new player has its recent match IDs listed, every new match
+passing the region filter is fetched (concurrently, under the shared rate limiter), and the matches passing
+the queue and patch filters are yielded and have their participants queued in turn.
+
+Players and matches already seen are kept in a compact set: SortedIdSet (exact, 8 bytes per ID) or
+BloomFilter (approximate, ~2 bytes per ID at a 0.1% false positive rate), so tens of millions of IDs fit in
+memory. With a folder, the frontier lives on disk and the crawl resumes where it was stopped.
+
+    from loliglio import crawler
+    crawl = crawler.Crawler('crawl', players=[(0, puuid)], queues=[420], patches=[1304], regions=[6, 7])
+    for matchId, match in crawl.run(max_matches=100000):
+        if not isinstance(match, Exception):
+            store(match)
+"""
+import array
+import bisect
+import collections
+import hashlib
+import heapq
+import json
+import math
+import os
+import shutil
+import struct
+import tempfile
+import time
+
+import loliglio
+from loliglio import errors, export
+
+
+MATCHES_PER_PLAYER = 20
+# Times a player listing or a match fetch is tried before it's given up, when it fails with one of RETRY_ON.
+# Calls rejected by an open circuit (errors.CircuitOpen) made no request: they wait for its cooldown and aren't counted
+ATTEMPTS = 3
+RETRY_ON = (errors.RateLimited, errors.ServerError, errors.TransportError)
+# Bytes already read from a queue file before a save moves what is left of it to a new file
+COMPACT_SIZE = 16 * 1024 * 1024
+# IDs added to a SortedIdSet between two merges into its sorted array, at least
+MERGE_SIZE = 64 * 1024
+SAVE_EVERY = 1000
+
+def _hash64(item):
+    return int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), 'little', signed=True)
+
+class SortedIdSet:
+    """ Exact set of string IDs stored as a sorted array of their 64-bit hashes, plus a set of the recent ones
+    A collision between two IDs (about one in 10^11 pairs for ten million IDs) makes the second one look seen.
+    """
+
+    kind = 'sorted'
+
+    def __init__(self):
+        self._sorted = array.array('q')
+        self._recent = set()
+
+    def _merge(self):
+        if self._recent:
+            self._sorted = array.array('q', heapq.merge(self._sorted, sorted(self._recent)))
+            self._recent = set()
+
+    def __contains__(self, item):
+        value = _hash64(item)
+        if value in self._recent:
+            return True
+        position = bisect.bisect_left(self._sorted, value)
+        return position < len(self._sorted) and self._sorted[position] == value
+
+    def add(self, item):
+        """ :return: true when item wasn't in the set yet """
+        if item in self:
+            return False
+        self._recent.add(_hash64(item))
+        # Merging when the recent IDs reach a fraction of the array keeps the merge cost amortized
+        if len(self._recent) >= max(MERGE_SIZE, len(self._sorted) // 8):
+            self._merge()
+        return True
+
+    def __len__(self):
+        return len(self._sorted) + len(self._recent)
+
+    def save(self, path):
+        self._merge()
+        with open(path, 'wb') as file:
+            self._sorted.tofile(file)
+
+    @classmethod
+    def load(cls, path):
+        seen = cls()
+        with open(path, 'rb') as file:
+            seen._sorted.frombytes(file.read())
+        return seen
+
+class BloomFilter:
+    """ Approximate set of string IDs: an ID never added is reported as seen with probability error_rate
+    """
+
+    kind = 'bloom'
+    _header = struct.Struct('<QQQ')
+
+    def __init__(self, capacity=10 ** 7, error_rate=0.001):
+        """
+        :param capacity: number of IDs the error rate holds for, more can be added at a higher error rate
+        :param error_rate: false positive probability once capacity IDs were added
+        """
+
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + number * second) % self.size for number in range(self.hashes)]
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def add(self, item):
+        """ :return: true when item wasn't in the set yet (false for the rare new ID colliding with others) """
+        new = False
+        bits = self.bits
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        self.count += new
+        return new
+
+    def __len__(self):
+        return self.count
+
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(self._header.pack(self.size, self.hashes, self.count))
+            file.write(self.bits)
+
+    @classmethod
+    def load(cls, path):
+        seen = cls.__new__(cls)
+        with open(path, 'rb') as file:
+            seen.size, seen.hashes, seen.count = cls._header.unpack(file.read(cls._header.size))
+            seen.bits = bytearray(file.read())
+        return seen
+
+SEEN_SETS = {SortedIdSet.kind: SortedIdSet, BloomFilter.kind: BloomFilter}
+
+class DiskQueue:
+    """ FIFO of text lines appended to a file and read back in order, or kept in memory when path is None
+    """
+
+    def __init__(self, path=None, state=None):
+        """
+        :param path: file holding the queue, created when missing
+        :param state: (read offset, size, length) saved by a previous state() call. The file is cut back to
+        size, dropping what was appended after it was saved
+        """
+
+        self.path = path
+        self.length = 0
+        if path is None:
+            self._memory = collections.deque()
+            return
+        self._memory = None
+        offset, size, self.length = state or (0, 0, 0)
+        with open(path, 'ab') as file:
+            file.truncate(size)
+        self._writer = open(path, 'ab')
+        self._reader = open(path, 'rb')
+        self._reader.seek(offset)
+        self._offset = offset
+        self._dirty = False
+
+    def push(self, line):
+        self.length += 1
+        if self._memory is not None:
+            self._memory.append(line)
+            return
+        self._writer.write(line.encode() + b'\n')
+        self._dirty = True
+
+    def pop(self):
+        """ :return: the oldest line, None when the queue is empty """
+        if not self.length:
+            return None
+        self.length -= 1
+        if self._memory is not None:
+            return self._memory.popleft()
+        if self._dirty:
+            self._writer.flush()
+            self._dirty = False
+        line = self._reader.readline()
+        self._offset += len(line)
+        return line[:-1].decode()
+
+    def __len__(self):
+        return self.length
+
+    def compact(self, path, minimum=None):
+        """ moves the lines not read yet to a new file, which the queue reads and appends to from then on
+        The current file is left as it is, a state() saved before still reopens it
+        :param path: file the lines are moved to
+        :param minimum: bytes that have to be read already (and be at least half the file) for the move to happen, COMPACT_SIZE by default
+        :return: true when the lines were moved
+        """
+
+        if self._memory is not None:
+            return False
+        minimum = COMPACT_SIZE if minimum is None else minimum
+        self._writer.flush()
+        self._dirty = False
+        if self._offset < minimum or self._offset * 2 < self._writer.tell():
+            return False
+        with open(self.path, 'rb') as source, open(path, 'wb') as target:
+            source.seek(self._offset)
+            shutil.copyfileobj(source, target)
+        self._writer.close()
+        self._reader.close()
+        self.path = path
+        self._writer = open(path, 'ab')
+        self._reader = open(path, 'rb')
+        self._offset = 0
+        return True
+
+    def state(self):
+        """ :return: [read offset, size, length], the state to reopen the queue with """
+        self._writer.flush()
+        self._dirty = False
+        return [self._offset, self._writer.tell(), self.length]
+
+    def close(self):
+        if self._memory is None:
+            self._writer.close()
+            self._reader.close()
+
+class Crawler:
+    """ Resumable breadth-first crawl of matches from seed players and matches
+    """
+
+    def __init__(self, path=None, players=(), matches=(), queues=None, patches=None, regions=None,
+                 matches_per_player=MATCHES_PER_PLAYER, since=None, seen=SortedIdSet.kind, capacity=10 ** 7):
+        """
+        :param path: folder of the frontier and seen sets, a crawl found in it is resumed. None keeps everything in memory
+        :param players: seed (clusterId, puuid) tuples. clusterId accepted values: 0-2(inclusive) respective to 'AMERICAS', 'ASIA' & 'EUROPE'
+        :param matches: seed LOL match IDs
+        :param queues: queue IDs matches must be played in (e.g. [420] for ranked solo/duo), any by default
+        :param patches: patches matches must be played on, as major * 100 + minor (e.g. 1304 for 13.4), any by default
+        :param regions: LOL server IDs matches must be played in (see loliglio.regions), any by default
+        :param matches_per_player: most recent match IDs listed per player
+        :param since: epoch secs, only matches played after it are listed
+        :param seen: 'sorted' (SortedIdSet, exact) or 'bloom' (BloomFilter, approximate and smaller)
+        :param capacity: IDs the BloomFilter is sized for
+        """
+
+        self.path = path
+        self.queues = set(queues) if queues is not None else None
+        self.patches = set(patches) if patches is not None else None
+        self.regions = {loliglio.regions[regionId] for regionId in regions} if regions is not None else None
+        self.matches_per_player = matches_per_player
+        self.since = since
+        self.stats = {'players_listed': 0, 'listed': 0, 'skipped_region': 0, 'fetched': 0, 'filtered': 0,
+                      'yielded': 0, 'failed': 0, 'requeued': 0, 'deferred': 0}
+
+        state = None
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            if os.path.exists(os.path.join(path, 'state.json')):
+                with open(os.path.join(path, 'state.json')) as file:
+                    state = json.load(file)
+        self._generation = 0
+        if state is not None:
+            kind = SEEN_SETS[state['seen']]
+            self._generation = state['generation']
+            self.seen_players = kind.load(os.path.join(path, 'seen_players.' + str(self._generation) + '.bin'))
+            self.seen_matches = kind.load(os.path.join(path, 'seen_matches.' + str(self._generation) + '.bin'))
+            self.stats.update(state['stats'])
+        else:
+            kind = SEEN_SETS[seen]
+            self.seen_players = kind() if kind is SortedIdSet else kind(capacity)
+            self.seen_matches = kind() if kind is SortedIdSet else kind(capacity)
+        self.player_queue = DiskQueue(path and os.path.join(path, state.get('players_file', 'players.queue') if state else 'players.queue'),
+                                      state and state['players'])
+        self.match_queue = DiskQueue(path and os.path.join(path, state.get('matches_file', 'matches.queue') if state else 'matches.queue'),
+                                     state and state['matches'])
+        # Matches and players taken from the queues whose fetch or listing isn't processed yet, queued again by a resumed crawl
+        self._in_flight = set()
+        self._listing = set()
+        # Failed attempts of the matches and players queued again after a failure
+        self._failures = dict(state.get('failures', ())) if state is not None else dict()
+        # Heap of (monotonic time, is a player, match ID or player) waiting for an open circuit's cooldown
+        self._deferred = list()
+        for matchId in state['in_flight'] if state is not None else ():
+            self.match_queue.push(matchId)
+        for player, item in state.get('deferred', ()) if state is not None else ():
+            (self.player_queue if player else self.match_queue).push(item)
+        for player in state.get('listing', ()) if state is not None else ():
+            self.player_queue.push(player)
+        for clusterId, puuid in players:
+            self.add_player(clusterId, puuid)
+        for matchId in matches:
+            self.add_match(matchId)
+
+    def add_player(self, clusterId, puuid):
+        """ queues a player, unless it was already seen
+        :raises ValueError: when clusterId isn't one serving match histories (0-2)
+        """
+
+        # ESPORTS (3) lists no player's matches, a player queued with it would be listed from the wrong host
+        if clusterId not in (0, 1, 2):
+            raise ValueError('players are listed from the AMERICAS, ASIA or EUROPE cluster (0-2), not ' + repr(clusterId))
+        if self.seen_players.add(puuid):
+            self.player_queue.push(str(clusterId) + ' ' + puuid)
+
+    def add_match(self, matchId):
+        """ queues a match, unless it was already seen or is played in a region filtered out """
+        if self.regions is not None and matchId.split('_', 1)[0] not in self.regions:
+            self.stats['skipped_region'] += 1
+            return
+        if self.seen_matches.add(matchId):
+            self.match_queue.push(matchId)
+
+    def accepts(self, match):
+        """ :return: true when a MatchDto passes the queue and patch filters """
+        info = match['info']
+        if self.queues is not None and info.get('queueId') not in self.queues:
+            return False
+        return self.patches is None or export.patch(info.get('gameVersion')) in self.patches
+
+    def list_matches(self, player):
+        """ :return: the recent match IDs of a queued player ('clusterId puuid') """
+        clusterId, puuid = player.split(' ', 1)
+        queue = next(iter(self.queues)) if self.queues is not None and len(self.queues) == 1 else None
+        return loliglio.Match.matches_by_puuid(int(clusterId), puuid, count=self.matches_per_player, queue=queue,
+                                               startTime=self.since)
+
+    def _requeue(self, queue, item, error):
+        """ queues a failed match or player again, unless error can't be retried or it failed ATTEMPTS times
+        :return: true when item was queued again
+        """
+
+        if isinstance(error, errors.CircuitOpen):
+            breaker = loliglio.circuit_breaker
+            ready = time.monotonic() + (breaker.cooldown if breaker is not None else 0)
+            heapq.heappush(self._deferred, (ready, queue is self.player_queue, item))
+            self.stats['deferred'] += 1
+            return True
+        failures = self._failures.pop(item, 0) + 1
+        if not isinstance(error, RETRY_ON) or failures >= ATTEMPTS:
+            return False
+        self._failures[item] = failures
+        queue.push(item)
+        self.stats['requeued'] += 1
+        return True
+
+    def _release(self, wait=False):
+        # Queues the deferred items whose cooldown is over, waiting for the first one when wait is true
+        if wait and self._deferred:
+            time.sleep(max(0.0, self._deferred[0][0] - time.monotonic()))
+        now = time.monotonic()
+        while self._deferred and self._deferred[0][0] <= now:
+            _, player, item = heapq.heappop(self._deferred)
+            (self.player_queue if player else self.match_queue).push(item)
+
+    def _expand(self, workers, per_cluster):
+        # Lists the match IDs of the next queued players, as many at once as there are workers
+        players = [player for player in (self.player_queue.pop() for _ in range(workers)) if player is not None]
+        self._listing.update(players)
+        for player, ids in loliglio.fetch_many(self.list_matches, players, workers, per_cluster,
+                                               cluster=lambda player: int(player.split(' ', 1)[0])):
+            self._listing.discard(player)
+            if isinstance(ids, BaseException):
+                self.stats['failed'] += 1
+                self._requeue(self.player_queue, player, ids)
+                continue
+            self._failures.pop(player, None)
+            self.stats['players_listed'] += 1
+            self.stats['listed'] += len(ids)
+            for matchId in ids:
+                self.add_match(matchId)
+
+    def _next_matches(self, workers, per_cluster):
+        while True:
+            self._release()
+            matchId = self.match_queue.pop()
+            if matchId is None:
+                if not len(self.player_queue):
+                    return
+                self._expand(workers, per_cluster)
+                continue
+            self._in_flight.add(matchId)
+            yield matchId
+
+    def run(self, workers=8, per_cluster=None, max_matches=None, compact=False):
+        """ crawls until the frontier is empty or max_matches were yielded
+        Matches are fetched concurrently, and the frontier (with the seen sets) is saved every SAVE_EVERY
+        matches and when the generator ends. Matches fetched after the last save are fetched again on resume.
+        :param workers: number of threads making calls at the same time
+        :param per_cluster: maximum calls in flight per cluster, workers by default
+        :param max_matches: matches yielded before stopping, no limit when None
+        :param compact: when true matches are yielded as models.Match (see Match.matches)
+        :return: generator of (matchId, MatchDto JSON object) tuples of the new matches passing the filters. A failed fetch yields its exception instead, and is tried again later (up to ATTEMPTS times) when the error is one of RETRY_ON
+        """
+
+        fetch = (lambda matchId: loliglio.Match.matches(matchId, compact=True)) if compact else loliglio.Match.matches
+        yielded = 0
+        try:
+            # A round ends once the in-flight fetches are done, their participants may have refilled the frontier
+            while len(self.match_queue) or len(self.player_queue) or self._deferred:
+                # Only deferred items left: waits for the first cooldown to end
+                self._release(wait=not len(self.match_queue) and not len(self.player_queue))
+                for matchId, match in loliglio.fetch_many(fetch, self._next_matches(workers, per_cluster), workers, per_cluster):
+                    self._in_flight.discard(matchId)
+                    if isinstance(match, BaseException):
+                        self.stats['failed'] += 1
+                        self._requeue(self.match_queue, matchId, match)
+                        yield matchId, match
+                        continue
+                    self._failures.pop(matchId, None)
+                    self.stats['fetched'] += 1
+                    if not self.accepts(match):
+                        self.stats['filtered'] += 1
+                        continue
+                    clusterId = loliglio.match_cluster(matchId)
+                    for puuid in match['metadata']['participants']:
+                        self.add_player(clusterId, puuid)
+                    self.stats['yielded'] += 1
+                    yield matchId, match
+                    yielded += 1
+                    if self.stats['yielded'] % SAVE_EVERY == 0:
+                        self.save()
+                    if max_matches is not None and yielded >= max_matches:
+                        return
+        finally:
+            self.save()
+
+    def save(self):
+        """ writes the frontier and the seen sets
+        The seen sets of every save get new files, so do queue files mostly read already (see DiskQueue.compact),
+        and state.json, written last, switches to them: an interrupted save leaves the previous state whole
+        """
+
+        if self.path is None:
+            return
+        previous, generation = self._generation, self._generation + 1
+        # Queue files mostly read already are moved to new ones, the previous ones are removed once state.json is switched
+        old_files = list()
+        for queue, name in ((self.player_queue, 'players'), (self.match_queue, 'matches')):
+            old_file = queue.path
+            if queue.compact(os.path.join(self.path, name + '.' + str(generation) + '.queue')):
+                old_files.append(old_file)
+        state = {'seen': self.seen_matches.kind, 'generation': generation, 'players': self.player_queue.state(),
+                 'matches': self.match_queue.state(), 'in_flight': sorted(self._in_flight),
+                 'listing': sorted(self._listing), 'failures': self._failures,
+                 'deferred': [[player, item] for _, player, item in self._deferred], 'stats': self.stats,
+                 'players_file': os.path.basename(self.player_queue.path),
+                 'matches_file': os.path.basename(self.match_queue.path)}
+        for name, seen in (('seen_players', self.seen_players), ('seen_matches', self.seen_matches)):
+            seen.save(os.path.join(self.path, name + '.' + str(generation) + '.bin'))
+        handle, temp = tempfile.mkstemp(dir=self.path, prefix='.state')
+        with os.fdopen(handle, 'w') as file:
+            json.dump(state, file)
+        os.replace(temp, os.path.join(self.path, 'state.json'))
+        self._generation = generation
+        for file in old_files + [os.path.join(self.path, name + '.' + str(previous) + '.bin')
+                                 for name in ('seen_players', 'seen_matches')]:
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        """ saves the crawl and closes its queue files """
+        self.save()
+        self.player_queue.close()
+        self.match_queue.close()
@@ -0,0 +1,181 @@
+""" Exceptions raised by loliglio calls, retry policy and per-host circuit breaker
+A failing call raises an ApiError subclass instead of ending the process, so one missing match or one
+unhealthy region doesn't take a whole batch down:
+
+    from loliglio import errors
+    try:
+        match = loliglio.Match.matches('LA2_1138947703')
+    except errors.NotFound:
+        match = None
+"""
+import random
+import threading
+import time
+
+
+class ApiError(Exception):
+    """ Base class of every error raised by an API call
+    """
+
+    status = None
+
+    def __init__(self, url, message=None, status=None, headers=None, body=b''):
+        """
+        :param url: url of the failed call
+        :param message: text describing the error
+        :param status: HTTP status code of the response, None when there was no response
+        :param headers: response headers, None when there was no response
+        :param body: raw response body
+        """
+
+        super().__init__(message or url)
+        self.url = url
+        if status is not None:
+            self.status = status
+        self.headers = headers if headers is not None else dict()
+        self.body = body
+
+class BadRequest(ApiError):
+    """ 400, a parameter of the call is malformed """
+    status = 400
+
+class Unauthorized(ApiError):
+    """ 401, the call had no api key """
+    status = 401
+
+class Forbidden(ApiError):
+    """ 403, the api key is invalid, expired or not allowed to use the endpoint """
+    status = 403
+
+class NotFound(ApiError):
+    """ 404, the requested match, summoner, league, ... doesn't exist """
+    status = 404
+
+class UnsupportedMediaType(ApiError):
+    """ 415, the request body format is not accepted """
+    status = 415
+
+class RateLimited(ApiError):
+    """ 429, a rate limit was exceeded. retry_after holds the seconds to wait, when the server sent them """
+    status = 429
+
+    @property
+    def retry_after(self):
+        try:
+            return float(self.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+class ServerError(ApiError):
+    """ 5xx, the platform failed to answer """
+    status = 500
+
+class ServiceUnavailable(ServerError):
+    """ 503, the platform is temporarily down """
+    status = 503
+
+class TransportError(ApiError):
+    """ the connection failed or timed out before a response was received """
+
+class CircuitOpen(ApiError):
+    """ the host failed too many times in a row, calls fail fast until its cooldown ends """
+
+STATUS_ERRORS = {error.status: error for error in (BadRequest, Unauthorized, Forbidden, NotFound,
+                                                   UnsupportedMediaType, RateLimited, ServiceUnavailable)}
+
+def from_status(url, status, reason=None, headers=None, body=b''):
+    """ builds the ApiError subclass matching an HTTP status code
+    :return: ApiError instance, ready to be raised
+    """
+
+    error = STATUS_ERRORS.get(status)
+    if error is None:
+        error = ServerError if status >= 500 else ApiError
+    message = str(status) + ' ' + (reason or '') + ' for ' + url
+    return error(url, message, status, headers, body)
+
+def from_http_error(e):
+    """ translates a urllib.error.HTTPError raised by the transport into an ApiError subclass """
+    try:
+        body = e.read()
+    except Exception:
+        body = b''
+    return from_status(e.url, e.code, e.reason, e.headers, body)
+
+class RetryPolicy:
+    """ Bounded retries with jittered exponential backoff. Rate limit errors wait their Retry-After instead
+    """
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30, retry_on=(RateLimited, ServerError, TransportError)):
+        """
+        :param retries: retries after the first attempt, 0 disables retrying
+        :param backoff: seconds of the first backoff, doubled on every retry
+        :param max_backoff: upper bound of a single backoff in seconds
+        :param retry_on: ApiError subclasses worth retrying
+        """
+
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = tuple(retry_on)
+
+    def should_retry(self, attempt, error):
+        """ :return: true when error, raised by the attempt numbered attempt (0 for the first), can be retried """
+        return attempt < self.retries and isinstance(error, self.retry_on)
+
+    def delay(self, attempt, error):
+        """ :return: seconds to wait before the next attempt """
+        if isinstance(error, RateLimited) and error.retry_after is not None:
+            return error.retry_after
+        # Full jitter keeps concurrent workers from retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+class CircuitBreaker:
+    """ Fails fast on hosts with too many consecutive server or transport errors
+    After threshold failures in a row the host is opened for cooldown seconds, then a single probe call is
+    let through: a success (any response below 500, 4xx included) closes the circuit again, a failure reopens it.
+    """
+
+    def __init__(self, threshold=5, cooldown=30):
+        """
+        :param threshold: consecutive failures that open the circuit of a host
+        :param cooldown: seconds an open circuit rejects calls before probing the host again
+        """
+
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = dict()
+        self._opened = dict()
+
+    def check(self, host, url=None):
+        """ raises CircuitOpen when calls to host have to fail fast """
+        with self._lock:
+            opened = self._opened.get(host)
+            if opened is None:
+                return
+            if time.monotonic() - opened < self.cooldown:
+                raise CircuitOpen(url or host, host + ' is failing, circuit open for ' + str(self.cooldown) + ' secs')
+            # Half open: lets this call probe the host and keeps rejecting the others meanwhile
+            self._opened[host] = time.monotonic()
+
+    def success(self, host):
+        """ records a successful call, closing the circuit of host """
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened.pop(host, None)
+
+    def failure(self, host):
+        """ records a failed call, opening the circuit of host once threshold is reached """
+        with self._lock:
+            failures = self._failures[host] = self._failures.get(host, 0) + 1
+            if failures >= self.threshold:
+                self._opened[host] = time.monotonic()
+
+    def state(self, host):
+        """ :return: 'closed', 'open' or 'half-open' """
+        with self._lock:
+            opened = self._opened.get(host)
+        if opened is None:
+            return 'closed'
+        return 'open' if time.monotonic() - opened < self.cooldown else 'half-open'
@@ -0,0 +1,318 @@
+""" Columnar export of matches for analytics, one row per participant
+Match.matches results are streamed into column files in batches, with the region stored as a loliglio
+regions ID, the patch as an integer (12.4 -> 1204) and strings (puuid, position) dictionary-encoded, so
+analytics jobs scan millions of participant rows without parsing JSON again.
+
+Two formats are written:
+- 'arrow' (Arrow IPC file) or 'parquet', when the optional pyarrow package is installed
+- 'packed', standard library only: a folder with one raw array file per column plus meta.json. Reading
+  memory-maps the column files, so a column is a zero-copy memoryview of machine integers
+
+    from loliglio import export
+    with export.ParticipantWriter('ladder_matches') as writer:
+        for matchId, match in loliglio.Match.matches_many(matchIds):
+            if not isinstance(match, Exception):
+                writer.write(match)
+
+    columns = export.read('ladder_matches')
+    kills = columns['kills']                      # memoryview of int32, one value per participant row
+"""
+import array
+import json
+import mmap
+import os
+import sys
+import tempfile
+
+import loliglio
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+FORMAT_VERSION = 1
+BATCH_ROWS = 64 * 1024
+
+# name, array typecode, ParticipantDto key. Typecodes of fixed size on every platform: b 1, h 2, i 4, q 8 bytes
+PARTICIPANT_STATS = (
+    ('participantId', 'b', 'participantId'),
+    ('teamId', 'h', 'teamId'),
+    ('championId', 'i', 'championId'),
+    ('win', 'b', 'win'),
+    ('champLevel', 'h', 'champLevel'),
+    ('kills', 'i', 'kills'),
+    ('deaths', 'i', 'deaths'),
+    ('assists', 'i', 'assists'),
+    ('goldEarned', 'i', 'goldEarned'),
+    ('totalDamageDealtToChampions', 'i', 'totalDamageDealtToChampions'),
+    ('totalDamageTaken', 'i', 'totalDamageTaken'),
+    ('totalMinionsKilled', 'i', 'totalMinionsKilled'),
+    ('neutralMinionsKilled', 'i', 'neutralMinionsKilled'),
+    ('visionScore', 'i', 'visionScore'),
+    ('timePlayed', 'i', 'timePlayed'),
+)
+# Columns filled from the MatchDto info, repeated on every participant row of the match
+MATCH_COLUMNS = (('gameId', 'q'), ('regionId', 'b'), ('queueId', 'i'), ('patch', 'i'), ('gameCreation', 'q'), ('gameDuration', 'i'))
+# Dictionary-encoded string columns: codes are int32 indexes into the column's dictionary
+STRING_COLUMNS = (('puuid', 'puuid'), ('teamPosition', 'teamPosition'))
+
+COLUMNS = MATCH_COLUMNS + tuple((name, typecode) for name, typecode, _ in PARTICIPANT_STATS) + tuple((name, 'i') for name, _ in STRING_COLUMNS)
+
+_region_ids = {region: regionId for regionId, region in enumerate(loliglio.regions)}
+
+def region_id(platformId):
+    """ :return: loliglio regions ID of a platform ('LA2' -> 6), -1 when unknown """
+    return _region_ids.get(str(platformId).upper(), -1)
+
+def patch(gameVersion):
+    """ :return: major and minor version of a game as an integer ('12.4.415.1234' -> 1204), 0 when unknown """
+    try:
+        major, minor = str(gameVersion).split('.')[:2]
+        return int(major) * 100 + int(minor)
+    except ValueError:
+        return 0
+
+def _integer(value):
+    # Missing stats and booleans are stored as integers, as every column is numeric
+    return 0 if value is None else int(value)
+
+def append_match(columns, match, dictionaries, strings):
+    """ appends the participant rows of a match to in-memory columns
+    :param columns: dict of {name: array.array} holding every COLUMNS name
+    :param match: MatchDto JSON object or models.Match (see Match.matches)
+    :param dictionaries: dict of {string column: {string: code}}, new strings get the next code
+    :param strings: dict of {string column: list of its strings, indexed by code}
+    :return: number of rows appended. A value that doesn't fit its column raises, and no row of the match is kept
+    """
+
+    info = match['info']
+    values = (info.get('gameId'), region_id(info.get('platformId')), info.get('queueId'),
+              patch(info.get('gameVersion')), info.get('gameCreation'), info.get('gameDuration'))
+    start = len(columns['gameId'])
+    try:
+        for participant in info['participants']:
+            for (name, _), value in zip(MATCH_COLUMNS, values):
+                columns[name].append(_integer(value))
+            for name, _, key in PARTICIPANT_STATS:
+                columns[name].append(_integer(participant.get(key)))
+            for name, key in STRING_COLUMNS:
+                codes = dictionaries[name]
+                value = participant.get(key) or ''
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(codes)
+                    strings[name].append(value)
+                columns[name].append(code)
+    except (OverflowError, TypeError, ValueError):
+        # Columns must keep the same length, the rows of the match already appended are dropped
+        for column in columns.values():
+            del column[start:]
+        raise
+    return len(columns['gameId']) - start
+
+class ParticipantWriter:
+    """ Streams matches to a columnar file, one row per participant, flushed every batch_rows rows
+    """
+
+    def __init__(self, path, format=None, batch_rows=BATCH_ROWS):
+        """
+        :param path: file ('arrow', 'parquet') or folder ('packed') to create. An existing one is overwritten
+        :param format: 'arrow', 'parquet' or 'packed'. 'arrow' when pyarrow is installed, 'packed' otherwise
+        :param batch_rows: rows kept in memory before being written
+        """
+
+        if format is None:
+            format = 'arrow' if pyarrow is not None else 'packed'
+        if format not in ('arrow', 'parquet', 'packed'):
+            raise ValueError('unknown format ' + repr(format))
+        if format != 'packed' and pyarrow is None:
+            raise ImportError('the ' + format + " format needs pyarrow, install it or use format='packed'")
+        self.path = path
+        self.format = format
+        self.batch_rows = batch_rows
+        self.rows = 0
+        # Codes of the dictionary-encoded columns, by string and by code
+        self.dictionaries = {name: dict() for name, _ in STRING_COLUMNS}
+        self.strings = {name: list() for name, _ in STRING_COLUMNS}
+        self._batch = self._empty()
+        self._writer = None
+        self._files = None
+        if format == 'packed':
+            os.makedirs(path, exist_ok=True)
+            if os.path.exists(os.path.join(path, 'meta.json')):
+                os.remove(os.path.join(path, 'meta.json'))
+            self._files = {name: open(os.path.join(path, name + '.bin'), 'wb') for name, _ in COLUMNS}
+
+    @staticmethod
+    def _empty():
+        return {name: array.array(typecode) for name, typecode in COLUMNS}
+
+    def write(self, match):
+        """ appends the participant rows of a match
+        :param match: MatchDto JSON object or models.Match (see Match.matches)
+        """
+
+        append_match(self._batch, match, self.dictionaries, self.strings)
+        if len(self._batch['gameId']) >= self.batch_rows:
+            self.flush()
+
+    def write_many(self, matches):
+        """ appends every match of an iterable, e.g. the results of Match.matches_many (exceptions are skipped)
+        :return: number of matches written
+        """
+
+        written = 0
+        for match in matches:
+            if isinstance(match, tuple):
+                match = match[1]
+            if isinstance(match, BaseException):
+                continue
+            self.write(match)
+            written += 1
+        return written
+
+    def flush(self):
+        """ writes the rows held in memory """
+        batch, self._batch = self._batch, self._empty()
+        count = len(batch['gameId'])
+        if not count:
+            return
+        if self.format == 'packed':
+            for name, _ in COLUMNS:
+                batch[name].tofile(self._files[name])
+        else:
+            self._write_arrow(batch, count)
+        self.rows += count
+
+    def _write_arrow(self, batch, count):
+        arrays = list()
+        for name, typecode in COLUMNS:
+            if name in self.strings:
+                # Arrow files hold the strings themselves, a dictionary growing across batches can't be stored
+                strings = self.strings[name]
+                arrays.append(pyarrow.array([strings[code] for code in batch[name]], pyarrow.string()))
+            else:
+                kind = {'b': pyarrow.int8(), 'h': pyarrow.int16(), 'i': pyarrow.int32(), 'q': pyarrow.int64()}[typecode]
+                # Zero-copy: the Arrow array reads the array.array buffer directly
+                arrays.append(pyarrow.Array.from_buffers(kind, count, [None, pyarrow.py_buffer(batch[name])]))
+        record_batch = pyarrow.RecordBatch.from_arrays(arrays, [name for name, _ in COLUMNS])
+        if self._writer is None:
+            if self.format == 'arrow':
+                self._writer = pyarrow.ipc.new_file(self.path, record_batch.schema)
+            else:
+                self._writer = pyarrow.parquet.ParquetWriter(self.path, record_batch.schema)
+        if self.format == 'arrow':
+            self._writer.write_batch(record_batch)
+        else:
+            self._writer.write_table(pyarrow.Table.from_batches([record_batch]))
+
+    def close(self):
+        """ writes the remaining rows and the metadata, the file can't be appended to afterwards """
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+        if self._files is not None:
+            for file in self._files.values():
+                file.close()
+            for name, _ in STRING_COLUMNS:
+                with open(os.path.join(self.path, name + '.dict'), 'w', encoding='utf-8') as file:
+                    json.dump(self.strings[name], file)
+            meta = {'version': FORMAT_VERSION, 'rows': self.rows, 'byteorder': sys.byteorder,
+                    'columns': [[name, typecode] for name, typecode in COLUMNS],
+                    'dictionaries': [name for name, _ in STRING_COLUMNS], 'regions': loliglio.regions}
+            # meta.json is written last and atomically: a folder without it is an unfinished export
+            handle, temp = tempfile.mkstemp(dir=self.path, prefix='.meta')
+            with os.fdopen(handle, 'w') as file:
+                json.dump(meta, file)
+            os.replace(temp, os.path.join(self.path, 'meta.json'))
+            self._files = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class PackedColumns:
+    """ Memory-mapped columns of a 'packed' export
+    columns['kills'] is a memoryview of the raw column file: values are read straight from the page cache,
+    nothing is parsed or copied.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: folder written by ParticipantWriter(path, format='packed')
+        """
+
+        with open(os.path.join(path, 'meta.json')) as file:
+            self.meta = json.load(file)
+        if self.meta['byteorder'] != sys.byteorder:
+            raise ValueError(path + ' was written on a ' + self.meta['byteorder'] + ' endian machine')
+        self.path = path
+        self.rows = self.meta['rows']
+        self.typecodes = dict(self.meta['columns'])
+        self._maps = dict()
+        self._dictionaries = dict()
+
+    def __getitem__(self, name):
+        """ :return: memoryview of column name, with one value per participant row """
+        typecode = self.typecodes[name]
+        if name not in self._maps:
+            with open(os.path.join(self.path, name + '.bin'), 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                self._maps[name] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        mapped = self._maps[name]
+        if mapped is None:
+            return memoryview(array.array(typecode))
+        return memoryview(mapped).cast(typecode)
+
+    def dictionary(self, name):
+        """ :return: list of the strings of a dictionary-encoded column, indexed by its codes """
+        if name not in self._dictionaries:
+            with open(os.path.join(self.path, name + '.dict'), encoding='utf-8') as file:
+                self._dictionaries[name] = json.load(file)
+        return self._dictionaries[name]
+
+    def strings(self, name):
+        """ :return: list of the decoded strings of a dictionary-encoded column """
+        dictionary = self.dictionary(name)
+        return [dictionary[code] for code in self[name]]
+
+    def __iter__(self):
+        return iter(self.typecodes)
+
+    def __len__(self):
+        return self.rows
+
+    def close(self):
+        """ unmaps the column files. memoryviews still referencing them have to be released first """
+        maps, self._maps = self._maps, dict()
+        for mapped in maps.values():
+            if mapped is not None:
+                mapped.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read(path):
+    """ opens an export for reading, without parsing it
+    :param path: folder ('packed') or file ('arrow', 'parquet') written by ParticipantWriter
+    :return: PackedColumns, or a memory-mapped pyarrow.Table for Arrow and Parquet files
+    """
+
+    if os.path.isdir(path):
+        return PackedColumns(path)
+    if pyarrow is None:
+        raise ImportError('reading ' + path + ' needs pyarrow')
+    with open(path, 'rb') as file:
+        magic = file.read(4)
+    if magic == b'PAR1':
+        return pyarrow.parquet.read_table(path, memory_map=True)
+    return pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
@@ -0,0 +1,184 @@
+""" Incremental match history sync of a tracked set of players
+Every player keeps a watermark: the most recent match ID seen and when it was synced. A sync only lists the
+match IDs played after the watermark (usually a single Match.matches_by_puuid call per player), skips the
+ones already fetched for another player of the same game (or already stored, through known), and fetches
+what is left concurrently under the shared rate limiter. Refreshing a roster costs calls proportional to
+the games played since the last run instead of to the whole history of every player.
+
+    from loliglio import history
+    sync = history.HistorySync('roster.json', {puuid: clusterId, ...})
+    for matchId, match in sync.run():
+        if not isinstance(match, Exception):
+            store(match)
+"""
+import json
+import os
+import tempfile
+import time
+
+import loliglio
+
+
+# Matches are listed by the time they started, one that was being played during the previous sync started
+# before it. The watermark match ID keeps them from being listed twice
+OVERLAP = 2 * 3600
+
+class Watermarks:
+    """ JSON file of the sync state of every player: {puuid: [last match ID, last sync epoch secs]}
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: file the watermarks are loaded from and saved to, None keeps them in memory only
+        """
+
+        self.path = path
+        self.marks = dict()
+        if path and os.path.exists(path):
+            with open(path) as file:
+                self.marks = json.load(file)
+
+    def get(self, puuid):
+        """ :return: (last match ID, last sync epoch secs) of puuid, (None, None) when it was never synced """
+        match, synced = self.marks.get(puuid, (None, None))
+        return match, synced
+
+    def set(self, puuid, match, synced):
+        self.marks[puuid] = [match, synced]
+
+    def forget(self, puuid):
+        """ drops the watermark of puuid, its next sync lists its whole history again """
+        self.marks.pop(puuid, None)
+
+    def save(self):
+        """ writes the file atomically """
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temp = tempfile.mkstemp(dir=directory, prefix='.watermarks')
+        with os.fdopen(handle, 'w') as file:
+            json.dump(self.marks, file)
+        os.replace(temp, self.path)
+
+class HistorySync:
+    """ Keeps the match history of a roster of players current, fetching only the matches played since the last run
+    """
+
+    def __init__(self, path, players=None, since=None, limit=None, known=None, save_every=100):
+        """
+        :param path: watermarks file (see Watermarks), None keeps them in memory only
+        :param players: dict of {puuid: clusterId}. clusterId accepted values: 0-2(inclusive) respective to 'AMERICAS', 'ASIA' & 'EUROPE'
+        :param since: epoch secs, players synced for the first time only get the matches played after it (whole history when None)
+        :param limit: maximum number of new match IDs synced per player and run, the oldest first: the next runs pick up the rest (no limit when None)
+        :param known: optional function receiving a match ID and returning true when it is already stored, it isn't fetched then
+        :param save_every: watermarks advanced between two saves of the file
+        """
+
+        self.watermarks = Watermarks(path)
+        self.players = dict(players or ())
+        self.since = since
+        self.limit = limit
+        self.known = known
+        self.save_every = save_every
+        self.stats = dict()
+
+    def add(self, puuid, clusterId):
+        """ starts tracking a player """
+        self.players[puuid] = clusterId
+
+    def remove(self, puuid):
+        """ stops tracking a player and forgets its watermark """
+        self.players.pop(puuid, None)
+        self.watermarks.forget(puuid)
+
+    def new_matches(self, puuid, synced):
+        """ lists the match IDs of puuid played since its watermark, most recent first
+        Past the limit the most recent ones are left for the next runs: the watermark then only advances to the
+        newest match ID kept, never beyond a match not synced yet
+        :param synced: epoch secs the current run started at
+        :return: tuple of the list of LOL match IDs (the oldest limit ones) and whether it holds every match since the watermark
+        """
+
+        last, previous = self.watermarks.get(puuid)
+        startTime = int(previous - OVERLAP) if previous is not None else self.since
+        ids = list(loliglio.Match.iter_matches_by_puuid(self.players[puuid], puuid, startTime=startTime, stop_at=last))
+        if self.limit is not None and len(ids) > self.limit:
+            return ids[len(ids) - self.limit:], False
+        return ids, True
+
+    def run(self, workers=8, per_cluster=None, compact=False):
+        """ syncs every player, yielding the matches they played since the previous run
+        The watermark of a player only advances once every one of its new matches has been yielded, so an
+        interrupted run (or a failed fetch) is picked up again by the next one. Closing the generator early
+        saves the watermarks advanced so far.
+        :param workers: number of threads making calls at the same time (listing and fetching each)
+        :param per_cluster: maximum calls in flight per cluster, workers by default
+        :param compact: when true matches are yielded as models.Match (see Match.matches)
+        :return: generator of (matchId, MatchDto JSON object) tuples. A failed fetch yields its exception instead
+        """
+
+        synced = int(time.time())
+        stats = self.stats = {'players': len(self.players), 'listed': 0, 'new': 0, 'duplicates': 0, 'known': 0,
+                              'fetched': 0, 'failed': 0, 'players_failed': 0, 'advanced': 0, 'truncated': 0}
+        seen = set()
+        waiting = dict()     # matchId: puuids waiting for it
+        pending = dict()     # puuid: [matches still to be yielded, most recent match ID kept, whether one failed, whether all were listed]
+        unsaved = [0]
+
+        def advance(puuid):
+            _, newest, failed, complete = pending.pop(puuid)
+            if failed:
+                return
+            last, previous = self.watermarks.get(puuid)
+            # Matches past the limit were played after newest: the time window of the next run must still reach them
+            self.watermarks.set(puuid, newest or last, synced if complete else previous)
+            stats['advanced'] += 1
+            unsaved[0] += 1
+            if unsaved[0] >= self.save_every:
+                self.watermarks.save()
+                unsaved[0] = 0
+
+        def discover():
+            listings = loliglio.fetch_many(lambda puuid: self.new_matches(puuid, synced), list(self.players),
+                                           workers, per_cluster, cluster=self.players.get)
+            for puuid, listing in listings:
+                if isinstance(listing, BaseException):
+                    stats['players_failed'] += 1
+                    continue
+                ids, complete = listing
+                stats['listed'] += 1
+                if not complete:
+                    stats['truncated'] += 1
+                entry = pending[puuid] = [0, ids[0] if ids else None, False, complete]
+                for matchId in ids:
+                    if matchId in seen:
+                        stats['duplicates'] += 1
+                        if matchId in waiting:
+                            waiting[matchId].append(puuid)
+                            entry[0] += 1
+                        continue
+                    seen.add(matchId)
+                    if self.known is not None and self.known(matchId):
+                        stats['known'] += 1
+                        continue
+                    stats['new'] += 1
+                    waiting[matchId] = [puuid]
+                    entry[0] += 1
+                    yield matchId
+                if entry[0] == 0:
+                    advance(puuid)
+
+        fetch = (lambda matchId: loliglio.Match.matches(matchId, compact=True)) if compact else loliglio.Match.matches
+        try:
+            for matchId, match in loliglio.fetch_many(fetch, discover(), workers, per_cluster):
+                failed = isinstance(match, BaseException)
+                stats['failed' if failed else 'fetched'] += 1
+                yield matchId, match
+                for puuid in waiting.pop(matchId, ()):
+                    entry = pending[puuid]
+                    entry[0] -= 1
+                    entry[2] = entry[2] or failed
+                    if entry[0] == 0:
+                        advance(puuid)
+        finally:
+            self.watermarks.save()
@@ -0,0 +1,176 @@
+""" Incremental decoding of large JSON documents, such as match timelines
+Reads a binary stream chunk by chunk and yields the values found at a path one at a time, so only the
+value being yielded (e.g. one timeline frame) and a read chunk are held in memory, never the whole
+document or its text. Values outside the path are decoded one at a time and dropped right away. Decoding
+itself is left to the json module's C decoder. Standard library only.
+
+    with open('timeline.json', 'rb') as file:
+        for frame in jsonstream.items(file, ('info', 'frames', '*')):
+            ...
+"""
+import json
+import re
+
+
+CHUNK_SIZE = 64 * 1024
+
+MIN_WINDOW = 256
+
+_decoder = json.JSONDecoder()
+_space = re.compile(rb'\s*')
+_number_start = b'-0123456789'
+
+class Reader:
+    """ Buffer over a binary stream keeping only the bytes from the value being read onwards
+    """
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        """
+        :param stream: object with a read(size) method returning bytes (file, http.client.HTTPResponse, ...)
+        :param chunk_size: bytes read from stream at a time
+        """
+
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.data = bytearray()
+        self.pos = 0
+        self.consumed = 0
+        self.window = MIN_WINDOW
+        self.exhausted = False
+
+    def more(self):
+        """ reads the next chunk, dropping the bytes before pos. Raises ValueError at the end of the stream """
+        if not self._read():
+            raise ValueError('unexpected end of JSON stream at byte ' + str(self.consumed + len(self.data)))
+
+    def _read(self):
+        """ :return: false when the stream had nothing left to read """
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.exhausted = True
+            return False
+        if self.pos:
+            del self.data[:self.pos]
+            self.consumed += self.pos
+            self.pos = 0
+        self.data += chunk
+        return True
+
+    @property
+    def received(self):
+        """ :return: bytes read from the stream so far """
+        return self.consumed + len(self.data)
+
+    def peek(self):
+        """ skips whitespace and returns the next byte, without consuming it """
+        while True:
+            self.pos = _space.match(self.data, self.pos).end()
+            if self.pos < len(self.data):
+                return self.data[self.pos]
+            self.more()
+
+    def expect(self, char):
+        """ consumes char (an int, as bytes are indexed), after optional whitespace """
+        found = self.peek()
+        if found != char:
+            raise ValueError('expected ' + repr(chr(char)) + ' at byte ' + str(self.consumed + self.pos) + ', found ' + repr(chr(found)))
+        self.pos += 1
+
+    def comma(self, closing):
+        """ consumes the separator after a member or element
+        :return: true when the container ended (closing was consumed), false when a comma was consumed
+        """
+
+        found = self.peek()
+        self.pos += 1
+        if found == closing:
+            return True
+        if found != 44:
+            raise ValueError('expected , or ' + repr(chr(closing)) + ' at byte ' + str(self.consumed + self.pos - 1))
+        return False
+
+    def value(self):
+        """ consumes and decodes the next value
+        The C decoder does the work: it is handed a window of bytes after pos, widened (reading the stream
+        when needed) until the whole value fits in it
+        """
+
+        first = self.peek()
+        window = self.window
+        while True:
+            available = len(self.data) - self.pos
+            if window > available and not self.exhausted:
+                self._read()
+                continue
+            piece = self.data[self.pos:self.pos + window]
+            # A multi-byte character cut at the end of the window can't be part of a complete value
+            text = piece.decode('utf-8', 'ignore')
+            try:
+                value, end = _decoder.raw_decode(text)
+            except ValueError:
+                if window >= available and self.exhausted:
+                    raise
+                window *= 2
+                continue
+            # A number reaching the end of the window may continue after it
+            if end == len(text) and first in _number_start and (window < available or not self.exhausted):
+                window *= 2
+                continue
+            self.pos += end if len(text) == len(piece) else len(text[:end].encode())
+            # Values at the same path tend to have similar sizes
+            self.window = max(MIN_WINDOW, 2 * end)
+            return value
+
+    def string(self):
+        """ consumes a string and returns it decoded """
+        if self.peek() != 34:
+            raise ValueError('expected a string at byte ' + str(self.consumed + self.pos))
+        return self.value()
+
+    def skip(self):
+        """ consumes the next value, its decoded object is dropped right away """
+        self.value()
+
+def _walk(reader, path):
+    if not path:
+        yield reader.value()
+        return
+    step = path[0]
+    found = reader.peek()
+    if step == '*' and found == 91:
+        reader.pos += 1
+        if reader.peek() == 93:
+            reader.pos += 1
+            return
+        while True:
+            yield from _walk(reader, path[1:])
+            if reader.comma(93):
+                return
+    elif step != '*' and found == 123:
+        reader.pos += 1
+        if reader.peek() == 125:
+            reader.pos += 1
+            return
+        while True:
+            key = reader.string()
+            reader.expect(58)
+            if key == step:
+                yield from _walk(reader, path[1:])
+            else:
+                reader.skip()
+            if reader.comma(125):
+                return
+    else:
+        # The document doesn't have the shape of path here, there is nothing to yield
+        reader.skip()
+
+def items(stream, path, chunk_size=CHUNK_SIZE):
+    """ yields the values found at path in the JSON document read from stream, decoded one at a time
+    :param stream: binary file-like object positioned at the start of a JSON document, or a Reader over it
+    :param path: tuple of object keys and '*' (every element of an array), e.g. ('info', 'frames', '*', 'events', '*')
+    :param chunk_size: bytes read from stream at a time
+    :return: generator of decoded JSON values, in document order
+    """
+
+    reader = stream if isinstance(stream, Reader) else Reader(stream, chunk_size)
+    return _walk(reader, tuple(path))
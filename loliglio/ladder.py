@@ -0,0 +1,155 @@
+""" Ladder snapshots: every ranked entry of one or more regions, streamed as it is downloaded
+Walks the apex leagues (challenger, grandmaster, master) and every queue x tier x division x page of
+League.entries. Each region is crawled by its own thread (regions have separate rate limits), pages are
+handed over through a bounded queue so memory stays flat, and progress can be checkpointed to a file so an
+interrupted crawl resumes where it stopped.
+
+    from loliglio import ladder
+    for regionId, entry in ladder.snapshot([4, 7], checkpoint='ladder.json'):
+        ...
+"""
+import json
+import os
+import queue
+import tempfile
+import threading
+
+import loliglio
+from loliglio import scheduling
+
+
+APEX = (('challenger', loliglio.League.challenger_leagues_by_queue),
+        ('grandmaster', loliglio.League.grandmaster_by_queue),
+        ('master', loliglio.League.master_leagues_by_queue))
+
+def plan(queueIds=(0,), tierIds=None, divisionIds=None, apex=True):
+    """ lists the steps crawled for every region, apex leagues first
+    :param queueIds: LOL queue IDs. Accepted values: 0-2(inclusive) for 'RANKED_SOLO_5x5', 'RANKED_FLEX_SR' & 'RANKED_FLEX_TT'
+    :param tierIds: LOL tier IDs (see loliglio.tiers), every tier by default
+    :param divisionIds: LOL division IDs (see loliglio.divisions), every division by default
+    :param apex: when true the challenger, grandmaster and master leagues are included
+    :return: list of steps, ['apex', queueId, name] or ['entries', queueId, tierId, divisionId]
+    """
+
+    tierIds = range(len(loliglio.tiers)) if tierIds is None else tierIds
+    divisionIds = range(len(loliglio.divisions)) if divisionIds is None else divisionIds
+    steps = list()
+    for queueId in queueIds:
+        if apex:
+            steps.extend(['apex', queueId, name] for name, _ in APEX)
+        for tierId in tierIds:
+            steps.extend(['entries', queueId, tierId, divisionId] for divisionId in divisionIds)
+    return steps
+
+def apex_entries(regionId, queueId, name):
+    """ gets an apex league as LeagueEntryDTO-like dicts, so they look like League.entries results
+    :param name: 'challenger', 'grandmaster' or 'master'
+    :return: list of LeagueItemDTO with leagueId, queueType and tier added
+    """
+
+    league = dict(APEX)[name](regionId, queueId)
+    # New dicts: the league may be shared with concurrent callers of the same url (see loliglio.singleflight)
+    added = {'leagueId': league.get('leagueId'), 'queueType': league.get('queue'), 'tier': league.get('tier')}
+    return [dict(added, **entry) for entry in league.get('entries', ())]
+
+class Checkpoint:
+    """ JSON file remembering, per region, the next step and page to crawl
+    """
+
+    def __init__(self, path, steps):
+        self.path = path
+        self.steps = steps
+        self.progress = dict()
+        if path and os.path.exists(path):
+            with open(path) as file:
+                saved = json.load(file)
+            if saved['plan'] != steps:
+                raise ValueError('checkpoint ' + path + ' was written for a different ladder plan')
+            self.progress = saved['progress']
+
+    def position(self, regionId):
+        """ :return: (step index, page) where the crawl of regionId has to resume """
+        step, page = self.progress.get(str(regionId), (0, 1))
+        return step, page
+
+    def advance(self, regionId, step, page):
+        """ records that regionId has to resume at step and page, then saves the file atomically """
+        self.progress[str(regionId)] = (step, page)
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temp = tempfile.mkstemp(dir=directory, prefix='.ladder')
+        with os.fdopen(handle, 'w') as file:
+            json.dump({'plan': self.steps, 'progress': self.progress}, file)
+        os.replace(temp, self.path)
+
+def snapshot(regionIds, queueIds=(0,), tierIds=None, divisionIds=None, apex=True, exp=False, checkpoint=None, buffer=4):
+    """ streams every ladder entry of the regions given, crawling the regions concurrently
+    Progress is saved once every entry of a page has been yielded, so after a resume the entries of the
+    page that was being consumed may be yielded again.
+    :param regionIds: LOL server IDs. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+    :param queueIds: LOL queue IDs. Accepted values: 0-2(inclusive) for 'RANKED_SOLO_5x5', 'RANKED_FLEX_SR' & 'RANKED_FLEX_TT'
+    :param tierIds: LOL tier IDs (see loliglio.tiers), every tier by default
+    :param divisionIds: LOL division IDs (see loliglio.divisions), every division by default
+    :param apex: when true the challenger, grandmaster and master leagues are included
+    :param exp: when true pages come from League.EXP.entries instead of League.entries
+    :param checkpoint: optional path of a JSON file used to resume an interrupted crawl
+    :param buffer: pages each region may download ahead of the consumer
+    :return: generator of (regionId, LeagueEntryDTO) tuples. Calls are BACKGROUND priority unless the caller set one (see loliglio.scheduling)
+    """
+
+    steps = plan(queueIds, tierIds, divisionIds, apex)
+    progress = Checkpoint(checkpoint, steps)
+    entries = loliglio.League.EXP.entries if exp else loliglio.League.entries
+    pages = queue.Queue(maxsize=buffer * len(regionIds))
+    stop = threading.Event()
+    level = scheduling.current(scheduling.BACKGROUND)
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def crawl(regionId):
+        with scheduling.priority(level):
+            _crawl(regionId)
+
+    def _crawl(regionId):
+        try:
+            first, page = progress.position(regionId)
+            for index in range(first, len(steps)):
+                step = steps[index]
+                if step[0] == 'apex':
+                    put((regionId, index + 1, 1, apex_entries(regionId, step[1], step[2])))
+                    continue
+                page = page if index == first else 1
+                while not stop.is_set():
+                    result = entries(regionId, step[1], step[2], step[3], page=page)
+                    if not result:
+                        break
+                    page += 1
+                    put((regionId, index, page, result))
+            put((regionId, len(steps), 1, None))
+        except BaseException as e:
+            # Forwards any failure to the consumer instead of dying silently
+            put((regionId, None, None, e))
+
+    threads = [threading.Thread(target=crawl, args=(regionId,), daemon=True) for regionId in regionIds]
+    for thread in threads:
+        thread.start()
+    try:
+        running = len(threads)
+        while running:
+            regionId, step, page, result = pages.get()
+            if step is None:
+                raise result
+            for entry in result or ():
+                yield regionId, entry
+            progress.advance(regionId, step, page)
+            if result is None:
+                running -= 1
+    finally:
+        stop.set()
@@ -0,0 +1,132 @@
+""" League-v4 and league-exp-v4 endpoints: ranked leagues and entries """
+from loliglio import divisions, queues, regions, routes, tiers
+from loliglio.client import api_call
+
+
+class League:
+    """ Allows request for league information LeagueListDTO and entries LeagueItemDTO
+    official information at: https://developer.riotgames.com/apis#league-v4
+
+    LeagueListDTO - Contains a league information
+    NAME            | DATA TYPE
+    ----------------|----------------
+    leagueId        | string
+    entries         | List[LeagueItemDTO]
+    tier            | string
+    name            | string
+    queue           | string
+
+    LeagueItemDTO - Contains a league member information, entries of  LeagueListDTO
+    NAME            | DATA TYPE     | DESCRIPTION
+    ----------------|---------------|----------------
+    freshBlood      | boolean       |
+    wins            | int           | Winning team on Summoners Rift.
+    summonerName    | string        |
+    miniSeries      | MiniSeriesDTO |
+    inactive        | boolean       |
+    veteran         | boolean       |
+    hotStreak       | boolean       |
+    rank            | string        |
+    leaguePoints    | int           |
+    losses          | int           | Losing team on Summoners Rift.
+    summonerId      | string        | Player's encrypted summonerId.
+
+    MiniSeriesDTO - Mini series leagues information
+    ----------------|---------------
+    NAME            | DATA TYPE
+    losses          | int
+    progress        | string
+    target          | int
+    wins            | int
+    """
+    class EXP:
+        @staticmethod
+        def entries(regionId, queueId, tierId, divisionId, get_url=False, page=None):
+            """ Get all the league entries. (Set[LeagueEntryDTO])
+            This new endpoint also supports the apex tiers (Challenger, Grandmaster, and Master)
+            :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+            :param queueId: LOL queue ID. Accepted values: 0-2(inclusive) for 'RANKED_SOLO_5x5', 'RANKED_FLEX_SR' & 'RANKED_FLEX_TT'
+            :param tierId: LOL tier ID. Accepted values: 0-5(inclusive) for 'DIAMOND', 'PLATINUM', 'GOLD', 'SILVER', 'BRONZE' & 'IRON'
+            :param divisionId: LOL division ID. Accepted values: 0-3(inclusive) for 'I', 'II', 'III', 'IV'
+            :param get_url: When true, don't make an API call and returns the url connection
+            :param page: Page of entries to return, starting at 1 (1 by default). An empty list means there are no more pages
+            :return: JSON object retrieved from riot API call (or link when get_url is True)
+            """
+            url = routes.LEAGUE_EXP_ENTRIES.url(regions[regionId], queues[queueId], tiers[tierId], divisions[divisionId], query=(('page', page),))
+            if get_url: return url
+            return api_call(url)
+
+    @staticmethod
+    def challenger_leagues_by_queue(regionId, queueId, get_url=False):
+        """ Get the challenger league for given queue. (LeagueListDTO)
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param queueId: LOL queue ID. Accepted values: 0-2(inclusive) for 'RANKED_SOLO_5x5', 'RANKED_FLEX_SR' & 'RANKED_FLEX_TT'
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.LEAGUE_CHALLENGER.url(regions[regionId], queues[queueId])
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def master_leagues_by_queue(regionId, queueId, get_url=False):
+        """ Get the master league for given queue. (LeagueListDTO)
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param queueId: LOL queue ID. Accepted values: 0-2(inclusive) for 'RANKED_SOLO_5x5', 'RANKED_FLEX_SR' & 'RANKED_FLEX_TT'
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.LEAGUE_MASTER.url(regions[regionId], queues[queueId])
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def grandmaster_by_queue(regionId, queueId, get_url=False):
+        """ Get the grandmaster league of a specific queue. (LeagueListDTO)
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param queueId: LOL queue ID. Accepted values: 0-2(inclusive) for 'RANKED_SOLO_5x5', 'RANKED_FLEX_SR' & 'RANKED_FLEX_TT'
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.LEAGUE_GRANDMASTER.url(regions[regionId], queues[queueId])
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def entries_by_summoner(regionId, encryptedSummonerId, get_url=False):
+        """ Get league entries in all queues for a given summoner ID. (Set[LeagueEntryDTO])
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param encryptedSummonerId: Summoner IDs are only unique per region. Different APIs use different IDs
+        :param get_url: get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.LEAGUE_ENTRIES_BY_SUMMONER.url(regions[regionId], encryptedSummonerId)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def entries(regionId, queueId, tierId, divisionId, get_url=False, page=None):
+        """ Get all the league entries (Set[LeagueEntryDTO]).
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param queueId: LOL queue ID. Accepted values: 0-2(inclusive) for 'RANKED_SOLO_5x5', 'RANKED_FLEX_SR' & 'RANKED_FLEX_TT'
+        :param tierId: LOL tier ID. Accepted values: 0-5(inclusive) for 'DIAMOND', 'PLATINUM', 'GOLD', 'SILVER', 'BRONZE' & 'IRON'
+        :param divisionId: LOL division ID. Accepted values: 0-3(inclusive) for 'I', 'II', 'III', 'IV'
+        :param get_url: When true, don't make an API call and returns the url connection
+        :param page: Page of entries to return, starting at 1 (1 by default). An empty list means there are no more pages
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.LEAGUE_ENTRIES.url(regions[regionId], queues[queueId], tiers[tierId], divisions[divisionId], query=(('page', page),))
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def leagues(regionId, leagueId, get_url=False):
+        """ Get league with given ID, including inactive entries (LeagueListDTO).
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param leagueId: Division and queue for a specific region ID. (e.g. 'f3b585a2-8b09-3940-b3fc-d2e404f2a5c4' refers to LA2 Ranked_5x5 Grandmaster league)
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.LEAGUE.url(regions[regionId], leagueId)
+        if get_url: return url
+        return api_call(url)
@@ -0,0 +1,234 @@
+""" Live game tracking of many summoners through Spectator.active_games_by_summoner
+Each summoner is checked on its own schedule instead of in a tight loop: soon after a game ends (a new one
+usually follows), then less and less often while the summoner stays out of game, and at a steady pace
+while a game is being played. Only changes are reported, as Event tuples: 'started' when a summoner is
+found in a game, 'ended' when it is no longer in it. The 404 answered for summoners out of game is the
+expected answer of most checks, so it is not an error here.
+
+    from loliglio import live
+    poller = live.LivePoller([(regionId, summonerId), ...])
+    for event in poller.events():                      # blocking, over a thread pool
+        ...
+    async for event in poller:                          # asyncio, through loliglio.aio
+        ...
+"""
+import asyncio
+import collections
+import concurrent.futures
+import heapq
+import itertools
+import random
+import threading
+import time
+
+import loliglio
+from loliglio import errors
+
+
+# Seconds between checks of a summoner out of game: the first one after a game, growing by BACKOFF up to the last one
+MIN_IDLE = 30
+MAX_IDLE = 15 * 60
+BACKOFF = 2
+# Seconds between checks of a summoner in game
+IN_GAME = 60
+# Random fraction added to or taken from every interval, so summoners added together don't stay in step
+JITTER = 0.1
+
+Event = collections.namedtuple('Event', 'kind regionId summonerId game')
+Event.__doc__ = """ Change of the live state of a summoner
+kind: 'started' or 'ended'. game: CurrentGameInfo JSON object of the game started, or the last one seen of the game ended
+"""
+
+class _Summoner:
+    __slots__ = ('regionId', 'summonerId', 'game', 'interval', 'due', 'removed')
+
+    def __init__(self, regionId, summonerId, due):
+        self.regionId = regionId
+        self.summonerId = summonerId
+        self.game = None
+        self.interval = MIN_IDLE
+        self.due = due
+        self.removed = False
+
+class LivePoller:
+    """ Checks a set of summoners for live games on adaptive intervals and reports the changes
+    """
+
+    def __init__(self, summoners=(), min_idle=MIN_IDLE, max_idle=MAX_IDLE, backoff=BACKOFF, in_game=IN_GAME, jitter=JITTER):
+        """
+        :param summoners: iterable of (regionId, encryptedSummonerId) tuples, checked right away
+        :param min_idle: seconds before the first check of a summoner after its game ended
+        :param max_idle: longest seconds between checks of a summoner out of game
+        :param backoff: factor the interval grows by after every check finding a summoner out of game
+        :param in_game: seconds between checks of a summoner in game
+        :param jitter: random fraction added to or taken from every interval
+        """
+
+        self.min_idle = min_idle
+        self.max_idle = max_idle
+        self.backoff = backoff
+        self.in_game = in_game
+        self.jitter = jitter
+        self.stats = {'checks': 0, 'in_game': 0, 'idle': 0, 'errors': 0, 'started': 0, 'ended': 0}
+        self._lock = threading.Lock()
+        self._summoners = dict()
+        self._queue = list()
+        self._numbers = itertools.count()
+        for regionId, summonerId in summoners:
+            self.add(regionId, summonerId)
+
+    def add(self, regionId, summonerId):
+        """ starts tracking a summoner, it is checked right away
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param summonerId: encrypted summoner ID
+        """
+
+        with self._lock:
+            if (regionId, summonerId) in self._summoners:
+                return
+            summoner = self._summoners[(regionId, summonerId)] = _Summoner(regionId, summonerId, time.monotonic())
+            heapq.heappush(self._queue, (summoner.due, next(self._numbers), summoner))
+
+    def remove(self, regionId, summonerId):
+        """ stops tracking a summoner, without reporting its game as ended """
+        with self._lock:
+            summoner = self._summoners.pop((regionId, summonerId), None)
+            if summoner is not None:
+                summoner.removed = True
+
+    def state(self, regionId, summonerId):
+        """ :return: CurrentGameInfo JSON object of the game the summoner was last seen in, None when out of game or unknown """
+        summoner = self._summoners.get((regionId, summonerId))
+        return summoner.game if summoner is not None else None
+
+    def __len__(self):
+        return len(self._summoners)
+
+    def _due(self, limit):
+        """ takes the summoners whose check is due out of the queue, up to limit
+        :return: tuple of the summoners and the seconds until the next check is due (None when nothing is queued)
+        """
+
+        due = list()
+        now = time.monotonic()
+        with self._lock:
+            while self._queue and len(due) < limit:
+                when, _, summoner = self._queue[0]
+                if summoner.removed:
+                    heapq.heappop(self._queue)
+                elif when <= now:
+                    heapq.heappop(self._queue)
+                    due.append(summoner)
+                else:
+                    break
+            wait = max(0, self._queue[0][0] - now) if self._queue else None
+        return due, wait
+
+    def _schedule(self, summoner, interval):
+        summoner.interval = interval
+        summoner.due = time.monotonic() + interval * (1 + random.uniform(-self.jitter, self.jitter))
+        with self._lock:
+            if not summoner.removed:
+                heapq.heappush(self._queue, (summoner.due, next(self._numbers), summoner))
+
+    def _observe(self, summoner, result):
+        """ records the result of a check and schedules the next one
+        :param result: CurrentGameInfo JSON object, or the exception raised by the check
+        :return: list of the Events it caused
+        """
+
+        self.stats['checks'] += 1
+        events = list()
+        if isinstance(result, errors.NotFound):
+            self.stats['idle'] += 1
+            if summoner.game is not None:
+                events.append(Event('ended', summoner.regionId, summoner.summonerId, summoner.game))
+                summoner.game = None
+                interval = self.min_idle
+            else:
+                interval = min(self.max_idle, max(self.min_idle, summoner.interval * self.backoff))
+        elif isinstance(result, BaseException):
+            # Other failures (rate limits exhausted, server errors, ...) don't change the state, the check is retried later
+            self.stats['errors'] += 1
+            interval = min(self.max_idle, max(self.min_idle, summoner.interval * self.backoff))
+        else:
+            self.stats['in_game'] += 1
+            previous = summoner.game
+            if previous is not None and previous.get('gameId') != result.get('gameId'):
+                events.append(Event('ended', summoner.regionId, summoner.summonerId, previous))
+            if previous is None or previous.get('gameId') != result.get('gameId'):
+                events.append(Event('started', summoner.regionId, summoner.summonerId, result))
+            summoner.game = result
+            interval = self.in_game
+        for event in events:
+            self.stats[event.kind] += 1
+        self._schedule(summoner, interval)
+        return events
+
+    def events(self, workers=8, stop=None):
+        """ checks the summoners as they fall due, over a thread pool, yielding the changes found
+        :param workers: number of checks made at the same time
+        :param stop: optional threading.Event ending the generator once set
+        :return: generator of Event, running until stop is set or the generator is closed
+        """
+
+        executor = concurrent.futures.ThreadPoolExecutor(workers)
+        pending = dict()
+        try:
+            while stop is None or not stop.is_set():
+                due, wait = self._due(workers * 2 - len(pending))
+                for summoner in due:
+                    pending[executor.submit(loliglio.Spectator.active_games_by_summoner,
+                                            summoner.regionId, summoner.summonerId)] = summoner
+                # Wakes up for the next due check, and at least every second to notice stop and added summoners
+                timeout = 1 if wait is None else min(wait, 1)
+                if not pending:
+                    if stop is not None:
+                        stop.wait(timeout)
+                    else:
+                        time.sleep(timeout)
+                    continue
+                done = concurrent.futures.wait(pending, timeout, concurrent.futures.FIRST_COMPLETED)[0]
+                for future in done:
+                    summoner = pending.pop(future)
+                    error = future.exception()
+                    yield from self._observe(summoner, future.result() if error is None else error)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, callback, workers=8, stop=None):
+        """ blocking loop calling callback(event) for every change, until stop (threading.Event) is set """
+        for event in self.events(workers, stop):
+            callback(event)
+
+    async def aevents(self, concurrency=32, stop=None):
+        """ awaitable counterpart of events, checking through loliglio.aio
+        :param concurrency: number of checks awaited at the same time
+        :param stop: optional asyncio.Event ending the iteration once set
+        :return: async generator of Event
+        """
+
+        from loliglio import aio
+        pending = dict()
+        try:
+            while stop is None or not stop.is_set():
+                due, wait = self._due(concurrency - len(pending))
+                for summoner in due:
+                    task = asyncio.ensure_future(aio.AsyncSpectator.active_games_by_summoner(summoner.regionId, summoner.summonerId))
+                    pending[task] = summoner
+                timeout = 1 if wait is None else min(wait, 1)
+                if not pending:
+                    await asyncio.sleep(timeout)
+                    continue
+                done = (await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED))[0]
+                for task in done:
+                    summoner = pending.pop(task)
+                    error = task.exception()
+                    for event in self._observe(summoner, task.result() if error is None else error):
+                        yield event
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def __aiter__(self):
+        return self.aevents()
@@ -0,0 +1,119 @@
+""" Match-v5 endpoints: matches, match histories and timelines, one at a time or many concurrently """
+from loliglio import clusters, models, routes
+from loliglio.client import api_call, fetch_many, match_cluster, stream_call
+
+
+class Match:
+    """ Returns MatchDto
+    official information at: https://developer.riotgames.com/apis#match-v5
+    """
+
+    @staticmethod
+    def matches(matchId, get_url=False, compact=False):
+        """ Get a match by match id
+        :param matchId: LOL match ID. Syntax contains <Region>_<NumericalSequence> (e.g. 'LA2_1138947703')
+        :param get_url: When true, don't make an API call and returns the url connection
+        :param compact: When true returns a memory-compact models.Match instead of dicts (to_dict() converts it back)
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        clusterId = match_cluster(matchId)
+        url = routes.MATCH.url(clusters[clusterId], matchId)
+        if get_url: return url
+        if compact: return models.Match.from_json(api_call(url))
+        return api_call(url)
+
+    @staticmethod
+    def matches_by_puuid(clusterId, puuid, get_url=False, start=None, count=None, queue=None, type=None, startTime=None, endTime=None):
+        """ Get a list of match ids by puuid, most recent first
+        official parameters at: https://developer.riotgames.com/apis#match-v5/GET_getMatchIdsByPUUID
+        :param clusterId: riot cluster ID. Accepted values: 0-2(inclusive) respective to 'AMERICAS', 'ASIA' & 'EUROPE'
+        :param puuid: Public User ID's are globally unique. Different APIs use different IDs
+        :param get_url: When true, don't make an API call and returns the url connection
+        :param start: Start index of the returned match ids (0 by default)
+        :param count: Number of match ids to return, 0-100 (20 by default)
+        :param queue: Filter the list of match ids by a specific queue id (e.g. 420 for ranked solo/duo)
+        :param type: Filter the list of match ids by the type of match (e.g. 'ranked', 'normal', 'tourney' or 'tutorial')
+        :param startTime: Epoch timestamp in seconds. Only matches played after it are returned
+        :param endTime: Epoch timestamp in seconds. Only matches played before it are returned
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        query = (('start', start), ('count', count), ('queue', queue), ('type', type), ('startTime', startTime), ('endTime', endTime))
+        url = routes.MATCH_IDS_BY_PUUID.url(clusters[clusterId], puuid, query=query)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def iter_matches_by_puuid(clusterId, puuid, queue=None, type=None, startTime=None, endTime=None, stop_at=None, page_size=100):
+        """ Iterates over the whole match history of a puuid, most recent first
+        Pages of page_size ids are only requested when the previous one has been consumed
+        :param clusterId: riot cluster ID. Accepted values: 0-2(inclusive) respective to 'AMERICAS', 'ASIA' & 'EUROPE'
+        :param puuid: Public User ID's are globally unique. Different APIs use different IDs
+        :param queue: Filter the match ids by a specific queue id (e.g. 420 for ranked solo/duo)
+        :param type: Filter the match ids by the type of match (e.g. 'ranked', 'normal', 'tourney' or 'tutorial')
+        :param startTime: Epoch timestamp in seconds. Iteration stops at matches played before it
+        :param endTime: Epoch timestamp in seconds. Iteration starts at matches played before it
+        :param stop_at: LOL match ID already known (e.g. the last one seen by a previous crawl). Iteration stops before it
+        :param page_size: ids requested per call, 1-100 (100 by default)
+        :return: generator of LOL match IDs
+        """
+        start = 0
+        while True:
+            page = Match.matches_by_puuid(clusterId, puuid, start=start, count=page_size, queue=queue, type=type, startTime=startTime, endTime=endTime)
+            for matchId in page:
+                if matchId == stop_at:
+                    return
+                yield matchId
+            if len(page) < page_size:
+                return
+            start += page_size
+
+    @staticmethod
+    def matches_timeline(matchId, get_url=False, compact=False):
+        """ Get a match timeline by match id
+        :param matchId: LOL match ID. Syntax contains <Region>_<NumericalSequence> (e.g. 'LA2_1138947703')
+        :param get_url: When true, don't make an API call and returns the url connection
+        :param compact: When true returns a models.Timeline keeping the frame stats in array columns (to_dict() converts it back)
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        clusterId = match_cluster(matchId)
+        url = routes.MATCH_TIMELINE.url(clusters[clusterId], matchId)
+        if get_url: return url
+        if compact: return models.Timeline.from_json(api_call(url))
+        return api_call(url)
+
+    @staticmethod
+    def iter_timeline(matchId, events=False):
+        """ Streams a match timeline frame by frame (or event by event), decoding it as it is downloaded
+        Memory stays bounded by a single frame instead of the whole multi-megabyte timeline
+        :param matchId: LOL match ID. Syntax contains <Region>_<NumericalSequence> (e.g. 'LA2_1138947703')
+        :param events: when true the events of every frame are yielded one by one instead of the frames
+        :return: generator of FramesTimeLineDto JSON objects (or EventsTimeLineDto when events is True)
+        """
+        path = ('info', 'frames', '*', 'events', '*') if events else ('info', 'frames', '*')
+        return stream_call(Match.matches_timeline(matchId, get_url=True), path)
+
+    @staticmethod
+    def matches_many(matchIds, workers=8, per_cluster=None, ordered=False, compact=False):
+        """ Get many matches by match id, fetched concurrently over a thread pool
+        :param matchIds: iterable of LOL match IDs (e.g. ['LA2_1138947703', 'KR_5739013429'])
+        :param workers: number of threads making calls at the same time
+        :param per_cluster: maximum calls in flight per cluster, workers by default
+        :param ordered: when true results are yielded in input order, otherwise as soon as they complete
+        :param compact: when true matches are returned as models.Match (see Match.matches)
+        :return: generator of (matchId, MatchDto JSON object) tuples. A failed match yields its exception instead
+        """
+        fetch = (lambda matchId: Match.matches(matchId, compact=True)) if compact else Match.matches
+        return fetch_many(fetch, matchIds, workers, per_cluster, ordered)
+
+    @staticmethod
+    def matches_timeline_many(matchIds, workers=8, per_cluster=None, ordered=False, compact=False):
+        """ Get many match timelines by match id, fetched concurrently over a thread pool
+        :param matchIds: iterable of LOL match IDs (e.g. ['LA2_1138947703', 'KR_5739013429'])
+        :param workers: number of threads making calls at the same time
+        :param per_cluster: maximum calls in flight per cluster, workers by default
+        :param ordered: when true results are yielded in input order, otherwise as soon as they complete
+        :param compact: when true timelines are returned as models.Timeline (see Match.matches_timeline)
+        :return: generator of (matchId, timeline JSON object) tuples. A failed match yields its exception instead
+        """
+        fetch = (lambda matchId: Match.matches_timeline(matchId, compact=True)) if compact else Match.matches_timeline
+        return fetch_many(fetch, matchIds, workers, per_cluster, ordered)
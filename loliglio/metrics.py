@@ -0,0 +1,240 @@
+""" Instrumentation of API calls: per host and endpoint metrics plus pre / post request hooks
+Every call made through loliglio.api_call (and loliglio.aio.api_call) is recorded in loliglio.instrumentation:
+network latency and JSON decode time histograms, bytes received (decompressed, and as transferred, compressed
+when the server compressed them), seconds slept in the rate limiter,
+retries, errors and cache hits, grouped by routing host and request template. The totals show where the
+time of a crawl goes, and are exported as a dict or in the Prometheus text format:
+
+    import loliglio
+    loliglio.instrumentation.add_hook(after=lambda call: print(call.method, call.status, call.network))
+    ...
+    print(loliglio.instrumentation.snapshot())
+    open('loliglio.prom', 'w').write(loliglio.instrumentation.prometheus())
+"""
+import bisect
+import threading
+import time
+
+
+# Upper bounds in seconds, the last bucket (+Inf) is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DECODE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+class Call:
+    """ One API call as seen by the hooks. Post request hooks receive it with every field filled
+    """
+
+    def __init__(self, url, host, method):
+        """
+        :param url: url of the call
+        :param host: routing host (see loliglio.method_of)
+        :param method: request template (see loliglio.method_of)
+        """
+
+        self.url = url
+        self.host = host
+        self.method = method
+        self.started = time.perf_counter()
+        # None for calls that missed or skipped the cache, 'fresh' or 'revalidated' otherwise
+        self.cached = None
+        self.status = None
+        self.retries = 0
+        self.slept = 0.0
+        self.network = 0.0
+        # Body bytes after decompression, and as sent by the server
+        self.received = 0
+        self.transferred = 0
+        self.decode = 0.0
+        self.error = None
+        self.elapsed = None
+
+class Histogram:
+    """ Cumulative histogram with fixed bucket upper bounds, as Prometheus exposes them """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """ :return: list of (upper bound, observations <= upper bound), the last bound being float('inf') """
+        total = 0
+        result = list()
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def as_dict(self):
+        return {'count': self.count, 'sum': self.sum,
+                'buckets': {('+Inf' if bound == float('inf') else bound): count for bound, count in self.cumulative()}}
+
+class Series:
+    """ Totals of a (host, request template) pair """
+
+    def __init__(self, latency_buckets, decode_buckets):
+        self.calls = 0
+        self.errors = dict()
+        self.retries = 0
+        self.received = 0
+        self.transferred = 0
+        self.slept = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.latency = Histogram(latency_buckets)
+        self.decode = Histogram(decode_buckets)
+
+    def as_dict(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {'calls': self.calls, 'errors': dict(self.errors), 'retries': self.retries,
+                'bytes_received': self.received, 'bytes_transferred': self.transferred,
+                'compression_ratio': self.received / self.transferred if self.transferred else None,
+                'ratelimit_sleep_seconds': self.slept,
+                'cache_hits': self.cache_hits, 'cache_misses': self.cache_misses,
+                'cache_hit_ratio': self.cache_hits / lookups if lookups else None,
+                'latency_seconds': self.latency.as_dict(), 'decode_seconds': self.decode.as_dict()}
+
+class Metrics:
+    """ Thread-safe registry of call metrics per (host, request template), with pre and post request hooks
+    """
+
+    def __init__(self, latency_buckets=LATENCY_BUCKETS, decode_buckets=DECODE_BUCKETS):
+        """
+        :param latency_buckets: upper bounds in seconds of the network latency histograms
+        :param decode_buckets: upper bounds in seconds of the JSON decode time histograms
+        """
+
+        self.latency_buckets = tuple(latency_buckets)
+        self.decode_buckets = tuple(decode_buckets)
+        self._lock = threading.Lock()
+        self._series = dict()
+        self._before = list()
+        self._after = list()
+
+    def add_hook(self, before=None, after=None):
+        """ registers functions called around every API call, with the Call being made as only argument
+        Hooks run on the calling thread (or event loop) and should return quickly. Exceptions they raise
+        propagate to the API call.
+        :param before: called once before the first attempt, only url, host and method are filled
+        :param after: called once the call succeeded or failed, with every field filled
+        """
+
+        with self._lock:
+            if before is not None:
+                self._before = self._before + [before]
+            if after is not None:
+                self._after = self._after + [after]
+
+    def remove_hook(self, before=None, after=None):
+        """ unregisters hooks added with add_hook """
+        with self._lock:
+            self._before = [hook for hook in self._before if hook is not before]
+            self._after = [hook for hook in self._after if hook is not after]
+
+    def start(self, url, host, method):
+        """ :return: Call recording an API call about to be made, after running the pre request hooks """
+        call = Call(url, host, method)
+        for hook in self._before:
+            hook(call)
+        return call
+
+    def finish(self, call, error=None):
+        """ records a finished call and runs the post request hooks
+        :param call: Call returned by start, filled by the caller
+        :param error: exception that ended the call, None when it succeeded
+        """
+
+        call.error = error
+        call.elapsed = time.perf_counter() - call.started
+        key = (call.host, call.method)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = Series(self.latency_buckets, self.decode_buckets)
+            series.calls += 1
+            series.retries += call.retries
+            series.received += call.received
+            series.transferred += call.transferred
+            series.slept += call.slept
+            if error is not None:
+                name = type(error).__name__
+                series.errors[name] = series.errors.get(name, 0) + 1
+            if call.cached is not None:
+                series.cache_hits += 1
+            else:
+                series.cache_misses += 1
+            if call.cached != 'fresh' and error is None:
+                series.latency.observe(call.network)
+            if error is None:
+                series.decode.observe(call.decode)
+        for hook in self._after:
+            hook(call)
+
+    def reset(self):
+        """ forgets every recorded metric, hooks are kept """
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self):
+        """ :return: dict of {host: {request template: metrics dict}} """
+        result = dict()
+        with self._lock:
+            for (host, method), series in self._series.items():
+                result.setdefault(host, dict())[method] = series.as_dict()
+        return result
+
+    def prometheus(self):
+        """ :return: every metric in the Prometheus text exposition format """
+        with self._lock:
+            series = sorted(self._series.items())
+            lines = list()
+
+            def family(name, kind, description, samples):
+                lines.append('# HELP ' + name + ' ' + description)
+                lines.append('# TYPE ' + name + ' ' + kind)
+                for (host, method), value in series:
+                    for suffix, extra, number in samples(value):
+                        lines.append(name + suffix + _labels(host, method, extra) + ' ' + _number(number))
+
+            family('loliglio_requests_total', 'counter', 'API calls made',
+                   lambda s: [('', (), s.calls)])
+            family('loliglio_errors_total', 'counter', 'API calls that raised, by error class',
+                   lambda s: [('', (('error', name),), count) for name, count in sorted(s.errors.items())])
+            family('loliglio_retries_total', 'counter', 'Attempts retried after a failure',
+                   lambda s: [('', (), s.retries)])
+            family('loliglio_received_bytes_total', 'counter', 'Response body bytes received, after decompression',
+                   lambda s: [('', (), s.received)])
+            family('loliglio_transferred_bytes_total', 'counter', 'Response body bytes as sent by the server, compressed or not',
+                   lambda s: [('', (), s.transferred)])
+            family('loliglio_ratelimit_sleep_seconds_total', 'counter', 'Seconds spent waiting for the rate limiter',
+                   lambda s: [('', (), s.slept)])
+            family('loliglio_cache_hits_total', 'counter', 'Calls answered by the response cache (fresh or revalidated)',
+                   lambda s: [('', (), s.cache_hits)])
+            family('loliglio_cache_misses_total', 'counter', 'Calls not answered by the response cache',
+                   lambda s: [('', (), s.cache_misses)])
+            family('loliglio_request_duration_seconds', 'histogram', 'Network time of API calls',
+                   lambda s: _histogram(s.latency))
+            family('loliglio_decode_duration_seconds', 'histogram', 'JSON decode time of API responses',
+                   lambda s: _histogram(s.decode))
+        return '\n'.join(lines) + '\n'
+
+def _histogram(histogram):
+    samples = [('_bucket', (('le', '+Inf' if bound == float('inf') else _number(bound)),), count)
+               for bound, count in histogram.cumulative()]
+    return samples + [('_sum', (), histogram.sum), ('_count', (), histogram.count)]
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(host, method, extra=()):
+    pairs = (('host', host), ('method', method)) + tuple(extra)
+    return '{' + ','.join(name + '="' + _escape(value) + '"' for name, value in pairs) + '}'
+
+def _number(value):
+    return repr(value) if isinstance(value, float) else str(value)
@@ -0,0 +1,303 @@
+""" Compact representations of MatchDto and timeline payloads
+JSON objects decode into dicts, each carrying its own hash table of key strings. Holding many matches that
+way spends most of the memory on dict overhead, so Match.matches(..., compact=True) and
+Match.matches_timeline(..., compact=True) return these models instead:
+
+- Record (and its Participant and Team kinds) is a __slots__ object holding a tuple of values plus a Schema
+  of its keys, shared by every record with the same keys, so a participant costs one tuple.
+- Timeline keeps the per-frame participant stats (gold, xp, level, position, championStats, ...) in
+  array columns of machine integers instead of one dict per participant per frame.
+
+Both read like the JSON they come from (match['info']['participants'][0]['kills'], or as attributes:
+match.info.participants[0].kills) and to_dict() rebuilds the plain JSON object when needed.
+"""
+import array
+import sys
+import threading
+
+
+MAX_SCHEMAS = 4096
+# Shorter strings (positions, champion names, game modes, ...) repeat across matches and are shared
+INTERN_LENGTH = 24
+
+class Schema:
+    """ Keys of a record and their positions, shared by every record with the same keys """
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = {key: position for position, key in enumerate(keys)}
+
+_schemas = dict()
+_schemas_lock = threading.Lock()
+
+def schema(keys):
+    """ :return: the shared Schema of a tuple of keys """
+    found = _schemas.get(keys)
+    if found is None:
+        found = Schema(keys)
+        with _schemas_lock:
+            if len(_schemas) < MAX_SCHEMAS:
+                found = _schemas.setdefault(keys, found)
+    return found
+
+def compact(value, kind=None):
+    """ converts a decoded JSON value: dicts become Record (or kind), lists become tuples, short strings are interned
+    :param value: JSON value
+    :param kind: Record subclass used for value itself when it is a dict
+    :return: compact value
+    """
+
+    if type(value) is dict:
+        return (kind or Record).from_dict(value)
+    if type(value) is list:
+        return tuple(compact(item) for item in value)
+    if type(value) is str and len(value) <= INTERN_LENGTH:
+        return sys.intern(value)
+    return value
+
+def expand(value):
+    """ :return: value converted back to plain JSON types, the inverse of compact """
+    if isinstance(value, (Record, Timeline)):
+        return value.to_dict()
+    if isinstance(value, Frames):
+        return list(value)
+    if type(value) is tuple:
+        return [expand(item) for item in value]
+    return value
+
+class Record:
+    """ Read-only JSON object stored as a tuple of values and a shared Schema
+    Supports record['key'], record.key, record.get('key'), 'key' in record, iteration over keys and to_dict().
+    """
+
+    __slots__ = ('_schema', '_values')
+
+    def __init__(self, keys, values):
+        """
+        :param keys: Schema of the record
+        :param values: tuple of compact values, in the order of the schema keys
+        """
+
+        self._schema = keys
+        self._values = values
+
+    @classmethod
+    def from_dict(cls, data):
+        """ :return: record of a JSON object, its nested objects and arrays compacted as well """
+        return cls(schema(tuple(data)), tuple(compact(value) for value in data.values()))
+
+    def __getattr__(self, name):
+        # Slots that aren't set yet (e.g. while unpickling) must not be looked up in the schema
+        if name.startswith('__') or name in Record.__slots__:
+            raise AttributeError(name)
+        try:
+            return self._values[self._schema.index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, key):
+        return self._values[self._schema.index[key]]
+
+    def get(self, key, default=None):
+        position = self._schema.index.get(key)
+        return default if position is None else self._values[position]
+
+    def keys(self):
+        return self._schema.keys
+
+    def values(self):
+        return self._values
+
+    def items(self):
+        return zip(self._schema.keys, self._values)
+
+    def __contains__(self, key):
+        return key in self._schema.index
+
+    def __iter__(self):
+        return iter(self._schema.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self._schema.keys == other._schema.keys and self._values == other._values
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def to_dict(self):
+        """ :return: the plain JSON object the record was built from """
+        return {key: expand(value) for key, value in zip(self._schema.keys, self._values)}
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + ', '.join(key + '=' + repr(value) for key, value in self.items()) + ')'
+
+class Participant(Record):
+    """ ParticipantDto of a match """
+    __slots__ = ()
+
+class Team(Record):
+    """ TeamDto of a match """
+    __slots__ = ()
+
+class Match(Record):
+    """ MatchDto, with its info.participants as Participant and info.teams as Team records """
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, data):
+        """ :return: compact Match of a MatchDto JSON object """
+        info = dict(data.get('info', ()))
+        if 'participants' in info:
+            info['participants'] = tuple(compact(participant, Participant) for participant in info['participants'])
+        if 'teams' in info:
+            info['teams'] = tuple(compact(team, Team) for team in info['teams'])
+        data = dict(data)
+        data['info'] = Record.from_dict(info)
+        return cls.from_dict(data)
+
+class Frames:
+    """ Frames of a Timeline as a read-only sequence, each FramesTimeLineDto built from the columns when read
+    """
+
+    __slots__ = ('_timeline',)
+
+    def __init__(self, timeline):
+        self._timeline = timeline
+
+    def __len__(self):
+        return len(self._timeline)
+
+    def __getitem__(self, number):
+        if isinstance(number, slice):
+            return [self._timeline.frame(position) for position in range(*number.indices(len(self)))]
+        if number < 0:
+            number += len(self)
+        if not 0 <= number < len(self):
+            raise IndexError('frame index out of range')
+        return self._timeline.frame(number)
+
+    def __iter__(self):
+        return (self._timeline.frame(number) for number in range(len(self)))
+
+    def __repr__(self):
+        return 'Frames(' + str(len(self)) + ')'
+
+def _flatten(data, prefix, numbers, others):
+    # Nested objects (position, championStats, damageStats) become dotted column names
+    for key, value in data.items():
+        if type(value) is dict:
+            _flatten(value, prefix + key + '.', numbers, others)
+        elif type(value) in (int, float):
+            numbers[prefix + key] = value
+        else:
+            others[prefix + key] = value
+
+def _nest(flat):
+    result = dict()
+    for name, value in flat.items():
+        *parents, key = name.split('.')
+        target = result
+        for parent in parents:
+            target = target.setdefault(parent, dict())
+        target[key] = value
+    return result
+
+class Timeline:
+    """ Match timeline with participant frame stats stored in array columns
+    Column names are the participantFrames keys, nested ones dotted (e.g. 'totalGold', 'position.x',
+    'championStats.armor'). A column holds one value per frame and participant, frame after frame, in the
+    order of participant_ids. Stats missing from a participant frame read as 0.
+    """
+
+    __slots__ = ('metadata', '_frameless', 'timestamps', 'participant_ids', 'columns', 'events', 'others', '_info')
+
+    def __init__(self, metadata, info, timestamps, participant_ids, columns, events, others):
+        """
+        :param info: Record of the timeline info without its frames, which are kept in the other arguments
+        """
+
+        self.metadata = metadata
+        self._frameless = info
+        self.timestamps = timestamps
+        self.participant_ids = participant_ids
+        self.columns = columns
+        self.events = events
+        self.others = others
+        self._info = None
+
+    @classmethod
+    def from_json(cls, data):
+        """ :return: compact Timeline of a match timeline JSON object """
+        info = dict(data.get('info', ()))
+        frames = info.pop('frames', ())
+        participant_ids = tuple(sorted(frames[0]['participantFrames'], key=int)) if frames else ()
+        values = dict()
+        others = dict()
+        slots = len(frames) * len(participant_ids)
+        for number, frame in enumerate(frames):
+            participant_frames = frame.get('participantFrames', {})
+            for position, participantId in enumerate(participant_ids):
+                numbers, rest = dict(), dict()
+                _flatten(participant_frames.get(participantId, {}), '', numbers, rest)
+                index = number * len(participant_ids) + position
+                for name, value in numbers.items():
+                    column = values.get(name)
+                    if column is None:
+                        column = values[name] = [0] * slots
+                    column[index] = value
+                if rest:
+                    others[(number, participantId)] = rest
+        columns = dict()
+        for name, column in values.items():
+            try:
+                columns[name] = array.array('q', column)
+            except TypeError:
+                columns[name] = array.array('d', column)
+        return cls(compact(data.get('metadata', {})), compact(info),
+                   array.array('q', (frame.get('timestamp', 0) for frame in frames)), participant_ids, columns,
+                   tuple(compact(frame.get('events', [])) for frame in frames), others)
+
+    def __len__(self):
+        """ :return: number of frames """
+        return len(self.timestamps)
+
+    def stat(self, name, participantId):
+        """ :return: array with the value of column name for participantId at every frame (e.g. stat('totalGold', 3)) """
+        step = len(self.participant_ids)
+        return self.columns[name][self.participant_ids.index(str(participantId))::step]
+
+    def frame(self, number):
+        """ :return: FramesTimeLineDto JSON object of frame number """
+        participant_frames = dict()
+        step = len(self.participant_ids)
+        for position, participantId in enumerate(self.participant_ids):
+            flat = {name: column[number * step + position] for name, column in self.columns.items()}
+            flat.update(self.others.get((number, participantId), ()))
+            participant_frames[participantId] = _nest(flat)
+        return {'events': expand(self.events[number]), 'participantFrames': participant_frames,
+                'timestamp': self.timestamps[number]}
+
+    @property
+    def info(self):
+        """ Record of the timeline info with its frames, built once. Frames are only rebuilt from the columns when read """
+        info = self._info
+        if info is None:
+            frameless = self._frameless
+            info = self._info = Record(schema(frameless.keys() + ('frames',)), frameless.values() + (Frames(self),))
+        return info
+
+    def __getitem__(self, key):
+        if key == 'metadata':
+            return self.metadata
+        if key == 'info':
+            return self.info
+        raise KeyError(key)
+
+    def to_dict(self):
+        """ :return: the plain timeline JSON object, rebuilt from the columns """
+        return {'metadata': expand(self.metadata), 'info': self.info.to_dict()}
@@ -0,0 +1,325 @@
+""" Header-driven rate limiter for the Riot API
+Riot enforces an application limit per routing value (host) and a method limit per endpoint and host.
+Both are reported on every response through the X-App-Rate-Limit and X-Method-Rate-Limit headers,
+e.g. '20:1,100:120' meaning 20 calls per second and 100 calls every 120 seconds.
+The limiter keeps one bucket per (limit, interval) pair, learns their sizes from those headers and only
+waits the time remaining until the exhausted window frees up, so a busy host never stalls the others.
+"""
+import contextlib
+import hashlib
+import itertools
+import json
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+_GENERATION = struct.Struct('<Q')
+
+# Development key limits, used for a host until its own headers are learned
+DEFAULT_APP_LIMITS = ((20, 1), (100, 120))
+
+def parse_limits(header):
+    """ translates a rate limit header into (limit, interval) pairs
+    :param header: header value like '20:1,100:120' (X-App-Rate-Limit) or '1:1,1:120' (X-App-Rate-Limit-Count)
+    :return: tuple of (int, int) pairs, empty when the header is missing or malformed
+    """
+
+    if not header:
+        return tuple()
+    pairs = list()
+    for item in header.split(','):
+        try:
+            limit, interval = item.split(':')
+            pairs.append((int(limit), int(interval)))
+        except ValueError:
+            continue
+    return tuple(pairs)
+
+class Bucket:
+    """ Allows up to limit calls in a window of interval seconds that starts with its first call
+    """
+
+    def __init__(self, limit, interval):
+        self.limit = limit
+        self.interval = interval
+        self.used = 0
+        self.start = None
+
+    def _roll(self, now):
+        if self.start is None or now >= self.start + self.interval:
+            self.start = now
+            self.used = 0
+
+    @classmethod
+    def restore(cls, limit, interval, used, start):
+        """ :return: bucket rebuilt from the values of dump() """
+        bucket = cls(limit, interval)
+        bucket.used = used
+        bucket.start = start
+        return bucket
+
+    def dump(self):
+        """ :return: list of the bucket state (limit, interval, used, start) """
+        return [self.limit, self.interval, self.used, self.start]
+
+    def wait(self, now, keep=0):
+        """ :return: seconds until a call fits in this bucket, 0 when it fits right away
+        :param keep: fraction of the limit left unused for other calls, e.g. 0.2 only allows 80% of it
+        """
+
+        if self.start is None or now >= self.start + self.interval or self.used < self.limit - int(self.limit * keep):
+            return 0
+        return self.start + self.interval - now
+
+    def take(self, now):
+        """ consumes one call, wait(now) must have returned 0 """
+        self._roll(now)
+        self.used += 1
+
+    def sync(self, count, now):
+        """ aligns the local usage with the count reported by the server
+        :param count: calls the server has already counted in the current window
+        """
+
+        self._roll(now)
+        if count > self.used:
+            self.used = count
+
+class RateLimiter:
+    """ Thread-safe set of application buckets per host and method buckets per (host, method)
+    Buckets are kept per api key as well (see KeyPool): Riot counts every key separately.
+    """
+
+    def __init__(self, default_app_limits=DEFAULT_APP_LIMITS):
+        """
+        :param default_app_limits: (limit, interval) pairs assumed for a host until its headers are known
+        """
+
+        self.default_app_limits = tuple(default_app_limits)
+        self._lock = threading.Lock()
+        self._app = dict()
+        self._method = dict()
+        self._blocked = dict()
+
+    # Time source of the bucket windows
+    clock = staticmethod(time.monotonic)
+
+    @contextlib.contextmanager
+    def _state(self):
+        """ holds the buckets for reading and updating them """
+        with self._lock:
+            yield
+
+    def _app_buckets(self, key, host):
+        buckets = self._app.get((key, host))
+        if buckets is None:
+            buckets = self._app[(key, host)] = [Bucket(limit, interval) for limit, interval in self.default_app_limits]
+        return buckets
+
+    def grant(self, host, method, keep=0, keys=(None,)):
+        """ takes a call from the buckets of the first key whose buckets all allow it, without blocking
+        :param host: routing host of the call (e.g. 'la2.api.riotgames.com')
+        :param method: endpoint template of the call (e.g. '/lol/match/v5/matches/{matchId}')
+        :param keep: fraction of every bucket the call must leave unused (budget reserved for higher priority calls)
+        :param keys: IDs of the api keys the call may be sent with, in order of preference (see KeyPool)
+        :return: tuple of 0 and the key ID granted, otherwise the seconds to wait before trying again and None
+        """
+
+        with self._state():
+            now = self.clock()
+            shortest = None
+            for key in keys:
+                buckets = self._app_buckets(key, host) + self._method.get((key, host, method), list())
+                delay = max(self._blocked.get((key, host), 0), self._blocked.get((key, host, method), 0)) - now
+                for bucket in buckets:
+                    delay = max(delay, bucket.wait(now, keep))
+                if delay <= 0:
+                    for bucket in buckets:
+                        bucket.take(now)
+                    return 0, key
+                shortest = delay if shortest is None else min(shortest, delay)
+            return shortest, None
+
+    def reserve(self, host, method, keep=0, key=None):
+        """ takes a call from every bucket of host and method if they all allow it, without blocking
+        :param keep: fraction of every bucket the call must leave unused (see grant)
+        :param key: ID of the api key the call is sent with
+        :return: 0 when the call was granted, otherwise the seconds to wait before trying again
+        """
+
+        return self.grant(host, method, keep, (key,))[0]
+
+    def acquire(self, host, method, key=None):
+        """ blocks until a call to method on host is allowed and takes it
+        :return: total seconds spent sleeping
+        """
+
+        slept = 0
+        delay = self.reserve(host, method, key=key)
+        while delay > 0:
+            time.sleep(delay)
+            slept += delay
+            delay = self.reserve(host, method, key=key)
+        return slept
+
+    @staticmethod
+    def _resize(buckets, limits):
+        current = {(bucket.limit, bucket.interval): bucket for bucket in buckets}
+        if set(current) == set(limits):
+            return buckets
+        resized = list()
+        for limit, interval in limits:
+            bucket = current.get((limit, interval))
+            if bucket is None:
+                bucket = Bucket(limit, interval)
+            resized.append(bucket)
+        return resized
+
+    def update(self, host, method, headers, key=None):
+        """ learns bucket sizes and server-side counts from the rate limit headers of a response
+        :param headers: response headers (any mapping with .get)
+        :param key: ID of the api key the call was sent with
+        """
+
+        with self._state():
+            now = self.clock()
+            app_limits = parse_limits(headers.get('X-App-Rate-Limit'))
+            if app_limits:
+                self._app[(key, host)] = self._resize(self._app_buckets(key, host), app_limits)
+            method_limits = parse_limits(headers.get('X-Method-Rate-Limit'))
+            if method_limits:
+                self._method[(key, host, method)] = self._resize(self._method.get((key, host, method), list()), method_limits)
+
+            for buckets, header in ((self._app.get((key, host)), 'X-App-Rate-Limit-Count'),
+                                    (self._method.get((key, host, method)), 'X-Method-Rate-Limit-Count')):
+                if not buckets:
+                    continue
+                counts = dict((interval, count) for count, interval in parse_limits(headers.get(header)))
+                for bucket in buckets:
+                    if bucket.interval in counts:
+                        bucket.sync(counts[bucket.interval], now)
+
+    def backoff(self, host, method, headers, default=1, key=None):
+        """ blocks host (application limit) or only its method after a 429 response
+        :param headers: headers of the 429 response, Retry-After and X-Rate-Limit-Type are honoured
+        :param default: seconds to wait when the response has no Retry-After header
+        :param key: ID of the api key the call was sent with, other keys aren't blocked
+        :return: seconds the host or method is blocked for
+        """
+
+        try:
+            retry_after = float(headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            retry_after = default
+        # 'method' and 'service' limits only concern this endpoint, anything else blocks the whole host
+        blocked = (key, host, method) if headers.get('X-Rate-Limit-Type') in ('method', 'service') else (key, host)
+        with self._state():
+            until = self.clock() + retry_after
+            if until > self._blocked.get(blocked, 0):
+                self._blocked[blocked] = until
+        return retry_after
+
+class SharedRateLimiter(RateLimiter):
+    """ RateLimiter whose buckets live in a file shared by every process using it (POSIX only)
+    Each process works on its own copy of the buckets, reloaded from the file under an exclusive lock
+    (fcntl.flock) whenever another process wrote it since, and written back before the lock is released.
+    N worker processes on one key then share its limits instead of each assuming it has all of them.
+
+        loliglio.limiter = ratelimit.SharedRateLimiter('/tmp/loliglio.limits')    # in every worker process
+    """
+
+    # Windows must be comparable between processes, monotonic clocks don't have to be
+    clock = staticmethod(time.time)
+
+    def __init__(self, path, default_app_limits=DEFAULT_APP_LIMITS):
+        """
+        :param path: state file, created when missing. Processes sharing the same limits must use the same path
+        :param default_app_limits: (limit, interval) pairs assumed for a host until its headers are known
+        """
+
+        if fcntl is None:
+            raise OSError('SharedRateLimiter needs fcntl file locks, which this platform lacks')
+        super().__init__(default_app_limits)
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._generation = None
+
+    @contextlib.contextmanager
+    def _state(self):
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                self._load()
+                yield
+                self._store()
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _load(self):
+        # The file starts with a write counter: an unchanged one means the copy in memory is current
+        header = os.pread(self._fd, _GENERATION.size, 0)
+        generation = _GENERATION.unpack(header)[0] if len(header) == _GENERATION.size else 0
+        if generation == self._generation:
+            return
+        size = os.fstat(self._fd).st_size
+        try:
+            state = json.loads(os.pread(self._fd, size - _GENERATION.size, _GENERATION.size)) if generation else dict()
+        except ValueError:
+            # A process killed while writing leaves a truncated file, the limits are learned again
+            state = dict()
+        self._app = {tuple(name): [Bucket.restore(*bucket) for bucket in buckets] for name, buckets in state.get('app', ())}
+        self._method = {tuple(name): [Bucket.restore(*bucket) for bucket in buckets] for name, buckets in state.get('method', ())}
+        self._blocked = {tuple(name): until for name, until in state.get('blocked', ())}
+        self._generation = generation
+
+    def _store(self):
+        now = self.clock()
+        state = {'app': [[name, [bucket.dump() for bucket in buckets]] for name, buckets in self._app.items()],
+                 'method': [[name, [bucket.dump() for bucket in buckets]] for name, buckets in self._method.items()],
+                 # Expired blocks are dropped so the file doesn't grow
+                 'blocked': [[name, until] for name, until in self._blocked.items() if until > now]}
+        data = json.dumps(state, separators=(',', ':')).encode()
+        self._generation = (self._generation or 0) + 1
+        os.pwrite(self._fd, _GENERATION.pack(self._generation) + data, 0)
+        os.ftruncate(self._fd, _GENERATION.size + len(data))
+
+    def close(self):
+        """ closes the state file, the limiter can't be used afterwards """
+        os.close(self._fd)
+
+class KeyPool:
+    """ Several api keys, each with its own rate limit budget, calls being spread over them
+    The limiter only sees key IDs (a hash of each key), so SharedRateLimiter files never hold the keys.
+
+        loliglio.api_keys = ratelimit.KeyPool(['RGAPI-...', 'RGAPI-...'])
+    """
+
+    def __init__(self, keys):
+        """
+        :param keys: iterable of riot api keys
+        """
+
+        self._keys = {hashlib.sha256(key.encode()).hexdigest()[:16]: key for key in keys}
+        if not self._keys:
+            raise ValueError('KeyPool needs at least one api key')
+        self.ids = tuple(self._keys)
+        self._turn = itertools.count()
+
+    def key(self, keyId):
+        """ :return: the api key of a key ID """
+        return self._keys[keyId]
+
+    def order(self):
+        """ :return: tuple of every key ID, starting from the next one in turn, so consecutive calls use different keys """
+        start = next(self._turn) % len(self.ids)
+        return self.ids[start:] + self.ids[:start]
+
+    def __len__(self):
+        return len(self.ids)
@@ -0,0 +1,180 @@
+""" Route table of every Riot API and DataDragon request
+Each request template is parsed once, at import, into its literal pieces and attribute names, so building a
+url is a single join of quoted attributes instead of rebuilding and .replace()-ing a template per call. The
+urls built carry no api key (it is sent as the X-Riot-Token header by loliglio.api_call), which makes them
+stable keys for caching, coalescing and metrics. The same table maps a url back to its template.
+
+    from loliglio import routes
+    routes.MATCH.url('AMERICAS', 'LA2_1138947703')
+    'https://AMERICAS.api.riotgames.com/lol/match/v5/matches/LA2_1138947703'
+"""
+import re
+import urllib.parse
+
+
+RIOT_HOST = 'https://{}.api.riotgames.com'
+
+_placeholder = re.compile(r'\{(\w+)\}')
+_unreserved = re.compile(r'[A-Za-z0-9_.~-]*').fullmatch
+
+def quote(attribute):
+    """ translate non-alphabetic chars and 'spaces' to a URL applicable path segment
+    :param attribute: text string or number that may contain not url compatible chars (e.g. ' 무작위의')
+    :return: text string with riot API compatible url encoding (e.g. %20%EB%AC%B4%EC%9E%91%EC%9C%84%EC%9D%98)
+    """
+
+    attribute = attribute if type(attribute) is str else str(attribute)
+    # IDs and most names need no escaping, which is much cheaper to check than to quote
+    if _unreserved(attribute):
+        return attribute
+    return urllib.parse.quote(attribute, safe='')
+
+def query_string(parameters):
+    """ :param parameters: iterable of (name, value) pairs, the ones whose value is None are left out
+    :return: '?name=value&...' or '' when there is no parameter left
+    """
+
+    query = '&'.join(name + '=' + quote(value) for name, value in parameters if value is not None)
+    return '?' + query if query else ''
+
+class Route:
+    """ A request template precompiled into the pieces its urls are joined from
+    """
+
+    def __init__(self, template, host=RIOT_HOST):
+        """
+        :param template: request path with {attributes} placeholders (e.g. '/lol/match/v5/matches/{matchId}')
+        :param host: scheme and host of the request, a '{}' in it is replaced by the region or cluster
+        """
+
+        self.template = template
+        self.host = host
+        self.attributes = tuple(_placeholder.findall(template))
+        self.pieces = tuple(_placeholder.split(template)[::2])
+        self.pattern = '[^/]+'.join(re.escape(piece) for piece in self.pieces)
+        self._parser = None
+        self._hosts = dict()
+
+    def base(self, location=None):
+        """ :return: scheme and host serving location (a region or cluster name), cached per location """
+        base = self._hosts.get(location)
+        if base is None:
+            base = self._hosts[location] = self.host.format(location)
+        return base
+
+    def path(self, *attributes):
+        """ :return: the template filled with attributes, quoted as path segments, in placeholder order """
+        pieces = self.pieces
+        if len(attributes) != len(self.attributes):
+            raise TypeError(self.template + ' takes ' + str(len(self.attributes)) + ' attributes, ' + str(len(attributes)) + ' given')
+        if not attributes:
+            return pieces[0]
+        parts = [pieces[0]]
+        for attribute, piece in zip(attributes, pieces[1:]):
+            parts.append(quote(attribute))
+            parts.append(piece)
+        return ''.join(parts)
+
+    def url(self, location, *attributes, query=()):
+        """ builds the url of a call
+        :param location: region or cluster name placed in the host (e.g. 'LA2', 'AMERICAS'), ignored by fixed hosts
+        :param attributes: values of the template placeholders, in order
+        :param query: optional (name, value) pairs of query parameters, None values are left out
+        :return: url without api key
+        """
+
+        return self.base(location) + self.path(*attributes) + (query_string(query) if query else '')
+
+    def parse(self, path):
+        """ reads the attributes back from a url path built from this template
+        :param path: url path, without the query string
+        :return: tuple of the unquoted attribute values in placeholder order, None when path doesn't match
+        """
+
+        if self._parser is None:
+            self._parser = re.compile('([^/]+)'.join(re.escape(piece) for piece in self.pieces) + '$')
+        found = self._parser.match(path)
+        if found is None:
+            return None
+        return tuple(urllib.parse.unquote(value) for value in found.groups())
+
+    def __repr__(self):
+        return 'Route(' + repr(self.template) + ')'
+
+class RouteTable:
+    """ Request templates by path, with a single compiled expression matching urls back to their template
+    """
+
+    def __init__(self, routes=()):
+        self.routes = dict()
+        self._matcher = None
+        for route in routes:
+            self.add(route)
+
+    def add(self, route):
+        """ :param route: Route or request template, registered once
+        :return: the registered Route of that template
+        """
+
+        if not isinstance(route, Route):
+            route = self.routes.get(route) or Route(route)
+        self.routes.setdefault(route.template, route)
+        self._matcher = None
+        return self.routes[route.template]
+
+    def match(self, path):
+        """ :return: Route a url path was built from, None when it doesn't match any template """
+        matcher = self._matcher
+        if matcher is None:
+            routes = list(self.routes.values())
+            # One alternative per template: the index of the group that matched is the index of the route
+            expression = re.compile('|'.join('(' + route.pattern + ')$' for route in routes))
+            matcher = self._matcher = (expression, routes)
+        expression, routes = matcher
+        found = expression.match(path)
+        if found is None:
+            return None
+        return routes[found.lastindex - 1]
+
+    def __contains__(self, template):
+        return template in self.routes
+
+    def __iter__(self):
+        return iter(self.routes.values())
+
+# Riot API
+ACCOUNT_BY_PUUID = Route('/riot/account/v1/accounts/by-puuid/{puuid}')
+ACCOUNT_BY_RIOT_ID = Route('/riot/account/v1/accounts/by-riot-id/{gameName}/{tagLine}')
+MASTERIES_BY_SUMMONER = Route('/lol/champion-mastery/v4/champion-masteries/by-summoner/{encryptedSummonerId}')
+MASTERY_BY_SUMMONER_CHAMPION = Route('/lol/champion-mastery/v4/champion-masteries/by-summoner/{encryptedSummonerId}/by-champion/{championId}')
+MASTERY_SCORE_BY_SUMMONER = Route('/lol/champion-mastery/v4/scores/by-summoner/{encryptedSummonerId}')
+CHAMPION_ROTATIONS = Route('/lol/platform/v3/champion-rotations')
+CLASH_PLAYERS_BY_SUMMONER = Route('/lol/clash/v1/players/by-summoner/{summonerId}')
+CLASH_TEAMS = Route('/lol/clash/v1/teams/{teamId}')
+CLASH_TOURNAMENTS = Route('/lol/clash/v1/tournaments')
+CLASH_TOURNAMENT_BY_TEAM = Route('/lol/clash/v1/tournaments/by-team/{teamId}')
+CLASH_TOURNAMENT = Route('/lol/clash/v1/tournaments/{tournamentId}')
+LEAGUE_EXP_ENTRIES = Route('/lol/league-exp/v4/entries/{queue}/{tier}/{division}')
+LEAGUE_CHALLENGER = Route('/lol/league/v4/challengerleagues/by-queue/{queue}')
+LEAGUE_MASTER = Route('/lol/league/v4/masterleagues/by-queue/{queue}')
+LEAGUE_GRANDMASTER = Route('/lol/league/v4/grandmasterleagues/by-queue/{queue}')
+LEAGUE_ENTRIES_BY_SUMMONER = Route('/lol/league/v4/entries/by-summoner/{encryptedSummonerId}')
+LEAGUE_ENTRIES = Route('/lol/league/v4/entries/{queue}/{tier}/{division}')
+LEAGUE = Route('/lol/league/v4/leagues/{leagueId}')
+STATUS_V3 = Route('/lol/status/v3/shard-data')
+STATUS_V4 = Route('/lol/status/v4/platform-data')
+MATCH = Route('/lol/match/v5/matches/{matchId}')
+MATCH_IDS_BY_PUUID = Route('/lol/match/v5/matches/by-puuid/{puuid}/ids')
+MATCH_TIMELINE = Route('/lol/match/v5/matches/{matchId}/timeline')
+ACTIVE_GAME = Route('/lol/spectator/v4/active-games/by-summoner/{encryptedSummonerId}')
+FEATURED_GAMES = Route('/lol/spectator/v4/featured-games')
+SUMMONER_BY_ACCOUNT = Route('/lol/summoner/v4/summoners/by-account/{encryptedAccountId}')
+SUMMONER_BY_NAME = Route('/lol/summoner/v4/summoners/by-name/{summonerName}')
+SUMMONER_BY_PUUID = Route('/lol/summoner/v4/summoners/by-puuid/{encryptedPUUID}')
+SUMMONER = Route('/lol/summoner/v4/summoners/{encryptedSummonerId}')
+
+# DataDragon
+CHAMPIONS = Route('/cdn/{version}/data/{locale}/champion.json', 'http://ddragon.leagueoflegends.com')
+VERSIONS = Route('/api/versions.json', 'https://ddragon.leagueoflegends.com')
+
+table = RouteTable(value for value in list(globals().values()) if isinstance(value, Route))
@@ -0,0 +1,224 @@
+""" Priority scheduling of the rate limit budget shared by every endpoint class
+Calls wait for loliglio.limiter in per host queues ordered by priority class: a call only takes from the
+budget of a host when no call of a higher class is ready to go on that host, calls of the same class and
+endpoint are granted in arrival order, and lower classes must leave part of every bucket unused. A crawl
+running in the background then soaks up the idle capacity without delaying live lookups, which always
+find budget reserved for them.
+
+    from loliglio import scheduling
+    with scheduling.priority(scheduling.INTERACTIVE):
+        loliglio.Spectator.active_games_by_summoner(regionId, summonerId)
+
+Calls made without a priority are NORMAL. Bulk helpers (fetch_many, Match.matches_many, ladder.snapshot,
+history.HistorySync) default to BACKGROUND. The priority follows the context, so it also applies to the
+tasks awaited under it with loliglio.aio.
+"""
+import contextlib
+import contextvars
+import itertools
+import threading
+import time
+
+
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+PRIORITIES = ('interactive', 'normal', 'background')
+
+# Fraction of every rate limit bucket each class leaves unused for the classes above it
+RESERVES = {INTERACTIVE: 0, NORMAL: 0.1, BACKGROUND: 0.2}
+
+_priority = contextvars.ContextVar('loliglio_priority', default=None)
+
+def current(default=NORMAL):
+    """ :return: priority class of the calls made from the current context, default when none was set """
+    level = _priority.get()
+    return default if level is None else level
+
+@contextlib.contextmanager
+def priority(level):
+    """ context manager making the calls inside it (threads and tasks started inside excepted) use priority class level
+    :param level: INTERACTIVE, NORMAL or BACKGROUND
+    """
+
+    if level not in range(len(PRIORITIES)):
+        raise ValueError('unknown priority ' + repr(level))
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+class Ticket:
+    """ Place of a call in the queue of its host """
+
+    __slots__ = ('host', 'method', 'priority', 'number', 'queued', 'granted', 'refused', 'key', 'waited')
+
+    def __init__(self, host, method, priority, number):
+        self.host = host
+        self.method = method
+        self.priority = priority
+        self.number = number
+        self.queued = time.monotonic()
+        self.granted = False
+        # Set while the limiter has no budget for the call: it holds up no other call in the meantime, as
+        # the app buckets it waits for would refuse lower classes too, and its method buckets only concern it
+        self.refused = False
+        # Set once granted: ID of the api key the call is sent with (see ratelimit.KeyPool) and seconds it waited
+        self.key = None
+        self.waited = 0
+
+class _ClassStats:
+    def __init__(self):
+        self.granted = 0
+        self.waited = 0
+        self.max_wait = 0
+
+class Scheduler:
+    """ Thread-safe priority queues in front of a RateLimiter, one per host
+    """
+
+    def __init__(self, reserves=RESERVES, recheck=0.05):
+        """
+        :param reserves: dict of {priority class: fraction of every bucket left unused by its calls}
+        :param recheck: seconds between checks of a call waiting behind higher priority calls
+        """
+
+        self.reserves = dict(reserves)
+        self.recheck = recheck
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._numbers = itertools.count()
+        self._queues = dict()
+        self._stats = [_ClassStats() for _ in PRIORITIES]
+
+    def enqueue(self, host, method, level=None):
+        """ queues a call, poll then grants it once its turn comes and the limiter allows it
+        :param host: routing host of the call (e.g. 'la2.api.riotgames.com')
+        :param method: endpoint template of the call (e.g. '/lol/match/v5/matches/{matchId}')
+        :param level: priority class, the one of the current context by default (see priority)
+        :return: Ticket of the call
+        """
+
+        level = current() if level is None else level
+        with self._lock:
+            ticket = Ticket(host, method, level, next(self._numbers))
+            self._queues.setdefault(host, list()).append(ticket)
+        return ticket
+
+    def _turn(self, ticket):
+        for waiting in self._queues[ticket.host]:
+            if waiting.refused:
+                continue
+            if waiting.priority < ticket.priority:
+                return False
+            if waiting.priority == ticket.priority and waiting.method == ticket.method and waiting.number < ticket.number:
+                return False
+        return True
+
+    def _remove(self, ticket):
+        queue = self._queues[ticket.host]
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[ticket.host]
+        self._changed.notify_all()
+
+    def poll(self, ticket, limiter, keys=(None,)):
+        """ grants the call of ticket if its turn has come and limiter allows it, without blocking
+        :param limiter: ratelimit.RateLimiter the budget is taken from
+        :param keys: IDs of the api keys the call may be sent with (see RateLimiter.grant), the one granted is set as ticket.key
+        :return: 0 when the call was granted (it left the queue), otherwise the seconds to wait before polling again
+        """
+
+        with self._lock:
+            if not self._turn(ticket):
+                return self.recheck
+            delay, ticket.key = limiter.grant(ticket.host, ticket.method, self.reserves.get(ticket.priority, 0), keys)
+            ticket.refused = delay > 0
+            if ticket.refused:
+                return delay
+            ticket.granted = True
+            self._remove(ticket)
+            waited = ticket.waited = time.monotonic() - ticket.queued
+            stats = self._stats[ticket.priority]
+            stats.granted += 1
+            stats.waited += waited
+            stats.max_wait = max(stats.max_wait, waited)
+            return 0
+
+    def cancel(self, ticket):
+        """ removes a call that is no longer waiting for its turn (e.g. interrupted), granted ones are left as they are """
+        with self._lock:
+            if not ticket.granted:
+                ticket.granted = True
+                self._remove(ticket)
+
+    def acquire(self, limiter, host, method, level=None, keys=(None,)):
+        """ blocks until the call is granted by its turn and limiter
+        :return: the granted Ticket, with the seconds spent waiting (waited) and the api key ID to use (key)
+        """
+
+        ticket = self.enqueue(host, method, level)
+        try:
+            while True:
+                delay = self.poll(ticket, limiter, keys)
+                if not delay:
+                    return ticket
+                with self._changed:
+                    # Woken up early when a call leaves the queue, higher priority ones included
+                    self._changed.wait(delay)
+        finally:
+            self.cancel(ticket)
+
+    def depth(self, host=None):
+        """ :return: list of the calls waiting per priority class, for host or for every host """
+        counts = [0] * len(PRIORITIES)
+        with self._lock:
+            queues = [self._queues.get(host, ())] if host is not None else list(self._queues.values())
+            for queue in queues:
+                for ticket in queue:
+                    counts[ticket.priority] += 1
+        return counts
+
+    def snapshot(self):
+        """ :return: dict of {priority name: dict of waiting, granted, wait_seconds_total, wait_seconds_mean and wait_seconds_max},
+        plus 'hosts': {host: [calls waiting per priority class]}
+        """
+
+        with self._lock:
+            hosts = dict()
+            for host, queue in self._queues.items():
+                counts = hosts[host] = [0] * len(PRIORITIES)
+                for ticket in queue:
+                    counts[ticket.priority] += 1
+            result = dict()
+            for level, name in enumerate(PRIORITIES):
+                stats = self._stats[level]
+                result[name] = {'waiting': sum(counts[level] for counts in hosts.values()), 'granted': stats.granted,
+                                'wait_seconds_total': stats.waited,
+                                'wait_seconds_mean': stats.waited / stats.granted if stats.granted else 0,
+                                'wait_seconds_max': stats.max_wait}
+        result['hosts'] = hosts
+        return result
+
+    def prometheus(self):
+        """ :return: queue depth and wait time per host and priority class in the Prometheus text exposition format """
+        snapshot = self.snapshot()
+        lines = ['# HELP loliglio_scheduler_waiting Calls waiting for their turn',
+                 '# TYPE loliglio_scheduler_waiting gauge']
+        for host, counts in sorted(snapshot['hosts'].items()):
+            for name, count in zip(PRIORITIES, counts):
+                lines.append('loliglio_scheduler_waiting{host="' + host + '",priority="' + name + '"} ' + str(count))
+        for metric, kind, key, text in (('granted_total', 'counter', 'granted', 'Calls granted'),
+                                        ('wait_seconds_total', 'counter', 'wait_seconds_total', 'Seconds calls waited for their turn'),
+                                        ('wait_seconds_max', 'gauge', 'wait_seconds_max', 'Longest wait of a call')):
+            lines.append('# HELP loliglio_scheduler_' + metric + ' ' + text)
+            lines.append('# TYPE loliglio_scheduler_' + metric + ' ' + kind)
+            for name in PRIORITIES:
+                lines.append('loliglio_scheduler_' + metric + '{priority="' + name + '"} ' + repr(snapshot[name][key]))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """ clears the granted and wait counters """
+        with self._lock:
+            self._stats = [_ClassStats() for _ in PRIORITIES]
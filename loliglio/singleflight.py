@@ -0,0 +1,103 @@
+""" Request coalescing: concurrent callers of the same url share one outstanding call
+The first caller of a key runs the call, everyone arriving while it is in flight waits for it and receives
+the very same decoded result (or exception). Callers must therefore not modify shared results in place.
+"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """ Thread-safe deduplication of identical in-flight calls
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = dict()
+        self.executed = 0
+        self.saved = 0
+
+    def do(self, key, function, *args):
+        """ runs function(*args) unless a call with the same key is already in flight, then waits for it
+        :param key: identity of the call (e.g. its url)
+        :return: result of the call, shared by every caller of key that arrived while it was running
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.saved += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self.executed += 1
+            call.event.set()
+        return call.result
+
+    def stats(self):
+        """ :return: dict with the calls executed, the calls saved by sharing a result and the calls in flight """
+        with self._lock:
+            return {'executed': self.executed, 'saved': self.saved, 'in_flight': len(self._calls)}
+
+class AsyncSingleFlight:
+    """ Deduplication of identical in-flight awaitable calls within one event loop
+    """
+
+    def __init__(self):
+        self._calls = dict()
+        self.executed = 0
+        self.saved = 0
+
+    async def do(self, key, function, *args):
+        """ awaits function(*args) unless a call with the same key is already in flight, then waits for it
+        :param key: identity of the call (e.g. its url)
+        :return: result of the call, shared by every caller of key that arrived while it was running
+        """
+
+        # Imported here, the thread coalescer of every blocking call doesn't need asyncio
+        import asyncio
+        loop = asyncio.get_running_loop()
+        future = self._calls.get((loop, key))
+        if future is not None:
+            self.saved += 1
+            return await asyncio.shield(future)
+
+        future = self._calls[(loop, key)] = loop.create_future()
+        try:
+            result = await function(*args)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marks the exception as retrieved when nobody else was waiting for it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[(loop, key)]
+            self.executed += 1
+
+    def stats(self):
+        """ :return: dict with the calls executed, the calls saved by sharing a result and the calls in flight """
+        return {'executed': self.executed, 'saved': self.saved, 'in_flight': len(self._calls)}
@@ -0,0 +1,32 @@
+""" Spectator-v4 endpoints: live and featured games """
+from loliglio import regions, routes
+from loliglio.client import api_call
+
+
+class Spectator:
+    """ Allows the request of information of a current game
+    official information at: https://developer.riotgames.com/apis#match-v5
+    """
+
+    @staticmethod
+    def active_games_by_summoner(regionId, encryptedSummonerId, get_url=False):
+        """
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param encryptedSummonerId: Summoner IDs are only unique per region. Different APIs use different IDs
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.ACTIVE_GAME.url(regions[regionId], encryptedSummonerId)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def featured_games(regionId, get_url=False):
+        """
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.FEATURED_GAMES.url(regions[regionId])
+        if get_url: return url
+        return api_call(url)
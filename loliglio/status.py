@@ -0,0 +1,33 @@
+""" Lol-status-v3 and v4 endpoints: platform status per region """
+from loliglio import regions, routes
+from loliglio.client import api_call
+
+
+class Status:
+    """ Allows access to LOL platform status by region
+    official information at: https://developer.riotgames.com/apis#lol-status-v4
+    official information at: https://developer.riotgames.com/apis#lol-status-v3
+    """
+    class V3:
+        @staticmethod
+        def shard_data(regionId, get_url=False):
+            """ Get League of Legends status for the given shard.
+            This API was deprecated on Dec 11th, 2020. Please use lol-status-v4 as a replacement.
+            :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+            :param get_url: When true, don't make an API call and returns the url connection
+            :return: JSON object retrieved from riot API call (or link when get_url is True)
+            """
+            url = routes.STATUS_V3.url(regions[regionId])
+            if get_url: return url
+            return api_call(url)
+    class V4:
+        @staticmethod
+        def platform_data(regionId, get_url=False):
+            """ Get League of Legends status for the given platform
+            :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+            :param get_url: When true, don't make an API call and returns the url connection
+            :return: JSON object retrieved from riot API call (or link when get_url is True)
+            """
+            url = routes.STATUS_V4.url(regions[regionId])
+            if get_url: return url
+            return api_call(url)
@@ -0,0 +1,418 @@
+""" Local SQLite store of summoners, league entries, champion masteries and matches
+Results are kept with their regions, queues, tiers and divisions as loliglio integer IDs in indexed columns
+(puuid, matchId, championId and queue), next to the JSON object itself, so they can be queried with SQL
+instead of scanning JSON files. Writes are batched in transactions and the database runs in WAL mode:
+readers never wait for the writer, and several processes can share the file.
+
+The store is also a read-through cache: set as loliglio.response_cache, the results of the calls it knows are
+ingested as they arrive and repeated calls are answered from the database, without a request.
+
+    from loliglio import store
+    loliglio.response_cache = store.Store('lol.sqlite')
+    loliglio.Summoner.by_puuid(6, puuid)                  # request, stored
+    loliglio.Summoner.by_puuid(6, puuid)                  # answered by the database
+
+    database = store.Store('lol.sqlite')
+    database.add_matches(match for _, match in loliglio.Match.matches_many(matchIds))
+    database.execute('SELECT championId, AVG(win) FROM participants WHERE queueId = 420 GROUP BY championId')
+"""
+import itertools
+import json
+import sqlite3
+import threading
+import time
+
+import loliglio
+from loliglio import cache, export, routes
+
+
+FOREVER = cache.FOREVER
+
+# Seconds the results of each request template answer repeated calls. FOREVER never expires, 0 isn't answered
+DEFAULT_TTLS = {
+    routes.MATCH.template: FOREVER,
+    routes.SUMMONER_BY_PUUID.template: 24 * 3600,
+    routes.SUMMONER.template: 24 * 3600,
+    routes.SUMMONER_BY_ACCOUNT.template: 24 * 3600,
+    routes.SUMMONER_BY_NAME.template: 3600,
+    routes.MASTERIES_BY_SUMMONER.template: 3600,
+    routes.MASTERY_BY_SUMMONER_CHAMPION.template: 3600,
+    routes.LEAGUE_ENTRIES.template: 600,
+    routes.LEAGUE_EXP_ENTRIES.template: 600,
+    routes.LEAGUE_ENTRIES_BY_SUMMONER.template: 600,
+}
+
+# Rows written per transaction by the add_ methods
+BATCH = 500
+
+# Tiers missing from loliglio.tiers, which only lists the divided ones, coded after them
+APEX_TIERS = ('MASTER', 'GRANDMASTER', 'CHALLENGER')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS summoners (
+    puuid TEXT PRIMARY KEY, regionId INTEGER, summonerId TEXT, accountId TEXT, name TEXT,
+    summonerLevel INTEGER, revisionDate INTEGER, stored REAL, data BLOB);
+CREATE INDEX IF NOT EXISTS summoners_id ON summoners (regionId, summonerId);
+CREATE INDEX IF NOT EXISTS summoners_account ON summoners (regionId, accountId);
+CREATE INDEX IF NOT EXISTS summoners_name ON summoners (regionId, name);
+CREATE TABLE IF NOT EXISTS league_entries (
+    regionId INTEGER, queueId INTEGER, summonerId TEXT, tierId INTEGER, divisionId INTEGER,
+    leaguePoints INTEGER, wins INTEGER, losses INTEGER, page INTEGER, position INTEGER, stored REAL, data BLOB,
+    PRIMARY KEY (regionId, queueId, summonerId));
+CREATE INDEX IF NOT EXISTS league_entries_page ON league_entries (regionId, queueId, tierId, divisionId, page, position);
+CREATE INDEX IF NOT EXISTS league_entries_summoner ON league_entries (regionId, summonerId);
+CREATE TABLE IF NOT EXISTS masteries (
+    regionId INTEGER, summonerId TEXT, championId INTEGER, championLevel INTEGER, championPoints INTEGER,
+    lastPlayTime INTEGER, stored REAL, data BLOB, PRIMARY KEY (regionId, summonerId, championId));
+CREATE INDEX IF NOT EXISTS masteries_champion ON masteries (championId, championPoints);
+CREATE TABLE IF NOT EXISTS matches (
+    matchId TEXT PRIMARY KEY, gameId INTEGER, regionId INTEGER, queueId INTEGER, patch INTEGER,
+    gameCreation INTEGER, gameDuration INTEGER, stored REAL, data BLOB);
+CREATE INDEX IF NOT EXISTS matches_queue ON matches (queueId, gameCreation);
+CREATE TABLE IF NOT EXISTS participants (
+    matchId TEXT, participantId INTEGER, puuid TEXT, queueId INTEGER, teamId INTEGER, championId INTEGER,
+    teamPosition TEXT, win INTEGER, kills INTEGER, deaths INTEGER, assists INTEGER,
+    PRIMARY KEY (matchId, participantId));
+CREATE INDEX IF NOT EXISTS participants_puuid ON participants (puuid, matchId);
+CREATE INDEX IF NOT EXISTS participants_champion ON participants (championId, queueId);
+CREATE TABLE IF NOT EXISTS lookups (url TEXT PRIMARY KEY, stored REAL, rows INTEGER);
+'''
+
+_region_ids = {region: regionId for regionId, region in enumerate(loliglio.regions)}
+
+def region_id(host):
+    """ :return: loliglio regions ID of a platform host or name ('la2.api.riotgames.com' -> 6), -1 when unknown """
+    return _region_ids.get(host.split('.', 1)[0].upper(), -1)
+
+def _code(names, value):
+    try:
+        return names.index(value)
+    except ValueError:
+        return -1
+
+def tier_id(tier):
+    """ :return: loliglio tiers ID of a tier name, the APEX_TIERS following them, -1 when unknown """
+    if tier in APEX_TIERS:
+        return len(loliglio.tiers) + APEX_TIERS.index(tier)
+    return _code(loliglio.tiers, tier)
+
+def _dump(value):
+    if hasattr(value, 'to_dict'):
+        value = value.to_dict()
+    return json.dumps(value, separators=(',', ':')).encode()
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+class Store:
+    """ SQLite database of API results, usable as loliglio.response_cache. Thread-safe: each thread has its own connection
+    """
+
+    def __init__(self, path, ttls=None, timeout=30):
+        """
+        :param path: database file, created when missing
+        :param ttls: dict of request template to seconds (FOREVER for no expiry) calls are answered from the database, DEFAULT_TTLS by default
+        :param timeout: seconds a write waits for another connection's transaction before failing
+        """
+
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = list()
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            # WAL lets readers run while a batch is written, NORMAL only syncs at checkpoints (safe in WAL mode)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def execute(self, sql, parameters=()):
+        """ runs a read query on the thread's connection
+        :return: list of the rows (tuples)
+        """
+
+        return self._connection().execute(sql, parameters).fetchall()
+
+    # Ingestion
+
+    def _summoner_rows(self, regionId, summoners, stored):
+        for summoner in summoners:
+            yield (summoner['puuid'], regionId, summoner.get('id'), summoner.get('accountId'), summoner.get('name'),
+                   summoner.get('summonerLevel'), summoner.get('revisionDate'), stored, _dump(summoner))
+
+    def add_summoners(self, regionId, summoners):
+        """ stores SummonerDTO JSON objects, replacing the stored ones of the same puuid
+        :param regionId: LOL server ID the summoners were fetched from
+        :param summoners: iterable of SummonerDTO JSON objects, written BATCH at a time
+        """
+
+        for batch in _batches(summoners, BATCH):
+            with self._connection() as connection:
+                connection.executemany('INSERT OR REPLACE INTO summoners VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                       self._summoner_rows(regionId, batch, time.time()))
+
+    def _entry_rows(self, regionId, entries, page, stored):
+        # entries are (position in the page, LeagueEntryDTO) pairs
+        for position, entry in entries:
+            yield (regionId, _code(loliglio.queues, entry.get('queueType')), entry.get('summonerId'),
+                   tier_id(entry.get('tier')), _code(loliglio.divisions, entry.get('rank')), entry.get('leaguePoints'),
+                   entry.get('wins'), entry.get('losses'), page, position, stored, _dump(entry))
+
+    def add_league_entries(self, regionId, entries, page=None):
+        """ stores LeagueEntryDTO JSON objects, replacing the stored entry of the same summoner and queue
+        :param regionId: LOL server ID the entries were fetched from
+        :param entries: iterable of LeagueEntryDTO JSON objects (League.entries, League.EXP.entries, League.entries_by_summoner),
+        written BATCH at a time
+        :param page: page of League.entries the entries were fetched from, kept with them
+        """
+
+        stored = time.time()
+        for batch in _batches(enumerate(entries), BATCH):
+            with self._connection() as connection:
+                connection.executemany('INSERT OR REPLACE INTO league_entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                       self._entry_rows(regionId, batch, page, stored))
+
+    def add_masteries(self, regionId, masteries, summonerId=None):
+        """ stores ChampionMasteryDto JSON objects, replacing the stored one of the same summoner and champion
+        :param regionId: LOL server ID the masteries were fetched from
+        :param masteries: iterable of ChampionMasteryDto JSON objects
+        :param summonerId: encrypted summoner ID of masteries without a summonerId key
+        """
+
+        stored = time.time()
+        for batch in _batches(masteries, BATCH):
+            with self._connection() as connection:
+                connection.executemany('INSERT OR REPLACE INTO masteries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                       ((regionId, mastery.get('summonerId', summonerId), mastery.get('championId'),
+                                         mastery.get('championLevel'), mastery.get('championPoints'),
+                                         mastery.get('lastPlayTime'), stored, _dump(mastery)) for mastery in batch))
+
+    def _add_match(self, connection, match, data, stored):
+        info = match['info']
+        matchId = match['metadata']['matchId']
+        queueId = info.get('queueId')
+        connection.execute('INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                           (matchId, info.get('gameId'), export.region_id(info.get('platformId')), queueId,
+                            export.patch(info.get('gameVersion')), info.get('gameCreation'), info.get('gameDuration'),
+                            stored, data))
+        connection.executemany('INSERT OR REPLACE INTO participants VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                               ((matchId, participant.get('participantId'), participant.get('puuid'), queueId,
+                                 participant.get('teamId'), participant.get('championId'), participant.get('teamPosition'),
+                                 participant.get('win'), participant.get('kills'), participant.get('deaths'),
+                                 participant.get('assists')) for participant in info['participants']))
+
+    def add_matches(self, matches):
+        """ stores MatchDto JSON objects and one participants row per player, replacing the stored match of the same ID
+        :param matches: iterable of MatchDto JSON objects or models.Match, or of (matchId, result) tuples as
+        yielded by Match.matches_many (exceptions are skipped), written BATCH at a time
+        :return: number of matches stored
+        """
+
+        stored = 0
+        for batch in _batches(matches, BATCH):
+            with self._connection() as connection:
+                now = time.time()
+                for match in batch:
+                    if isinstance(match, tuple):
+                        match = match[1]
+                    if isinstance(match, BaseException):
+                        continue
+                    self._add_match(connection, match, _dump(match), now)
+                    stored += 1
+        return stored
+
+    # Queries
+
+    def summoner(self, puuid):
+        """ :return: stored SummonerDTO JSON object of puuid, None when missing """
+        rows = self.execute('SELECT data FROM summoners WHERE puuid = ?', (puuid,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def match(self, matchId):
+        """ :return: stored MatchDto JSON object of matchId, None when missing """
+        rows = self.execute('SELECT data FROM matches WHERE matchId = ?', (matchId,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def match_ids(self, puuid, queueId=None):
+        """ :return: list of the stored match IDs puuid played (of queueId only when given), most recent first """
+        if queueId is None:
+            rows = self.execute('SELECT p.matchId FROM participants p JOIN matches m USING (matchId) WHERE p.puuid = ? '
+                                'ORDER BY m.gameCreation DESC', (puuid,))
+        else:
+            rows = self.execute('SELECT p.matchId FROM participants p JOIN matches m USING (matchId) WHERE p.puuid = ? '
+                                'AND p.queueId = ? ORDER BY m.gameCreation DESC', (puuid, queueId))
+        return [matchId for matchId, in rows]
+
+    def league_entries(self, regionId, queueId, tierId=None, divisionId=None):
+        """ :return: list of the stored LeagueEntryDTO JSON objects of a queue (a tier and division of it when given), by league points """
+        sql = 'SELECT data FROM league_entries WHERE regionId = ? AND queueId = ?'
+        parameters = [regionId, queueId]
+        for column, value in (('tierId', tierId), ('divisionId', divisionId)):
+            if value is not None:
+                sql += ' AND ' + column + ' = ?'
+                parameters.append(value)
+        return [json.loads(data) for data, in self.execute(sql + ' ORDER BY leaguePoints DESC', parameters)]
+
+    # Read-through cache (the loliglio.cache.ResponseCache interface)
+
+    def ttl(self, method):
+        """ :return: seconds results of the request template method answer calls (None for ever, 0 when never) """
+        return self.ttls.get(method, 0)
+
+    def _lookup(self, url, method, regionId, attributes, query):
+        """ :return: (stored, JSON bytes) of the call from the database, None when it isn't stored """
+        connection = self._connection()
+        if method == routes.MATCH.template:
+            return connection.execute('SELECT stored, data FROM matches WHERE matchId = ?', attributes).fetchone()
+        if method == routes.SUMMONER_BY_PUUID.template:
+            return connection.execute('SELECT stored, data FROM summoners WHERE puuid = ?', attributes).fetchone()
+        for route, column in ((routes.SUMMONER, 'summonerId'), (routes.SUMMONER_BY_ACCOUNT, 'accountId'),
+                              (routes.SUMMONER_BY_NAME, 'name')):
+            if method == route.template:
+                return connection.execute('SELECT stored, data FROM summoners WHERE regionId = ? AND ' + column + ' = ?',
+                                          (regionId,) + attributes).fetchone()
+        if method == routes.MASTERY_BY_SUMMONER_CHAMPION.template:
+            return connection.execute('SELECT stored, data FROM masteries WHERE regionId = ? AND summonerId = ? AND championId = ?',
+                                      (regionId, attributes[0], int(attributes[1]))).fetchone()
+
+        # Lists are only answered when the whole list was stored by the same call and none of its rows was
+        # replaced since (e.g. a page entry by the entries_by_summoner one of the same summoner and queue)
+        lookup = connection.execute('SELECT stored, rows FROM lookups WHERE url = ?', (url,)).fetchone()
+        if lookup is None:
+            return None
+        if method == routes.MASTERIES_BY_SUMMONER.template:
+            rows = connection.execute('SELECT data FROM masteries WHERE regionId = ? AND summonerId = ? ORDER BY championPoints DESC',
+                                      (regionId,) + attributes).fetchall()
+        elif method == routes.LEAGUE_ENTRIES_BY_SUMMONER.template:
+            rows = connection.execute('SELECT data FROM league_entries WHERE regionId = ? AND summonerId = ?',
+                                      (regionId,) + attributes).fetchall()
+        else:
+            queue, tier, division = attributes
+            rows = connection.execute('SELECT data FROM league_entries WHERE regionId = ? AND queueId = ? AND tierId = ? '
+                                      'AND divisionId = ? AND page = ? ORDER BY position',
+                                      (regionId, _code(loliglio.queues, queue), tier_id(tier),
+                                       _code(loliglio.divisions, division), int(query.get('page', 1)))).fetchall()
+        if len(rows) != lookup[1]:
+            return None
+        return lookup[0], b'[' + b','.join(data for data, in rows) + b']'
+
+    @staticmethod
+    def _parse(url, method):
+        route = routes.table.routes.get(method)
+        host, path, query = url.split('/', 3)[2], '/' + url.split('/', 3)[3], dict()
+        if '?' in path:
+            path, string = path.split('?', 1)
+            query = dict(item.split('=', 1) for item in string.split('&') if '=' in item)
+        return region_id(host), route.parse(path), query
+
+    def get(self, url, method):
+        """ answers a call from the database
+        :param url: url of the call
+        :param method: request template of the call (see loliglio.method_of)
+        :return: fresh cache.Entry, None when the result isn't stored or is too old
+        """
+
+        ttl = self.ttl(method)
+        if ttl == 0:
+            return None
+        regionId, attributes, query = self._parse(url, method)
+        if attributes is None:
+            return None
+        try:
+            found = self._lookup(url, method, regionId, attributes, query)
+        except (sqlite3.Error, ValueError):
+            return None
+        if found is None:
+            return None
+        stored, body = found
+        if ttl is not FOREVER and time.time() - stored >= ttl:
+            return None
+        return cache.Entry(None, stored, None, None, bytes(body), True)
+
+    def put(self, url, method, body, headers):
+        """ ingests the result of a call, ignored when its template isn't stored
+        A result that can't be stored is reported and skipped: the call it comes from still succeeds
+        :param body: raw response bytes
+        :param headers: response headers (unused, the Riot API sends no validators)
+        """
+
+        if self.ttl(method) == 0:
+            return
+        try:
+            self._put(url, method, body)
+        except Exception as e:
+            print('Store could not keep the result of', url, '-', type(e).__name__, e)
+
+    def _put(self, url, method, body):
+        regionId, attributes, query = self._parse(url, method)
+        if attributes is None:
+            return
+        data = json.loads(body)
+        stored = time.time()
+        with self._connection() as connection:
+            if method == routes.MATCH.template:
+                self._add_match(connection, data, bytes(body), stored)
+            elif method in (routes.SUMMONER_BY_PUUID.template, routes.SUMMONER.template,
+                            routes.SUMMONER_BY_ACCOUNT.template, routes.SUMMONER_BY_NAME.template):
+                connection.executemany('INSERT OR REPLACE INTO summoners VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                       self._summoner_rows(regionId, (data,), stored))
+            elif method in (routes.MASTERIES_BY_SUMMONER.template, routes.MASTERY_BY_SUMMONER_CHAMPION.template):
+                masteries = data if isinstance(data, list) else [data]
+                if method == routes.MASTERIES_BY_SUMMONER.template:
+                    connection.execute('DELETE FROM masteries WHERE regionId = ? AND summonerId = ?', (regionId, attributes[0]))
+                connection.executemany('INSERT OR REPLACE INTO masteries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                       ((regionId, attributes[0], mastery.get('championId'), mastery.get('championLevel'),
+                                         mastery.get('championPoints'), mastery.get('lastPlayTime'), stored, _dump(mastery))
+                                        for mastery in masteries))
+            else:
+                page = None
+                if method != routes.LEAGUE_ENTRIES_BY_SUMMONER.template:
+                    queue, tier, division = attributes
+                    page = int(query.get('page', 1))
+                    # The page is replaced as a whole, summoners that moved elsewhere leave it
+                    connection.execute('DELETE FROM league_entries WHERE regionId = ? AND queueId = ? AND tierId = ? '
+                                       'AND divisionId = ? AND page = ?', (regionId, _code(loliglio.queues, queue),
+                                                                           tier_id(tier), _code(loliglio.divisions, division), page))
+                connection.executemany('INSERT OR REPLACE INTO league_entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                       self._entry_rows(regionId, enumerate(data), page, stored))
+            if isinstance(data, list):
+                connection.execute('INSERT OR REPLACE INTO lookups VALUES (?, ?, ?)', (url, stored, len(data)))
+
+    def revalidated(self, url, method, entry, headers):
+        """ :return: body of entry, kept as it is (entries from the database are always fresh) """
+        return entry.body
+
+    def clear(self):
+        """ deletes every stored result """
+        with self._connection() as connection:
+            for table in ('summoners', 'league_entries', 'masteries', 'matches', 'participants', 'lookups'):
+                connection.execute('DELETE FROM ' + table)
+
+    def close(self):
+        """ closes the connections of every thread, the store can't be used afterwards """
+        with self._lock:
+            connections, self._connections = self._connections, list()
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,66 @@
+""" Summoner-v4 endpoints: summoners by account, name, puuid or summoner ID """
+from loliglio import regions, routes
+from loliglio.client import api_call
+
+
+class Summoner:
+    """ official information at: https://developer.riotgames.com/apis#summoner-v4
+    Allows access to the information of a specific summoner. Returns a SummonerDTO
+    
+    NAME            | DATA TYPE  | DESCRIPTION
+    ----------------|------------|----------------
+    accountId       | string     | Encrypted account ID. Max length 56 characters.
+    profileIconId   | int        | ID of the summoner icon associated with the summoner.
+    revisionDate    | long       | Date summoner was last modified specified as epoch milliseconds. The following events will update this timestamp: summoner name change, summoner level change, or profile icon change.
+    name            | string     | Summoner name.
+    id              | string     | Encrypted summoner ID. Max length 63 characters.
+    puuid           | string     | Encrypted PUUID. Exact length of 78 characters.
+    summonerLevel   | long       | Summoner level associated with the summoner.
+    """
+    @staticmethod
+    def by_account(regionId, encryptedAccountId, get_url=False):
+        """ Get a summoner SummonerDTO by account ID
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param encryptedAccountId: Summoner IDs are only unique per region. Different APIs use different IDs
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.SUMMONER_BY_ACCOUNT.url(regions[regionId], encryptedAccountId)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def by_name(regionId, summonerName, get_url=False):
+        """ Get a summoner SummonerDTO by summoner name.
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param summonerName: Name as shown in the League Client (can contain not-alphabetic chars)
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.SUMMONER_BY_NAME.url(regions[regionId], summonerName)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def by_puuid(regionId, encryptedPUUID, get_url=False):
+        """ Get a summoner SummonerDTO by PUUID
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param encryptedPUUID: Public User ID's are globally unique. Different APIs use different IDs
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.SUMMONER_BY_PUUID.url(regions[regionId], encryptedPUUID)
+        if get_url: return url
+        return api_call(url)
+
+    @staticmethod
+    def by_encrypted_summoner_id(regionId, encryptedSummonerId, get_url=False):
+        """ Get a summoner SummonerDTO by summoner ID
+        :param regionId: LOL server ID. Accepted values: 0-11(inclusive) for 'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'RU' & 'TR1'
+        :param encryptedSummonerId: Summoner IDs are only unique per region. Different APIs use different IDs
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.SUMMONER.url(regions[regionId], encryptedSummonerId)
+        if get_url: return url
+        return api_call(url)
@@ -0,0 +1,321 @@
+""" Keep-alive HTTP transport used underneath loliglio.api_call
+Connections are pooled per (scheme, host, port), so consecutive calls to the same routing host
+(e.g. americas.api.riotgames.com, la2.api.riotgames.com or ddragon.leagueoflegends.com) reuse an
+already open TCP/TLS session instead of paying a new handshake on every request.
+Responses are requested gzip or deflate compressed (Accept-Encoding) and decompressed by the pool, whole
+or incrementally for streamed bodies, so callers always read the JSON bytes themselves.
+"""
+import io
+import http.client
+import ssl
+import threading
+import urllib.error
+import urllib.parse
+import zlib
+
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+# Request headers carrying credentials (lowercase), never sent on to a redirect leaving the host
+CREDENTIAL_HEADERS = frozenset(('x-riot-token', 'authorization', 'proxy-authorization', 'cookie'))
+
+ACCEPT_ENCODING = 'gzip, deflate'
+# Compressed bytes read from a streamed body at a time
+STREAM_CHUNK = 16 * 1024
+
+def decompressor(encoding, first=None):
+    """ :return: zlib decompress object for a Content-Encoding, None when the body isn't compressed
+    :param first: first byte of the body. 'deflate' is meant to be zlib-wrapped but some servers send it raw
+    """
+
+    encoding = (encoding or '').strip().lower()
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        # A zlib stream starts with a CMF byte whose low nibble is 8 (deflate)
+        return zlib.decompressobj(zlib.MAX_WBITS if first is None or first & 0x0f == 8 else -zlib.MAX_WBITS)
+    return None
+
+def decode_body(data, encoding):
+    """ :return: body bytes of a whole response, decompressed according to its Content-Encoding """
+    decompress = decompressor(encoding, data[0] if data else None)
+    if decompress is None or not data:
+        return data
+    try:
+        return decompress.decompress(data) + decompress.flush()
+    except zlib.error as e:
+        raise http.client.IncompleteRead(data) from e
+
+def redirected(url, location, headers):
+    """ resolves the Location of a redirect
+    :return: tuple of the url redirected to and the headers to request it with, the CREDENTIAL_HEADERS left
+    out when it is on another host than url
+    """
+
+    target = urllib.parse.urljoin(url, location)
+    if urllib.parse.urlsplit(target).netloc.lower() != urllib.parse.urlsplit(url).netloc.lower():
+        headers = {name: value for name, value in headers.items() if name.lower() not in CREDENTIAL_HEADERS}
+    return target, headers
+
+def unverified_context():
+    """ returns an SSL context that ignores certificate errors (loliglio has always skipped verification)
+    :return: ssl.SSLContext meant to be shared by every pooled HTTPS connection
+    """
+
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+class Response:
+    """ Fully read HTTP response. Its connection has already been handed back to the pool
+    """
+
+    def __init__(self, url, status, reason, headers, data, transferred=None):
+        """
+        :param data: body bytes, decompressed
+        :param transferred: body bytes received from the server, compressed when it was. len(data) by default
+        """
+
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.data = data
+        self.transferred = len(data) if transferred is None and data is not None else transferred
+
+    def read(self):
+        """ :return: raw body bytes of the response """
+        return self.data
+
+    def getheader(self, name, default=None):
+        """ :return: value of the response header name, or default when missing """
+        return self.headers.get(name, default)
+
+class StreamedResponse(Response):
+    """ HTTP response whose body is read incrementally from its connection
+    The connection (and its pool slot) is only handed back once the response is closed, use it as a context
+    manager. Closing before the whole body was read discards the connection instead of reusing it.
+    """
+
+    def __init__(self, url, status, reason, headers, body, release):
+        # Not Response.__init__: data and transferred aren't known up front
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.data = None
+        self.body = BodyReader(body, headers.get('Content-Encoding'))
+        self._release = release
+
+    @property
+    def transferred(self):
+        """ :return: body bytes received from the server so far, compressed when it was """
+        return self.body.transferred
+
+    def read(self, amount=None):
+        """ :return: the next amount bytes of the decompressed body (all that is left when amount is None), b'' at its end """
+        return self.body.read(amount)
+
+    def close(self):
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class BodyReader:
+    """ File-like reader of a response body, decompressing it on the fly and counting the bytes received
+    """
+
+    def __init__(self, raw, encoding=None):
+        """
+        :param raw: object with a read(size) method returning the body as sent (http.client.HTTPResponse)
+        :param encoding: Content-Encoding of the body
+        """
+
+        self.raw = raw
+        self.encoding = encoding
+        self.compressed = decompressor(encoding) is not None
+        self.transferred = 0
+        self._decompress = None
+        self._buffer = bytearray()
+        self._done = False
+
+    def _raw(self, size=None):
+        chunk = self.raw.read(size) if size is not None else self.raw.read()
+        self.transferred += len(chunk)
+        return chunk
+
+    def read(self, amount=None):
+        """ :return: up to amount decompressed bytes (everything left when None), b'' at the end of the body """
+        if not self.compressed:
+            return self._raw(amount)
+        while not self._done and (amount is None or len(self._buffer) < amount):
+            tail = self._decompress.unconsumed_tail if self._decompress is not None else None
+            self._feed(tail if tail else self._raw(STREAM_CHUNK))
+        if amount is None:
+            amount = len(self._buffer)
+        data = bytes(self._buffer[:amount])
+        del self._buffer[:amount]
+        return data
+
+    def _feed(self, data):
+        try:
+            if self._decompress is None:
+                self._decompress = decompressor(self.encoding, data[0] if data else None)
+            if not data:
+                self._buffer += self._decompress.flush()
+                self._done = True
+                return
+            # Bounded output, the rest waits in unconsumed_tail: a highly compressed body can't flood memory
+            self._buffer += self._decompress.decompress(data, max(4 * STREAM_CHUNK, len(data)))
+        except zlib.error as e:
+            raise http.client.IncompleteRead(bytes(self._buffer)) from e
+        if self._decompress.eof:
+            # Drains what is left of the raw body (nothing for a well-formed one) so the connection can be reused
+            self._raw()
+            self._done = True
+
+class ConnectionPool:
+    """ Bounded, thread-safe pool of keep-alive connections grouped by (scheme, host, port)
+    At most maxsize connections per host are open at the same time, extra callers wait for a free one.
+    Every HTTPS connection shares the same SSL context, so TLS setup is only configured once.
+    """
+
+    def __init__(self, maxsize=10, timeout=30, context=None, compress=True):
+        """
+        :param maxsize: maximum number of simultaneous connections per host
+        :param timeout: socket timeout in seconds for connecting and reading
+        :param context: ssl.SSLContext for HTTPS hosts, unverified_context() by default
+        :param compress: when true responses are requested compressed (Accept-Encoding: gzip, deflate)
+        """
+
+        self.compress = compress
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.context = context if context is not None else unverified_context()
+        self._lock = threading.Lock()
+        self._idle = dict()
+        self._slots = dict()
+
+    @staticmethod
+    def _key(parts):
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        return parts.scheme, parts.hostname, port
+
+    def _slot(self, key):
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.maxsize)
+            return slot
+
+    def _checkout(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self.context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        return conn, False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, list()).append(conn)
+
+    def _send(self, method, url, headers, stream=False):
+        parts = urllib.parse.urlsplit(url)
+        key = self._key(parts)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        slot = self._slot(key)
+        slot.acquire()
+        try:
+            while True:
+                conn, reused = self._checkout(key)
+                try:
+                    conn.request(method, path, headers=headers)
+                    resp = conn.getresponse()
+                    data = None if stream else resp.read()
+                except ConnectionError:
+                    conn.close()
+                    # The server dropped an idle keep-alive connection, try again on a fresh one
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                if stream:
+                    release = self._releaser(key, conn, resp, slot)
+                    slot = None
+                    return StreamedResponse(url, resp.status, resp.reason, resp.headers, resp, release)
+                if resp.will_close:
+                    conn.close()
+                else:
+                    self._checkin(key, conn)
+                return Response(url, resp.status, resp.reason, resp.headers,
+                                decode_body(data, resp.headers.get('Content-Encoding')), len(data))
+        finally:
+            if slot is not None:
+                slot.release()
+
+    def _releaser(self, key, conn, resp, slot):
+        def release():
+            try:
+                # Only a connection whose response was read to the end can carry another request
+                if resp.isclosed() and not resp.will_close:
+                    self._checkin(key, conn)
+                else:
+                    conn.close()
+            finally:
+                slot.release()
+        return release
+
+    def request(self, url, headers=None, method='GET', stream=False):
+        """ sends a request over a pooled connection, following redirects
+        :param url: absolute http(s) url to connect to
+        :param headers: optional dict of extra request headers
+        :param method: HTTP method, 'GET' by default
+        :param stream: when true the body isn't read, a StreamedResponse holding the connection is returned
+        :return: Response with status, headers and body. HTTP errors (>= 400) raise urllib.error.HTTPError
+        """
+
+        headers = dict(headers) if headers else dict()
+        if self.compress:
+            headers.setdefault('Accept-Encoding', ACCEPT_ENCODING)
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, headers, stream)
+            location = response.getheader('Location')
+            redirect = response.status in REDIRECT_CODES and location
+            if not redirect and response.status < 400:
+                return response
+            if stream:
+                # Redirect and error bodies are small, they are read whole and the connection given back
+                with response:
+                    response = Response(url, response.status, response.reason, response.headers, response.read(),
+                                        response.transferred)
+            if not redirect:
+                break
+            url, headers = redirected(url, location, headers)
+        if response.status >= 400:
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, io.BytesIO(response.data))
+        return response
+
+    def close(self):
+        """ closes every idle connection, connections currently in use are kept until they are given back """
+        with self._lock:
+            idle, self._idle = self._idle, dict()
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
@@ -0,0 +1,28 @@
+""" DataDragon versions """
+from loliglio import routes
+from loliglio.client import api_call
+
+
+class Version:
+    """ Allow access to version information available on DataDragon
+    official DataDragon version JSON: https://ddragon.leagueoflegends.com/api/versions.json
+    """
+    @staticmethod
+    def versions(get_url=False):
+        """ Get a JSON list with all version strings
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.VERSIONS.url(None)
+        if get_url: return url
+        return api_call(url, rate_limiting=False)
+
+    @staticmethod
+    def last_version(get_url=False):
+        """ Get a string of the last version
+        :param get_url: When true, don't make an API call and returns the url connection
+        :return: JSON object retrieved from riot API call (or link when get_url is True)
+        """
+        url = routes.VERSIONS.url(None)
+        if get_url: return url
+        return api_call(url, rate_limiting=False)[0]
@@ -20,5 +20,7 @@ setup(
     classifiers=classifiers,
     keywords=['lol', 'library', 'league-of-legends'],
     packages=['loliglio'],
-    install_requires=['']
+    install_requires=[''],
+    # Optional: Arrow / Parquet output of loliglio.export, the packed format needs nothing
+    extras_require={'arrow': ['pyarrow']}
 )
\ No newline at end of file